@@ -17,6 +17,7 @@ import subprocess
 import sys
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -25,6 +26,14 @@ from zoneinfo import ZoneInfo
 from aiohttp import web
 import aiohttp
 
+_REPO_LIB = str(Path(__file__).resolve().parents[1] / "lib")
+if _REPO_LIB not in sys.path:
+    sys.path.append(_REPO_LIB)
+
+from event_bus import EventBus  # noqa: E402
+from tent_cache import TentFetchError, TentReportCache  # noqa: E402
+from tg_sender import TelegramSender, merge_texts, split_text  # noqa: E402
+
 LOGGER = logging.getLogger("aos-bridge")
 STARTED_AT = datetime.now(timezone.utc)
 
@@ -67,6 +76,16 @@ GAS_USER_ID = os.getenv("AOS_GAS_USER_ID", "").strip()
 GAS_MODE = os.getenv("AOS_GAS_MODE", "direct").strip().lower()
 FALLBACK_TELE = os.getenv("AOS_BRIDGE_FALLBACK_TELE", "0").strip() == "1"
 TELE_BIN = os.getenv("AOS_TELE_BIN", "tele").strip()
+# Direct Bot API sending (shared lib/tg_sender.py); falls back to the tele CLI when unset.
+TG_BOT_TOKEN = os.getenv("AOS_BRIDGE_TG_BOT_TOKEN", "").strip()
+TG_CHAT_IDS = [
+    c.strip()
+    for c in (os.getenv("AOS_BRIDGE_TG_CHAT_IDS", "") or GAS_CHAT_ID).replace(";", ",").split(",")
+    if c.strip()
+]
+TG_QUEUE_PATH = Path(
+    os.getenv("AOS_BRIDGE_TG_QUEUE", Path.home() / ".cache/alphaos/bridge-tg-queue.json")
+).expanduser()
 BRIDGE_HEARTBEAT_ENABLED = os.getenv("AOS_BRIDGE_HEARTBEAT_ENABLED", "1").strip() == "1"
 BRIDGE_HEARTBEAT_INTERVAL_SEC = int(os.getenv("AOS_BRIDGE_HEARTBEAT_INTERVAL_SEC", "300") or "300")
 BRIDGE_HEARTBEAT_HOST = os.getenv("AOS_BRIDGE_HEARTBEAT_HOST", "").strip()
@@ -76,6 +95,14 @@ CORE4_NOTIFY_MODE = os.getenv("AOS_CORE4_NOTIFY_MODE", "tele").strip().lower()
 CORE4_DESKTOP_NOTIFY = os.getenv("AOS_CORE4_DESKTOP_NOTIFY", "1").strip() == "1"
 CORE4_AUTO_PUSH = os.getenv("AOS_CORE4_AUTO_PUSH", "0").strip() == "1"
 CORE4_AUTO_PUSH_MIN_INTERVAL = int(os.getenv("AOS_CORE4_AUTO_PUSH_MIN_INTERVAL", "60") or "60")
+# Side-effect coalescing: a burst of logs within the window -> one rebuild / one notification.
+CORE4_REBUILD_WINDOW = float(os.getenv("AOS_CORE4_REBUILD_WINDOW", "1") or "1")
+CORE4_NOTIFY_WINDOW = float(os.getenv("AOS_CORE4_NOTIFY_WINDOW", "3") or "3")
+CORE4_BATCH_MAX = int(os.getenv("AOS_CORE4_BATCH_MAX", "1000") or "1000")
+CORE4_KEY_INDEX_PATH = Path(
+    os.getenv("AOS_CORE4_KEY_INDEX", Path.home() / ".cache/alphaos/bridge-core4-keys.json")
+).expanduser()
+CORE4_KEY_INDEX_DAYS = int(os.getenv("AOS_CORE4_KEY_INDEX_DAYS", "62") or "62")
 CORE4CTL_BIN = os.getenv(
     "AOS_CORE4CTL_BIN", str((Path(__file__).resolve().parents[1] / "core4" / "python-core4" / "core4ctl"))
 ).strip()
@@ -83,6 +110,10 @@ BRIDGE_TOKEN = os.getenv("AOS_BRIDGE_TOKEN", "").strip()
 BRIDGE_TOKEN_HEADER = os.getenv("AOS_BRIDGE_TOKEN_HEADER", "X-Bridge-Token").strip()
 QUEUE_DIR = Path(os.getenv("AOS_BRIDGE_QUEUE_DIR", Path.home() / ".cache/alphaos/bridge-queue")).expanduser()
 
+# Tent return-report cache (shared on disk with the Tent bot, see lib/tent_cache.py)
+TENT_CACHE_TTL = int(os.getenv("AOS_TENT_CACHE_TTL", "900") or "900")
+TENT_PRECOMPUTE_INTERVAL = int(os.getenv("AOS_TENT_PRECOMPUTE_INTERVAL", "900") or "0")
+
 FIREMAP_BIN = os.getenv("AOS_FIREMAP_BIN", "firemap").strip()
 FIREMAP_TRIGGER_ARGS = os.getenv("AOS_FIREMAP_TRIGGER_ARGS", "sync").strip()
 
@@ -125,9 +156,9 @@ def _git_rev_short() -> str:
 
 BRIDGE_VERSION = os.getenv("AOS_BRIDGE_VERSION", "") or _git_rev_short()
 
+# core4_lock: ledger appends + key index (short). core4_build_lock: derived day/week rebuilds.
 core4_lock = asyncio.Lock()
-core4_push_lock = asyncio.Lock()
-core4_last_push_mono = 0.0
+core4_build_lock = asyncio.Lock()
 fruits_lock = asyncio.Lock()
 queue_lock = asyncio.Lock()
 firemap_lock = asyncio.Lock()
@@ -184,6 +215,13 @@ async def _bridge_heartbeat_loop() -> None:
 
 
 async def _on_startup(app: web.Application) -> None:
+    sender = _get_tg_sender()
+    if sender is not None:
+        app["tg_queue_task"] = asyncio.create_task(_tg_queue_loop(sender))
+    if TENT_PRECOMPUTE_INTERVAL > 0:
+        app["tent_precompute_task"] = asyncio.create_task(
+            _get_tent_cache().precompute_loop(TENT_PRECOMPUTE_INTERVAL)
+        )
     if not BRIDGE_HEARTBEAT_ENABLED:
         LOGGER.info("Bridge heartbeat disabled (AOS_BRIDGE_HEARTBEAT_ENABLED=0)")
         return
@@ -199,14 +237,23 @@ async def _on_startup(app: web.Application) -> None:
 
 
 async def _on_cleanup(app: web.Application) -> None:
-    task = app.get("bridge_heartbeat_task")
-    if task is None:
-        return
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    for key in ("bridge_heartbeat_task", "tg_queue_task", "tent_precompute_task"):
+        task = app.get(key)
+        if task is None:
+            continue
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    if _core4_bus is not None:
+        # Push/mirror wait out CORE4_AUTO_PUSH_MIN_INTERVAL between runs; run them now.
+        await _core4_bus.flush(timeout=10.0, urgent=True)
+        await _core4_bus.close()
+    if _tg_sender is not None:
+        _tg_sender.close()
+    if _tent_cache is not None:
+        await _tent_cache.close()
 
 
 @web.middleware
@@ -373,27 +420,58 @@ async def _send_tele(payload: Dict[str, Any]) -> None:
         return
 
 
-async def _send_tele_text(text: str, *, silent: bool = False) -> None:
-    if not TELE_BIN:
+_tg_sender: Optional[TelegramSender] = None
+
+
+def _get_tg_sender() -> Optional[TelegramSender]:
+    global _tg_sender
+    if not TG_BOT_TOKEN or not TG_CHAT_IDS:
+        return None
+    if _tg_sender is None:
+        _tg_sender = TelegramSender(TG_BOT_TOKEN, queue_path=TG_QUEUE_PATH, log=LOGGER.warning)
+    return _tg_sender
+
+
+async def _tg_queue_loop(sender: TelegramSender) -> None:
+    while True:
+        await asyncio.sleep(60)
+        try:
+            await asyncio.to_thread(sender.drain_queue)
+        except Exception as exc:
+            LOGGER.warning("telegram queue drain failed: %s", exc)
+
+
+async def _send_tele_texts(texts: list[str], *, silent: bool = False) -> None:
+    """Send messages in order, packed into as few Telegram messages as possible."""
+    parts = [p for text in texts for p in split_text(str(text or ""))]
+    if not parts:
         return
-    if not shutil.which(TELE_BIN):
+    sender = _get_tg_sender()
+    if sender is not None:
+        await asyncio.to_thread(sender.send_many, TG_CHAT_IDS, parts, silent=silent)
         return
-    msg = str(text or "").strip()
-    if not msg:
+    if not TELE_BIN:
         return
-    try:
-        args = [TELE_BIN]
-        if silent:
-            args.append("-s")
-        args.append(msg)
-        proc = await asyncio.create_subprocess_exec(
-            *args,
-            stdout=asyncio.subprocess.DEVNULL,
-            stderr=asyncio.subprocess.DEVNULL,
-        )
-        await asyncio.wait_for(proc.wait(), timeout=10)
-    except Exception:
+    if not shutil.which(TELE_BIN):
         return
+    for msg in merge_texts(parts):
+        try:
+            args = [TELE_BIN]
+            if silent:
+                args.append("-s")
+            args.append(msg)
+            proc = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            await asyncio.wait_for(proc.wait(), timeout=10)
+        except Exception:
+            return
+
+
+async def _send_tele_text(text: str, *, silent: bool = False) -> None:
+    await _send_tele_texts([text], silent=silent)
 
 
 def _format_core4_notify(
@@ -418,15 +496,23 @@ def _core4_chat_user() -> tuple[Optional[int], Optional[int]]:
         return None, None
 
 
+def _format_core4_batch_notify(events: list[Dict[str, Any]], total_by_day: dict[str, float], source: str) -> str:
+    points = sum(_safe_float(e.get("points"), 0.0) for e in events)
+    days = ", ".join(f"{day} {total:.1f}" for day, total in sorted(total_by_day.items()))
+    return f"CORE4 +{points:.1f} ({len(events)} logs) | {days} | src:{source}"
+
+
 def _send_desktop_notify(domain: str, task: str, points: float, total_today: float) -> None:
     """Send desktop notification via notify-send (compatible with all notification daemons)."""
+    _send_desktop_notify_text(f"Core4: {domain}/{task}", f"+{points:.1f} points | Today: {total_today:.1f}")
+
+
+def _send_desktop_notify_text(summary: str, body: str) -> None:
     if not CORE4_DESKTOP_NOTIFY:
         return
     try:
         # Use systemd-run --user to ensure notification runs in user session (with DISPLAY/DBUS)
         # notify-send works with dunst, Plasma, GNOME, etc.
-        summary = f"Core4: {domain}/{task}"
-        body = f"+{points:.1f} points | Today: {total_today:.1f}"
         subprocess.run(
             [
                 "systemd-run",
@@ -474,26 +560,86 @@ async def _send_core4_notify(text: str) -> None:
     await _send_tele_text(text, silent=CORE4_NOTIFY_SILENT)
 
 
-async def _core4_auto_push() -> None:
-    global core4_last_push_mono
-    if not CORE4_AUTO_PUSH:
-        return
-    now_mono = time.monotonic()
-    if now_mono - core4_last_push_mono < CORE4_AUTO_PUSH_MIN_INTERVAL:
-        return
-    if core4_push_lock.locked():
+# Core4 side effects run as event-bus consumers, so a log returns right after
+# the ledger append. Each published item: {"event": <ledger event>, "total": <day total>, "mirror": bool}.
+_core4_bus: Optional[EventBus] = None
+
+
+async def _core4_rebuild_effect(items: list[Dict[str, Any]]) -> None:
+    days = sorted({str(item["event"]["date"]) for item in items})
+    async with core4_build_lock:
+        await asyncio.to_thread(_core4_rebuild_days, days)
+
+
+async def _core4_notify_effect(items: list[Dict[str, Any]]) -> None:
+    events = [item["event"] for item in items]
+    if len(events) == 1:
+        ev, total = events[0], items[0]["total"]
+        text = _format_core4_notify(ev["domain"], ev["task"], ev["points"], total, ev["source"], _parse_ts(ev["ts"]))
+        summary, body = f"Core4: {ev['domain']}/{ev['task']}", f"+{ev['points']:.1f} points | Today: {total:.1f}"
+    else:
+        total_by_day: dict[str, float] = {}
+        for item in items:
+            day_key = item["event"]["date"]
+            total_by_day[day_key] = max(total_by_day.get(day_key, 0.0), item["total"])
+        sources = sorted({e["source"] for e in events})
+        source = sources[0] if len(sources) == 1 else "mixed"
+        text = _format_core4_batch_notify(events, total_by_day, source)
+        points = sum(_safe_float(e.get("points"), 0.0) for e in events)
+        summary, body = f"Core4: {len(events)} logs", f"+{points:.1f} points | src:{source}"
+    if CORE4_NOTIFY:
+        await _send_core4_notify(text)
+    await asyncio.to_thread(_send_desktop_notify_text, summary, body)
+
+
+async def _core4_push_effect(_items: list[Dict[str, Any]]) -> None:
+    result = await _run_core4ctl(["sync-core4"], timeout_s=180.0)
+    if result.get("ok"):
+        LOGGER.info("core4 auto-push ok")
         return
-    async with core4_push_lock:
-        now_mono = time.monotonic()
-        if now_mono - core4_last_push_mono < CORE4_AUTO_PUSH_MIN_INTERVAL:
-            return
-        core4_last_push_mono = now_mono
-        result = await _run_core4ctl(["sync-core4"], timeout_s=180.0)
-        if result.get("ok"):
-            LOGGER.info("core4 auto-push ok")
-            return
-        err = result.get("error") or result.get("stderr") or result.get("stdout") or "unknown error"
-        LOGGER.warning("core4 auto-push failed: %s", str(err)[:800])
+    err = result.get("error") or result.get("stderr") or result.get("stdout") or "unknown error"
+    LOGGER.warning("core4 auto-push failed: %s", str(err)[:800])
+
+
+async def _core4_tw_mirror_effect(items: list[Dict[str, Any]]) -> None:
+    # Log via tracker.py (creates + completes TW task → on-modify hooks fire); once per habit+day.
+    seen: set[tuple[str, str]] = set()
+    for item in items:
+        ev = item["event"]
+        if not item.get("mirror") or not ev.get("done"):
+            continue
+        habit = _CORE4_TW_TAG.get(ev["task"], ev["task"])
+        if (habit, ev["date"]) in seen:
+            continue
+        seen.add((habit, ev["date"]))
+        await _run_tracker_done(habit, ev["date"])
+
+
+def _get_core4_bus() -> EventBus:
+    global _core4_bus
+    if _core4_bus is None:
+        bus = EventBus()
+        bus.subscribe("core4.logged", "core4-rebuild", _core4_rebuild_effect, window=CORE4_REBUILD_WINDOW)
+        if CORE4_NOTIFY or CORE4_DESKTOP_NOTIFY:
+            bus.subscribe("core4.logged", "core4-notify", _core4_notify_effect, window=CORE4_NOTIFY_WINDOW)
+        if CORE4_AUTO_PUSH:
+            bus.subscribe(
+                "core4.logged",
+                "core4-push",
+                _core4_push_effect,
+                window=CORE4_NOTIFY_WINDOW,
+                min_interval=CORE4_AUTO_PUSH_MIN_INTERVAL,
+            )
+        if TASK_EXEC_ENABLED:
+            bus.subscribe("core4.logged", "core4-tw-mirror", _core4_tw_mirror_effect, window=CORE4_REBUILD_WINDOW)
+        _core4_bus = bus
+    return _core4_bus
+
+
+def _core4_publish_logged(events: list[Dict[str, Any]], totals: dict[str, float], *, mirror: bool) -> None:
+    bus = _get_core4_bus()
+    for event in events:
+        bus.publish("core4.logged", {"event": event, "total": totals.get(event["date"], 0.0), "mirror": mirror})
 
 
 async def _post_to_gas(payload: Dict[str, Any], chat_id: int, user_id: int) -> tuple[bool, str]:
@@ -744,8 +890,32 @@ def _core4_read_event(path: Path) -> Optional[Dict[str, Any]]:
     return data if isinstance(data, dict) else None
 
 
-def _core4_events_for_day(day_key: str) -> list[Dict[str, Any]]:
+_CORE4_SCAN_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _core4_scan_pool() -> ThreadPoolExecutor:
+    global _CORE4_SCAN_POOL
+    if _CORE4_SCAN_POOL is None:
+        workers = int(os.getenv("AOS_CORE4_SCAN_WORKERS", "8"))
+        _CORE4_SCAN_POOL = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="core4-scan")
+    return _CORE4_SCAN_POOL
+
+
+def _core4_read_day_dir(day_dir: Path, day_key: str) -> list[Dict[str, Any]]:
+    try:
+        with os.scandir(day_dir) as it:
+            names = sorted(e.name for e in it if e.name.endswith(".json") and e.is_file())
+    except OSError:
+        return []
     out: list[Dict[str, Any]] = []
+    for name in names:
+        ev = _core4_read_event(day_dir / name)
+        if ev and str(ev.get("date") or "").strip() == day_key:
+            out.append(ev)
+    return out
+
+
+def _core4_event_bases() -> list[Path]:
     # Optimization: Skip mount directories that don't exist or are set to /nonexistent
     # This prevents 30s hangs on hung rclone mounts
     bases = []
@@ -756,20 +926,109 @@ def _core4_events_for_day(day_key: str) -> list[Dict[str, Any]]:
     if mount_path_str != "/nonexistent" and not mount_path_str.endswith("/nonexistent"):
         if CORE4_MOUNT_DIR.exists():
             bases.append(CORE4_MOUNT_DIR)
+    return bases
+
+
+def _core4_events_for_days(day_keys: list[str]) -> Dict[str, list[Dict[str, Any]]]:
+    """Events per day; every (root, day) dir is scanned on a thread pool, merged in root order."""
+    ev_roots = [ev_root for base in _core4_event_bases() for ev_root in _core4_event_dirs(base)]
+    jobs = [(day_key, ev_root / day_key) for day_key in day_keys for ev_root in ev_roots]
+    pool = _core4_scan_pool()
+    futures = [pool.submit(_core4_read_day_dir, path, day_key) for day_key, path in jobs]
+    out: Dict[str, list[Dict[str, Any]]] = {k: [] for k in day_keys}
+    for (day_key, _path), fut in zip(jobs, futures):
+        out[day_key].extend(fut.result())
+    return out
+
+
+def _core4_events_for_day(day_key: str) -> list[Dict[str, Any]]:
+    return _core4_events_for_days([day_key])[day_key]
+
 
-    for base in bases:
+# Entry keys per day (key -> points counted for the day), for O(1) duplicate
+# checks and day totals without a re-scan. A day is valid while the mtimes of
+# its event dirs match the stored signature; it is persisted to
+# CORE4_KEY_INDEX_PATH so a restarted bridge does not re-scan every day.
+_CORE4_KEY_INDEX: Optional[dict[str, tuple[list[int], dict[str, float]]]] = None
+
+
+def _core4_day_signature(day_key: str) -> list[int]:
+    sig: list[int] = []
+    for base in _core4_event_bases():
         for ev_root in _core4_event_dirs(base):
-            day_dir = ev_root / day_key
-            if not day_dir.exists():
-                continue
-            for path in sorted(p for p in day_dir.glob("*.json") if p.is_file()):
-                ev = _core4_read_event(path)
-                if not ev:
-                    continue
-                if str(ev.get("date") or "").strip() != day_key:
-                    continue
-                out.append(ev)
-    return out
+            try:
+                sig.append((ev_root / day_key).stat().st_mtime_ns)
+            except OSError:
+                sig.append(-1)
+    return sig
+
+
+def _core4_key_index() -> dict[str, tuple[list[int], dict[str, float]]]:
+    global _CORE4_KEY_INDEX
+    if _CORE4_KEY_INDEX is None:
+        _CORE4_KEY_INDEX = {}
+        raw = _load_json(CORE4_KEY_INDEX_PATH, {})
+        days = raw.get("days") if isinstance(raw, dict) and raw.get("root") == str(CORE4_LOCAL_DIR) else None
+        for day_key, item in (days or {}).items():
+            if isinstance(item, dict) and isinstance(item.get("sig"), list) and isinstance(item.get("keys"), dict):
+                _CORE4_KEY_INDEX[day_key] = (item["sig"], {k: _safe_float(v, 0.0) for k, v in item["keys"].items()})
+    return _CORE4_KEY_INDEX
+
+
+def _core4_key_index_save() -> None:
+    # Only recent days are persisted; older ones are cheap to re-scan on demand.
+    cutoff = (_now().date() - timedelta(days=CORE4_KEY_INDEX_DAYS)).isoformat()
+    data = {
+        "root": str(CORE4_LOCAL_DIR),
+        "days": {k: {"sig": sig, "keys": keys} for k, (sig, keys) in sorted(_core4_key_index().items()) if k >= cutoff},
+    }
+    try:
+        _ensure_dir(CORE4_KEY_INDEX_PATH.parent)
+        tmp = CORE4_KEY_INDEX_PATH.with_name(CORE4_KEY_INDEX_PATH.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, CORE4_KEY_INDEX_PATH)
+    except OSError as exc:
+        LOGGER.warning("core4 key index save failed: %s", exc)
+
+
+def _core4_entry_points(entry: Dict[str, Any]) -> float:
+    return 0.0 if entry.get("done") is False else _safe_float(entry.get("points", 0), 0.0)
+
+
+def _core4_day_keys(day_keys: list[str]) -> dict[str, dict[str, float]]:
+    """Entry key -> points per day; only days whose event dirs changed are re-scanned."""
+    index = _core4_key_index()
+    sigs = {day_key: _core4_day_signature(day_key) for day_key in day_keys}
+    stale = [day_key for day_key in day_keys if day_key not in index or index[day_key][0] != sigs[day_key]]
+    if stale:
+        for day_key, events in _core4_events_for_days(stale).items():
+            keys = {str(e.get("key") or ""): _core4_entry_points(e) for e in _core4_dedup_entries(events)}
+            keys.pop("", None)
+            index[day_key] = (sigs[day_key], keys)
+        _core4_key_index_save()
+    return {day_key: index[day_key][1] for day_key in day_keys}
+
+
+def _core4_append_events(events: list[Dict[str, Any]]) -> dict[str, float]:
+    """Write ledger events and record them in the index (caller holds core4_lock).
+
+    Returns the day total for every touched day (same rules as _core4_dedup_entries:
+    done wins, max points per key).
+    """
+    day_keys = sorted({str(e.get("date") or "").strip() for e in events} - {""})
+    keys_by_day = _core4_day_keys(day_keys)
+    for event in events:
+        _core4_write_event(event)
+        day_key = str(event.get("date") or "").strip()
+        key = str(event.get("key") or "")
+        if day_key and key:
+            keys = keys_by_day[day_key]
+            keys[key] = max(keys.get(key, 0.0), _core4_entry_points(event))
+    index = _core4_key_index()
+    for day_key in day_keys:
+        index[day_key] = (_core4_day_signature(day_key), keys_by_day[day_key])
+    _core4_key_index_save()
+    return {day_key: sum(keys_by_day[day_key].values()) for day_key in day_keys}
 
 
 def _core4_normalize_entry_sources(entry: Dict[str, Any]) -> list[str]:
@@ -891,12 +1150,11 @@ def _core4_build_day(day_key: str) -> Dict[str, Any]:
     return data
 
 
-def _core4_build_week_for_date(day: date) -> Dict[str, Any]:
+def _core4_build_week_for_date(day: date, *, save: bool = True) -> Dict[str, Any]:
     start = day - timedelta(days=day.isoweekday() - 1)
     events: list[Dict[str, Any]] = []
-    for i in range(7):
-        d = start + timedelta(days=i)
-        events.extend(_core4_events_for_day(d.isoformat()))
+    for day_events in _core4_events_for_days([(start + timedelta(days=i)).isoformat() for i in range(7)]).values():
+        events.extend(day_events)
     entries = _core4_dedup_entries(events)
     week = f"{day.isocalendar().year}-W{day.isocalendar().week:02d}"
     data: Dict[str, Any] = {
@@ -905,10 +1163,25 @@ def _core4_build_week_for_date(day: date) -> Dict[str, Any]:
         "entries": entries,
         "totals": _core4_compute_totals(entries),
     }
-    _save_json(_core4_path(week), data)
+    if save:
+        _save_json(_core4_path(week), data)
     return data
 
 
+def _core4_rebuild_day_and_week(day_key: str, day: date) -> Dict[str, Any]:
+    _core4_build_day(day_key)
+    return _core4_build_week_for_date(day)
+
+
+def _core4_rebuild_days(day_keys: list[str]) -> None:
+    weeks: dict[str, date] = {}
+    for day_key in day_keys:
+        day_data = _core4_build_day(day_key)
+        weeks.setdefault(day_data["week"], date.fromisoformat(day_key))
+    for day in weeks.values():
+        _core4_build_week_for_date(day)
+
+
 def _core4_week_start(week: str) -> Optional[date]:
     text = str(week or "").strip()
     m = re.fullmatch(r"(\d{4})-W(\d{2})", text)
@@ -939,16 +1212,17 @@ def _core4_finalize_week(week: str, *, force: bool = False) -> dict[str, Any]:
     if not start:
         return {"ok": False, "error": "invalid week"}
 
-    data = _core4_build_week_for_date(start)
-    totals = data.get("totals") if isinstance(data.get("totals"), dict) else {}
-    by_domain = totals.get("by_domain") if isinstance(totals.get("by_domain"), dict) else {}
-
     sealed_dir = _core4_sealed_dir()
     _ensure_dir(sealed_dir)
     marker = sealed_dir / f"{week}.json"
     if marker.exists() and not force:
         return {"ok": True, "week": week, "sealed": True, "skipped": True}
 
+    # Seal-time read only: the derived week JSON is not rewritten here.
+    data = _core4_build_week_for_date(start, save=False)
+    totals = data.get("totals") if isinstance(data.get("totals"), dict) else {}
+    by_domain = totals.get("by_domain") if isinstance(totals.get("by_domain"), dict) else {}
+
     row = {
         "week": week,
         "updated_at": str(data.get("updated_at") or ""),
@@ -1521,10 +1795,7 @@ async def handle_bridge_fire_daily(request: web.Request) -> web.Response:
 
     sent = False
     if send:
-        for chunk in messages or [message]:
-            if not chunk:
-                continue
-            await _send_tele_text(chunk)
+        await _send_tele_texts(messages or [message])
         sent = True
 
     return web.json_response(
@@ -1785,7 +2056,7 @@ async def handle_api_core4_day_state(request: web.Request) -> web.Response:
     day = _core4_date_from_query(request.query.get("date"))
     if not day:
         return web.json_response({"ok": False, "error": "invalid date"}, status=400)
-    async with core4_lock:
+    async with core4_build_lock:
         week_data = _core4_build_week_for_date(day)
     return web.json_response(_core4_day_payload_for(day, week_data))
 
@@ -1794,7 +2065,7 @@ async def handle_api_core4_week_summary(request: web.Request) -> web.Response:
     day = _core4_date_from_query(request.query.get("date"))
     if not day:
         return web.json_response({"ok": False, "error": "invalid date"}, status=400)
-    async with core4_lock:
+    async with core4_build_lock:
         week_data = _core4_build_week_for_date(day)
     totals = week_data.get("totals") if isinstance(week_data.get("totals"), dict) else {}
     return web.json_response({"ok": True, "week": week_data.get("week"), "totals": totals})
@@ -1834,14 +2105,12 @@ async def handle_api_core4_log(request: web.Request) -> web.Response:
         "user": payload.get("user") or {},
     }
 
-    duplicate = False
     async with core4_lock:
-        existing = _core4_dedup_entries(_core4_events_for_day(date_key))
-        duplicate = any(str(e.get("key") or "") == entry_key for e in existing)
+        duplicate = entry_key in _core4_day_keys([date_key])[date_key]
         if not duplicate:
-            _core4_write_event(event)
-        _core4_build_day(date_key)
-        week_data = _core4_build_week_for_date(ts.date())
+            _core4_append_events([event])
+    async with core4_build_lock:
+        week_data = await asyncio.to_thread(_core4_rebuild_day_and_week, date_key, ts.date())
 
     day_payload = _core4_day_payload_for(ts.date(), week_data)
     totals = week_data.get("totals") if isinstance(week_data.get("totals"), dict) else {}
@@ -1931,26 +2200,13 @@ async def handle_fire_api_reorder(request: web.Request) -> web.Response:
     return web.json_response({"ok": True, "data": data, "score": _fire_score(data)})
 
 
-async def handle_core4_log(request: web.Request) -> web.Response:
-    """
-    Core4 event log endpoint (called by Gas HQ via Tailscale).
-
-    Flow:
-      1. Gas HQ saves to Drive (source of truth)
-      2. Gas HQ POSTs event to this endpoint (best-effort sync)
-      3. Bridge writes event file → builds day aggregate → returns total
-
-    Performance (2026-02-25):
-      - Week JSON rebuild removed (was expensive: reads all 7 days)
-      - Only day aggregate built (fast: 55ms typical)
-      - Week JSON built on-demand via /bridge/core4/week endpoint
-    """
-    payload = await _read_json(request)
+def _core4_event_from_payload(payload: Dict[str, Any], *, default_source: str = "bridge") -> Optional[Dict[str, Any]]:
+    """Ledger event for a /core4/log payload; None when domain/task are missing."""
     domain = str(payload.get("domain", "")).strip().lower()
     task = _core4_canon_task(str(payload.get("task", "")).strip().lower())
     domain = _core4_infer_domain(domain, task)
     if not domain or not task:
-        return web.json_response({"ok": False, "error": "missing domain or task"}, status=400)
+        return None
 
     ts = _parse_ts(payload.get("ts") or payload.get("timestamp"))
     done = bool(payload.get("done", True))
@@ -1958,8 +2214,8 @@ async def handle_core4_log(request: web.Request) -> web.Response:
     week = _week_key(ts)
     date_key = _date_key(ts)
     entry_key = str(payload.get("key") or "").strip() or _core4_entry_key(date_key, domain, task)
-    source = str(payload.get("source", "bridge"))
-    event = {
+    source = str(payload.get("source", default_source))
+    return {
         "id": payload.get("id") or str(uuid.uuid4()),
         "key": entry_key,
         "ts": ts.isoformat(),
@@ -1975,30 +2231,95 @@ async def handle_core4_log(request: web.Request) -> web.Response:
         "user": payload.get("user") or {},
     }
 
-    async with core4_lock:
-        _core4_write_event(event)
-        day_data = _core4_build_day(date_key)
-        # Optimization: Don't rebuild week JSON on every log (expensive: reads 7 days)
-        # Week is rebuilt on-demand via /bridge/core4/week endpoint
-        # We only need today's total for the response
 
-    total_today = day_data.get("day_total", 0.0) if day_data else 0.0
-    if CORE4_NOTIFY:
-        message = _format_core4_notify(domain, task, points, total_today, source, ts)
-        await _send_core4_notify(message)
-    _send_desktop_notify(domain, task, points, total_today)
-    if CORE4_AUTO_PUSH:
-        asyncio.create_task(_core4_auto_push())
-    # Log via tracker.py (creates + completes TW task → on-modify hooks fire)
-    if done and TASK_EXEC_ENABLED:
-        asyncio.create_task(_run_tracker_done(_CORE4_TW_TAG.get(task, task), date_key))
+async def handle_core4_log(request: web.Request) -> web.Response:
+    """
+    Core4 event log endpoint (called by Gas HQ via Tailscale).
+
+    Flow:
+      1. Gas HQ saves to Drive (source of truth)
+      2. Gas HQ POSTs event to this endpoint (best-effort sync)
+      3. Bridge appends the event file → returns the day total from the key index
+      4. Side effects (day/week rebuild, notify, auto-push, TW mirror) run as
+         coalescing event-bus consumers after the response (see /core4/effects)
+
+    Performance (2026-02-25):
+      - Week JSON rebuild removed (was expensive: reads all 7 days)
+      - Only day aggregate built (fast: 55ms typical)
+      - Week JSON built on-demand via /bridge/core4/week endpoint
+    """
+    payload = await _read_json(request)
+    event = _core4_event_from_payload(payload)
+    if not event:
+        return web.json_response({"ok": False, "error": "missing domain or task"}, status=400)
+
+    async with core4_lock:
+        totals = _core4_append_events([event])
+    _core4_publish_logged([event], totals, mirror=True)
+    week, total_today = event["week"], totals.get(event["date"], 0.0)
     return web.json_response({"ok": True, "week": week, "total_today": total_today})
 
 
+async def handle_core4_log_batch(request: web.Request) -> web.Response:
+    """
+    Bulk Core4 event log (TW replays, TickTick backfills, offline PWA queues).
+
+    Payload: {"events": [<same fields as /core4/log>, ...], "source": optional default}.
+    All events are deduped against the key index and appended under one
+    core4_lock acquisition; the event-bus consumers then rebuild each touched
+    day/week once and send one notification / auto-push for the burst.
+    """
+    payload = await _read_json(request)
+    items = payload.get("events")
+    if not isinstance(items, list):
+        return web.json_response({"ok": False, "error": "events must be a list"}, status=400)
+    if len(items) > CORE4_BATCH_MAX:
+        return web.json_response({"ok": False, "error": f"too many events (max {CORE4_BATCH_MAX})"}, status=413)
+    default_source = str(payload.get("source") or "bridge")
+    events: list[Dict[str, Any]] = []
+    rejected = 0
+    for item in items:
+        event = _core4_event_from_payload(item, default_source=default_source) if isinstance(item, dict) else None
+        if event:
+            events.append(event)
+        else:
+            rejected += 1
+
+    written: list[Dict[str, Any]] = []
+    total_by_day: dict[str, float] = {}
+    async with core4_lock:
+        keys_by_day = _core4_day_keys(sorted({e["date"] for e in events}))
+        seen = set().union(*keys_by_day.values())
+        for event in events:
+            if event["key"] in seen:
+                continue
+            seen.add(event["key"])
+            written.append(event)
+        if written:
+            total_by_day = _core4_append_events(written)
+    # Replays come from Taskwarrior already: no TW mirroring for batches.
+    _core4_publish_logged(written, total_by_day, mirror=False)
+    return web.json_response(
+        {
+            "ok": True,
+            "received": len(items),
+            "written": len(written),
+            "duplicates": len(events) - len(written),
+            "rejected": rejected,
+            "total_by_day": total_by_day,
+        }
+    )
+
+
+async def handle_core4_effects(_request: web.Request) -> web.Response:
+    """Side-effect pipeline metrics: per consumer queue depth, runs, errors and publish->done lag."""
+    return web.json_response({"ok": True, "consumers": _get_core4_bus().metrics()})
+
+
 async def handle_core4_week(request: web.Request) -> web.Response:
     week = request.query.get("week") or _week_key(_now())
     start = _core4_week_start(week) or _now().date()
-    async with core4_lock:
+    async with core4_build_lock:
         data = _core4_build_week_for_date(start)
     return web.json_response({"ok": True, "data": data})
 
@@ -2007,7 +2328,7 @@ async def handle_core4_today(request: web.Request) -> web.Response:
     now = _now()
     week = _week_key(now)
     date_key = _date_key(now)
-    async with core4_lock:
+    async with core4_build_lock:
         data = _core4_build_week_for_date(now.date())
     entries = data.get("entries") or []
     total = _core4_total_for_date(entries, date_key)
@@ -2090,6 +2411,17 @@ async def handle_tent_summary(request: web.Request) -> web.Response:
     return web.json_response(resp)
 
 
+_tent_cache: Optional[TentReportCache] = None
+
+
+def _get_tent_cache() -> TentReportCache:
+    global _tent_cache
+    if _tent_cache is None:
+        index_url = os.getenv("INDEX_NODE_URL", "http://127.0.0.1:8799")
+        _tent_cache = TentReportCache(index_url, ttl=TENT_CACHE_TTL)
+    return _tent_cache
+
+
 async def handle_tent_sync(request: web.Request) -> web.Response:
     week = str(request.query.get("week", "")).strip()
     if not week:
@@ -2097,15 +2429,10 @@ async def handle_tent_sync(request: web.Request) -> web.Response:
         iso = now.isocalendar()
         week = f"{iso[0]}-W{iso[1]:02d}"
 
-    index_url = os.getenv("INDEX_NODE_URL", "http://127.0.0.1:8799")
-    tent_url = f"{index_url}/api/tent/component/return-report?week={week}"
-
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(tent_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                if resp.status != 200:
-                    return web.json_response({"ok": False, "error": f"Index Node returned {resp.status}"}, status=502)
-                tent_data = await resp.json()
+        tent_data = await _get_tent_cache().get(week)
+    except TentFetchError as e:
+        return web.json_response({"ok": False, "error": str(e)}, status=502)
     except asyncio.TimeoutError:
         return web.json_response({"ok": False, "error": "Index Node timeout"}, status=504)
     except Exception as e:
@@ -2146,18 +2473,11 @@ async def handle_tent_fetch(request: web.Request) -> web.Response:
         iso = now.isocalendar()
         week = f"{iso[0]}-W{iso[1]:02d}"
 
-    index_url = os.getenv("INDEX_NODE_URL", "http://127.0.0.1:8799")
-    tent_url = f"{index_url}/api/tent/component/return-report?week={week}"
-
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(tent_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                if resp.status != 200:
-                    return web.json_response({"ok": False, "error": f"Index Node returned {resp.status}"}, status=502)
-
-                tent_data = await resp.json()
-                return web.json_response(tent_data)
-
+        tent_data = await _get_tent_cache().get(week)
+        return web.json_response(tent_data)
+    except TentFetchError as e:
+        return web.json_response({"ok": False, "error": str(e)}, status=502)
     except asyncio.TimeoutError:
         return web.json_response({"ok": False, "error": "Index Node timeout"}, status=504)
     except Exception as e:
@@ -3000,7 +3320,10 @@ async def handle_debug(request: web.Request) -> web.Response:
         "core4_notify_mode": CORE4_NOTIFY_MODE,
         "core4_auto_push": CORE4_AUTO_PUSH,
         "core4_auto_push_min_interval": CORE4_AUTO_PUSH_MIN_INTERVAL,
+        "core4_rebuild_window": CORE4_REBUILD_WINDOW,
+        "core4_notify_window": CORE4_NOTIFY_WINDOW,
     }
+    debug_info["core4_effects"] = _get_core4_bus().metrics()
 
     debug_info["paths"] = {
         "vault_dir": str(VAULT_DIR),
@@ -3237,6 +3560,10 @@ def create_app() -> web.Application:
             web.post("/bridge/api/fire/reorder", handle_fire_api_reorder),
             web.post("/core4/log", handle_core4_log),
             web.post("/bridge/core4/log", handle_core4_log),
+            web.post("/core4/log/batch", handle_core4_log_batch),
+            web.post("/bridge/core4/log/batch", handle_core4_log_batch),
+            web.get("/core4/effects", handle_core4_effects),
+            web.get("/bridge/core4/effects", handle_core4_effects),
             web.get("/core4/week", handle_core4_week),
             web.get("/bridge/core4/week", handle_core4_week),
             web.get("/core4/today", handle_core4_today),
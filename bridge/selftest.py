@@ -41,6 +41,9 @@ async def main() -> int:
         os.environ["AOS_FRUITS_DIR"] = str(base / "vault" / "Alpha_Fruits")
         os.environ["AOS_TENT_DIR"] = str(base / "vault" / "Alpha_Tent")
         os.environ["AOS_BRIDGE_QUEUE_DIR"] = str(base / "queue")
+        os.environ["AOS_CORE4_KEY_INDEX"] = str(base / "core4-keys.json")
+        os.environ["AOS_CORE4_DESKTOP_NOTIFY"] = "0"
+        os.environ["AOS_CORE4_REBUILD_WINDOW"] = "0"
         os.environ.pop("AOS_GAS_WEBHOOK_URL", None)
         os.environ.pop("AOS_GAS_CHAT_ID", None)
         os.environ.pop("AOS_GAS_USER_ID", None)
@@ -89,6 +92,46 @@ async def main() -> int:
         body = _load_json_response(resp)
         assert body.get("ok") is True and body.get("week") == "2025-W01"
 
+        # side effects run on the event bus after the response
+        await mod._get_core4_bus().flush()
+        assert (mod.CORE4_LOCAL_DIR / "core4_day_2025-01-01.json").exists()
+        resp = await mod.handle_core4_effects(StubRequest())
+        rebuild = _load_json_response(resp)["consumers"]["core4-rebuild"]
+        assert rebuild["runs"] == 1 and rebuild["errors"] == 0 and rebuild["queued"] == 0
+
+        # core4 batch -> one write pass, duplicates skipped (incl. the single log above)
+        batch = {
+            "source": "selftest-batch",
+            "events": [
+                {"domain": "body", "task": "fitness", "ts": "2025-01-01T12:00:00+01:00"},
+                {"task": "meditation", "ts": "2025-01-01T12:00:00+01:00"},
+                {"domain": "being", "task": "memoirs", "ts": "2025-01-02T12:00:00+01:00"},
+                {"domain": "being", "task": "memoirs", "ts": "2025-01-02T13:00:00+01:00"},
+                {"domain": "", "task": ""},
+            ],
+        }
+        resp = await mod.handle_core4_log_batch(StubRequest(payload=batch))
+        assert resp.status == 200
+        body = _load_json_response(resp)
+        assert body.get("ok") is True
+        assert (body.get("written"), body.get("duplicates"), body.get("rejected")) == (2, 2, 1)
+        assert body["total_by_day"] == {"2025-01-01": 1.0, "2025-01-02": 0.5}
+        resp = await mod.handle_core4_log_batch(StubRequest(payload={"events": {}}))
+        assert resp.status == 400
+
+        # api log -> duplicate detected via the key index (also after a reload from disk)
+        api_payload = {"domain": "being", "task": "memoirs", "date": "2025-01-02", "source": "selftest"}
+        resp = await mod.handle_api_core4_log(StubRequest(payload=api_payload))
+        body = _load_json_response(resp)
+        assert body.get("ok") is True and body.get("duplicate") is True
+        mod._CORE4_KEY_INDEX = None
+        api_payload["task"] = "person1"
+        resp = await mod.handle_api_core4_log(StubRequest(payload=api_payload))
+        body = _load_json_response(resp)
+        assert body.get("duplicate") is False and body["day"]["total"] == 1.0
+        resp = await mod.handle_api_core4_log(StubRequest(payload=api_payload))
+        assert _load_json_response(resp).get("duplicate") is True
+
         # core4 today/week
         resp = await mod.handle_core4_week(StubRequest(query={"week": "2025-W01"}))
         assert resp.status == 200
@@ -135,6 +178,8 @@ async def main() -> int:
         body = _load_json_response(resp)
         assert body.get("ok") is False and body.get("sent") == 0
 
+        await mod._get_core4_bus().close()
+
     return 0
 
 
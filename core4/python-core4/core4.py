@@ -3,14 +3,22 @@
 
 Thin wrapper around tracker.main so tooling can target `core4.py`
 while tracker implementation stays in `tracker.py`.
+
+Habit logs are forwarded to the warm Core4 daemon first (`core4 daemon`);
+without a daemon everything runs in-process as before.
 """
 
 from __future__ import annotations
 
 import sys
 
-from tracker import main
+from core4_client import forward
 
 
 if __name__ == "__main__":
-    sys.exit(main(sys.argv[1:]))
+    code = forward(sys.argv[1:])
+    if code is None:
+        from tracker import main
+
+        code = main(sys.argv[1:])
+    sys.exit(code)
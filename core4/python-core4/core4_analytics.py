@@ -0,0 +1,266 @@
+"""
+core4_analytics.py — Whole-ledger analytics (rollups, streaks, completion).
+Depends on: core4_types, core4_paths, core4_ledger, core4_scan, core4_segments
+
+The ledger is read once (all roots plus sealed segments, in parallel) and
+deduped by key into columnar `array`s; daily/weekly/monthly rollups are
+bincount-style passes over those columns. Nothing derived (day/week JSON)
+is read or written.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core4_types import DOMAIN_ORDER, HABIT_ORDER, normalize_habit
+from core4_paths import (
+    core4_daily_csv_path,
+    core4_dirs,
+    core4_event_dir,
+    core4_habits_csv_path,
+    core4_monthly_rollup_csv_path,
+    core4_weekly_csv_path,
+)
+from core4_ledger import _event_key_from_entry, _merge_entry, _safe_float
+from core4_scan import scan_days
+from core4_segments import sealed_weeks
+
+# Max points: 8 habits x 0.5 per day.
+DAY_MAX = 0.5 * len(HABIT_ORDER)
+
+
+def _csv_write(path: Path, rows: list[Dict[str, Any]], fieldnames: list[str]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, path)
+    return path
+
+
+def _day_keys(roots: list[Path], since: Optional[date]) -> set[str]:
+    since_key = since.isoformat() if since else ""
+    keys: set[str] = set()
+    for monday in sealed_weeks().values():
+        keys.update(k for k in ((monday + timedelta(days=i)).isoformat() for i in range(7)) if k >= since_key)
+    for base in roots:
+        try:
+            with os.scandir(core4_event_dir(base)) as it:
+                keys.update(e.name for e in it if len(e.name) == 10 and e.name >= since_key and e.is_dir())
+        except OSError:
+            continue
+    return keys
+
+
+class LedgerFrame:
+    """Deduped ledger entries as parallel columns (one row per entry key)."""
+
+    def __init__(self) -> None:
+        self.day = array("l")  # date ordinal
+        self.domain = array("b")  # DOMAIN_ORDER index, -1 unknown
+        self.habit = array("b")  # HABIT_ORDER index, -1 unknown
+        self.points = array("d")  # 0.0 when not done
+        self.source = array("h")  # index into self.sources
+        self.sources: list[str] = []
+
+    @classmethod
+    def load(cls, *, since: Optional[date] = None) -> "LedgerFrame":
+        by_key: Dict[str, Dict[str, Any]] = {}
+        roots = core4_dirs()
+        scanned = scan_days(sorted(_day_keys(roots, since)), roots)
+        for events in scanned.values():
+            for ev in events:
+                key = _event_key_from_entry(ev)
+                if not key:
+                    continue
+                prev = by_key.get(key)
+                by_key[key] = _merge_entry(prev, ev) if prev else ev
+        frame = cls()
+        source_idx: Dict[str, int] = {}
+        dom_idx = {d: i for i, d in enumerate(DOMAIN_ORDER)}
+        hab_idx = {h: i for i, h in enumerate(HABIT_ORDER)}
+        ordinals: Dict[str, int] = {}
+        for entry in by_key.values():
+            date_key = str(entry.get("date") or "")
+            ordinal = ordinals.get(date_key)
+            if ordinal is None:
+                try:
+                    ordinal = date.fromisoformat(date_key).toordinal()
+                except ValueError:
+                    continue
+                ordinals[date_key] = ordinal
+            try:
+                habit = hab_idx[normalize_habit(str(entry.get("task") or ""))]
+            except (KeyError, ValueError):
+                habit = -1
+            src = str(entry.get("source") or "")
+            if src not in source_idx:
+                source_idx[src] = len(frame.sources)
+                frame.sources.append(src)
+            frame.day.append(ordinal)
+            frame.domain.append(dom_idx.get(str(entry.get("domain") or "").strip().lower(), -1))
+            frame.habit.append(habit)
+            frame.points.append(0.0 if entry.get("done") is False else _safe_float(entry.get("points"), 0.0))
+            frame.source.append(source_idx[src])
+        return frame
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    # -- group-bys ------------------------------------------------------------
+
+    def _rollup(self, groups: array, size: int) -> tuple[array, array, array]:
+        """Per group: total points, points per domain (size x 4), entry count."""
+        total = array("d", bytes(8 * size))
+        by_domain = array("d", bytes(8 * size * len(DOMAIN_ORDER)))
+        count = array("l", bytes(array("l").itemsize * size))
+        ndom = len(DOMAIN_ORDER)
+        for g, d, p in zip(groups, self.domain, self.points):
+            if g < 0:
+                continue
+            total[g] += p
+            count[g] += 1
+            if d >= 0:
+                by_domain[g * ndom + d] += p
+        return total, by_domain, count
+
+    def daily_rows(self, start: date, end: date) -> list[Dict[str, Any]]:
+        base, size = start.toordinal(), (end - start).days + 1
+        groups = array("l", (o - base if 0 <= o - base < size else -1 for o in self.day))
+        total, by_domain, count = self._rollup(groups, size)
+        updated_at = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for i in range(size):
+            d = date.fromordinal(base + i)
+            iso = d.isocalendar()
+            row = {"date": d.isoformat(), "week": f"{iso.year}-W{iso.week:02d}", "day_total": total[i]}
+            for j, dom in enumerate(DOMAIN_ORDER):
+                row[dom] = by_domain[i * len(DOMAIN_ORDER) + j]
+            row["entry_count"] = count[i]
+            row["updated_at"] = updated_at
+            rows.append(row)
+        return rows
+
+    def weekly_rows(self) -> list[Dict[str, Any]]:
+        if not len(self):
+            return []
+        # Ordinal 1 (0001-01-01) is a Monday, so (ordinal - 1) // 7 is the ISO week bucket.
+        weeks = array("l", ((o - 1) // 7 for o in self.day))
+        first = min(weeks)
+        groups = array("l", (w - first for w in weeks))
+        size = max(weeks) - first + 1
+        total, by_domain, count = self._rollup(groups, size)
+        rows = []
+        for i in range(size):
+            if not count[i]:
+                continue
+            monday = date.fromordinal((first + i) * 7 + 1)
+            iso = monday.isocalendar()
+            row = {"week": f"{iso.year}-W{iso.week:02d}", "week_total": total[i]}
+            for j, dom in enumerate(DOMAIN_ORDER):
+                row[dom] = by_domain[i * len(DOMAIN_ORDER) + j]
+            row["entry_count"] = count[i]
+            row["completion"] = round(total[i] / (DAY_MAX * 7), 4)
+            rows.append(row)
+        return rows
+
+    def monthly_rows(self) -> list[Dict[str, Any]]:
+        if not len(self):
+            return []
+        month_of: Dict[int, int] = {}
+        for o in set(self.day):
+            d = date.fromordinal(o)
+            month_of[o] = d.year * 12 + d.month - 1
+        months = array("l", (month_of[o] for o in self.day))
+        first = min(months)
+        groups = array("l", (m - first for m in months))
+        size = max(months) - first + 1
+        total, by_domain, count = self._rollup(groups, size)
+        days_logged = [set() for _ in range(size)]
+        for g, o, p in zip(groups, self.day, self.points):
+            if p > 0:
+                days_logged[g].add(o)
+        rows = []
+        for i in range(size):
+            if not count[i]:
+                continue
+            year, mon = divmod(first + i, 12)
+            start = date(year, mon + 1, 1)
+            days = ((date(year + (mon == 11), (mon + 1) % 12 + 1, 1)) - start).days
+            row = {"month": f"{year:04d}-{mon + 1:02d}", "total": total[i]}
+            for j, dom in enumerate(DOMAIN_ORDER):
+                row[dom] = by_domain[i * len(DOMAIN_ORDER) + j]
+            row["entry_count"] = count[i]
+            row["days_logged"] = len(days_logged[i])
+            row["completion"] = round(total[i] / (DAY_MAX * days), 4)
+            rows.append(row)
+        return rows
+
+    def habit_rows(self, today: Optional[date] = None, window: int = 28) -> list[Dict[str, Any]]:
+        """Per habit: done days, current/longest streak, completion over `window` days and overall."""
+        today_o = (today or date.today()).toordinal()
+        done_days: list[set[int]] = [set() for _ in HABIT_ORDER]
+        for h, o, p in zip(self.habit, self.day, self.points):
+            if h >= 0 and p > 0:
+                done_days[h].add(o)
+        first_o = min(self.day) if len(self) else today_o
+        rows = []
+        for h, habit in enumerate(HABIT_ORDER):
+            days = done_days[h]
+            longest = run = 0
+            prev = None
+            for o in sorted(days):
+                run = run + 1 if prev is not None and o == prev + 1 else 1
+                longest = max(longest, run)
+                prev = o
+            # An open day (today not yet done) does not break the streak.
+            cur_o = today_o if today_o in days else today_o - 1
+            current = 0
+            while cur_o in days:
+                current += 1
+                cur_o -= 1
+            recent = sum(1 for o in days if today_o - window < o <= today_o)
+            span = max(1, today_o - first_o + 1)
+            rows.append(
+                {
+                    "habit": habit,
+                    "done_days": len(days),
+                    "current_streak": current,
+                    "longest_streak": longest,
+                    f"rate_{window}d": round(recent / window, 4),
+                    "rate_all": round(len(days) / span, 4),
+                }
+            )
+        return rows
+
+
+def export_all(*, days: int = 56, frame: Optional[LedgerFrame] = None) -> Dict[str, Path]:
+    """Load the ledger once and write daily (last `days`), weekly, monthly and habit CSVs."""
+    frame = frame or LedgerFrame.load()
+    end = date.today()
+    start = end - timedelta(days=days - 1)
+    daily = frame.daily_rows(start, end)
+    weekly = frame.weekly_rows()
+    monthly = frame.monthly_rows()
+    habits = frame.habit_rows(end)
+    return {
+        "daily": _csv_write(core4_daily_csv_path(), daily, list(daily[0].keys())),
+        "weekly": _csv_write(
+            core4_weekly_csv_path(),
+            weekly,
+            ["week", "week_total", *DOMAIN_ORDER, "entry_count", "completion"],
+        ),
+        "monthly": _csv_write(
+            core4_monthly_rollup_csv_path(),
+            monthly,
+            ["month", "total", *DOMAIN_ORDER, "entry_count", "days_logged", "completion"],
+        ),
+        "habits": _csv_write(core4_habits_csv_path(), habits, list(habits[0].keys())),
+    }
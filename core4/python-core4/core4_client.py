@@ -0,0 +1,120 @@
+"""
+core4_client.py — Thin client for the Core4 daemon (core4_daemon.py).
+Stdlib only and imported before any other core4_* module, so `core4 <habit>`
+costs one socket round-trip when the daemon is running.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Environment that changes what the tracker reads/writes. The daemon only
+# serves clients whose values match its own (otherwise: in-process fallback).
+ENV_KEYS = (
+    "HOME",
+    "AOS_VAULT_DIR",
+    "AOS_CORE4_DIR",
+    "AOS_CORE4_DIRS",
+    "AOS_CORE4_LOCAL_DIR",
+    "AOS_CORE4_MOUNT_DIR",
+    "AOS_BRIDGE_URL",
+    "AOS_TZ",
+    "TASKRC",
+    "TASKDATA",
+)
+
+# Flags that need core4ctl around the flow; those always run in-process.
+LOCAL_ONLY_FLAGS = ("--pull", "--push", "--sync")
+
+
+def socket_path() -> Path:
+    raw = os.environ.get("AOS_CORE4_SOCKET", "").strip()
+    if raw:
+        return Path(raw).expanduser()
+    runtime = os.environ.get("XDG_RUNTIME_DIR", "").strip()
+    if runtime:
+        return Path(runtime) / "core4.sock"
+    return Path(f"/tmp/core4-{os.getuid()}.sock")
+
+
+def env_fingerprint() -> Dict[str, str]:
+    return {key: os.environ.get(key, "") for key in ENV_KEYS}
+
+
+# Snapshot before core4_paths loads ~/.env/core4.env into os.environ, so the
+# client and a daemon started through core4.py compare like with like.
+RAW_ENV = env_fingerprint()
+
+
+def send_line(sock: socket.socket, payload: Dict[str, Any]) -> None:
+    sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+def recv_line(sock: socket.socket) -> Dict[str, Any]:
+    buf = bytearray()
+    while not buf.endswith(b"\n"):
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        buf.extend(chunk)
+    data = json.loads(buf.decode("utf-8") or "{}")
+    return data if isinstance(data, dict) else {}
+
+
+def request(payload: Dict[str, Any], *, timeout: float = 60.0) -> Optional[Dict[str, Any]]:
+    """One request/response round-trip; None when no daemon is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(str(socket_path()))
+        except OSError:
+            return None
+        send_line(sock, payload)
+        return recv_line(sock)
+    finally:
+        sock.close()
+
+
+def forward(argv: list[str]) -> Optional[int]:
+    """Run `core4 <argv>` on the daemon. None means: run it in-process instead."""
+    if os.environ.get("AOS_CORE4_NO_DAEMON"):
+        return None
+    if not argv or argv[0].startswith("-") or any(tok in LOCAL_ONLY_FLAGS for tok in argv):
+        return None
+    payload = {
+        "op": "habit",
+        "argv": argv,
+        "env": RAW_ENV,
+        "color": sys.stdout.isatty(),
+        "journal": sys.stdin.isatty() and sys.stdout.isatty(),
+    }
+    try:
+        resp = request(payload)
+    except (OSError, ValueError) as exc:
+        # The command may already have run on the daemon: do not run it twice.
+        print(f"core4: daemon error: {exc} (set AOS_CORE4_NO_DAEMON=1 to bypass)", file=sys.stderr)
+        return 1
+    if resp is None or resp.get("fallback"):
+        return None
+    if resp.get("stdout"):
+        sys.stdout.write(resp["stdout"])
+        sys.stdout.flush()
+    if resp.get("stderr"):
+        sys.stderr.write(resp["stderr"])
+    journal = resp.get("journal")
+    if isinstance(journal, dict):
+        # Opening the editor needs this terminal; only now pay for the full imports.
+        from core4_types import Target
+        from datetime import date
+        from tracker import open_habit_journal
+
+        open_habit_journal(
+            Target(habit=journal["habit"], domain=journal["domain"], day=date.fromisoformat(journal["date"]))
+        )
+    return int(resp.get("code") or 0)
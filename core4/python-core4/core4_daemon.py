@@ -0,0 +1,342 @@
+"""
+core4_daemon.py — Warm Core4 service behind `core4 <habit>`.
+Depends on: core4_client, core4_types, core4_paths, core4_ledger, core4_tw, tracker
+
+The thin client (core4_client.forward) sends the CLI argv over a Unix socket;
+the daemon runs `tracker.run_habit_flow` with warm state instead of a cold
+process:
+
+- ledger index: per-day set of done keys, re-scanned only when a day dir
+  mtime changes (or after AOS_CORE4_INDEX_TTL seconds)
+- Taskwarrior view: one `export` per date, reused until the TW data files
+  change (or after AOS_CORE4_TW_TTL seconds); `task --version` runs once
+- derived day/week snapshots are rebuilt in the background after the reply
+
+Requests are handled one at a time, so the flow sees the same ordering as
+separate CLI runs did.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core4_client import RAW_ENV, recv_line, request, send_line, socket_path
+from core4_types import Target, normalize_habit
+from core4_paths import core4_dirs, core4_event_dir
+from core4_ledger import build_day, build_week, list_events_for_day, _event_key_from_entry
+from core4_tw import _parse_due_to_date, ensure_taskwarrior, run_task
+from tracker import HabitOps, run_habit_flow
+
+INDEX_TTL = float(os.environ.get("AOS_CORE4_INDEX_TTL", "60"))
+TW_TTL = float(os.environ.get("AOS_CORE4_TW_TTL", "30"))
+REBUILD_DELAY = float(os.environ.get("AOS_CORE4_REBUILD_DELAY", "1.0"))
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+class LedgerIndex:
+    """Done keys per day; a day is re-read only when one of its dirs changed."""
+
+    def __init__(self, ttl: float = INDEX_TTL):
+        self.ttl = ttl
+        self._days: Dict[str, tuple[tuple, float, set[str]]] = {}
+
+    def _signature(self, date_key: str) -> tuple:
+        return tuple(_mtime_ns(core4_event_dir(base) / date_key) for base in core4_dirs())
+
+    def done_keys(self, day: date) -> set[str]:
+        date_key = day.isoformat()
+        sig = self._signature(date_key)
+        cached = self._days.get(date_key)
+        if cached and cached[0] == sig and time.monotonic() - cached[1] < self.ttl:
+            return cached[2]
+        keys: set[str] = set()
+        for ev in list_events_for_day(day):
+            if bool(ev.get("done", True)) and float(ev.get("points") or 0.0) >= 0.5:
+                key = _event_key_from_entry(ev)
+                if key:
+                    keys.add(key)
+        self._days[date_key] = (sig, time.monotonic(), keys)
+        return keys
+
+    def is_logged(self, target: Target) -> bool:
+        return target.entry_key in self.done_keys(target.day)
+
+
+class TaskwarriorView:
+    """Core4 tasks per date from one `task export`, reused until TW data changes."""
+
+    DATA_FILES = ("pending.data", "completed.data", "taskchampion.sqlite3", "taskchampion.sqlite3-wal")
+
+    def __init__(self, ttl: float = TW_TTL):
+        self.ttl = ttl
+        self._ready = False
+        self._dates: Dict[str, tuple[tuple, float, list[Dict[str, Any]]]] = {}
+
+    def _data_dirs(self) -> list[Path]:
+        raw = os.environ.get("TASKDATA", "").strip()
+        if raw:
+            return [Path(raw).expanduser()]
+        return [Path("~/.task").expanduser(), Path("~/.local/share/task").expanduser()]
+
+    def _signature(self) -> tuple:
+        return tuple(_mtime_ns(d / name) for d in self._data_dirs() for name in self.DATA_FILES)
+
+    def ensure(self) -> None:
+        if not self._ready:
+            ensure_taskwarrior()
+            self._ready = True
+
+    def invalidate(self) -> None:
+        self._dates.clear()
+
+    def tasks(self, target: Target) -> list[Dict[str, Any]]:
+        sig = self._signature()
+        cached = self._dates.get(target.date_key)
+        if cached and cached[0] == sig and time.monotonic() - cached[1] < self.ttl:
+            return cached[2]
+        res = run_task(["(", f"+{target.date_tag}", "or", f"due:{target.date_key}", ")", "export"])
+        if res.returncode != 0:
+            raise RuntimeError(f"task export failed: {res.stderr.strip() or res.stdout.strip()}")
+        try:
+            data = json.loads((res.stdout or "").strip() or "[]")
+        except ValueError:
+            data = []
+        tasks = [t for t in data if isinstance(t, dict)] if isinstance(data, list) else []
+        self._dates[target.date_key] = (sig, time.monotonic(), tasks)
+        return tasks
+
+    def find_uuid(self, target: Target, status: str) -> Optional[str]:
+        habit_tag = target.tw_habit_primary_tag
+        for task in self.tasks(target):
+            tags = task.get("tags") or []
+            if task.get("status") == status and target.date_tag in tags and habit_tag in tags:
+                return str(task.get("uuid") or "") or None
+        return None
+
+    def has_completed(self, target: Target) -> bool:
+        habit_tag = target.tw_habit_primary_tag
+        for task in self.tasks(target):
+            if task.get("status") != "completed" or habit_tag not in (task.get("tags") or []):
+                continue
+            if target.date_tag in (task.get("tags") or []) or _parse_due_to_date(task.get("due")) == target.day:
+                return True
+        return False
+
+
+class Rebuilder(threading.Thread):
+    """Background build_week/build_day for days touched by recent logs."""
+
+    def __init__(self, delay: float = REBUILD_DELAY):
+        super().__init__(name="core4-rebuild", daemon=True)
+        self.delay = delay
+        self._days: set[date] = set()
+        self._cond = threading.Condition()
+
+    def schedule(self, day: date) -> None:
+        with self._cond:
+            self._days.add(day)
+            self._cond.notify()
+
+    def run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._days:
+                    self._cond.wait()
+            # Coalesce a burst of logs into one rebuild per day.
+            time.sleep(self.delay)
+            with self._cond:
+                days, self._days = self._days, set()
+            for day in sorted(days):
+                try:
+                    build_week(day, write=True)
+                    build_day(day, write=True)
+                except Exception as exc:
+                    print(f"core4 daemon: rebuild {day} failed: {exc}", file=sys.__stderr__)
+
+
+class WarmOps(HabitOps):
+    def __init__(self, index: LedgerIndex, tw: TaskwarriorView, rebuilder: Rebuilder):
+        self.index = index
+        self.tw = tw
+        self.rebuilder = rebuilder
+
+    def is_already_logged(self, target: Target) -> bool:
+        return self.index.is_logged(target)
+
+    def tw_has_completed(self, target: Target) -> bool:
+        try:
+            self.tw.ensure()
+            return self.tw.has_completed(target)
+        except Exception:
+            return False
+
+    def ensure_taskwarrior(self) -> None:
+        self.tw.ensure()
+
+    def find_pending_uuid(self, target: Target) -> Optional[str]:
+        return self.tw.find_uuid(target, "pending")
+
+    def find_completed_uuid(self, target: Target) -> Optional[str]:
+        return self.tw.find_uuid(target, "completed")
+
+    def task_add(self, target: Target) -> Optional[str]:
+        try:
+            return HabitOps.task_add(target)
+        finally:
+            self.tw.invalidate()
+
+    def task_done(self, uuid: str) -> None:
+        try:
+            HabitOps.task_done(uuid)
+        finally:
+            self.tw.invalidate()
+
+    def rebuild_derived(self, day: date) -> None:
+        self.rebuilder.schedule(day)
+
+
+class Core4Daemon(socketserver.UnixStreamServer):
+    def __init__(self, path: Path):
+        self.path = path
+        self.ops = WarmOps(LedgerIndex(), TaskwarriorView(), Rebuilder())
+        self.started = time.time()
+        self.served = 0
+        if path.exists():
+            path.unlink()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(path), Handler)
+        finally:
+            os.umask(old_umask)
+        self.ops.rebuilder.start()
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(OSError):
+            self.path.unlink()
+
+    def handle_habit(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        argv = [str(a) for a in (req.get("argv") or [])]
+        if req.get("env") != RAW_ENV:
+            return {"fallback": True, "reason": "environment differs from daemon"}
+        try:
+            normalize_habit(argv[0])
+        except (IndexError, ValueError):
+            return {"fallback": True, "reason": "not a habit command"}
+
+        journal: Dict[str, Any] = {}
+
+        def open_journal(target: Target) -> None:
+            if req.get("journal"):
+                journal.update(habit=target.habit, domain=target.domain, date=target.date_key)
+
+        out, err = io.StringIO(), io.StringIO()
+        color = os.environ.get("CORE4_COLOR")
+        os.environ["CORE4_COLOR"] = "always" if req.get("color") else "never"
+        try:
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                try:
+                    code = run_habit_flow(
+                        argv, lambda c: c, skip_journal=False, ops=self.ops, open_journal=open_journal
+                    )
+                except SystemExit as exc:
+                    # argparse errors/--help
+                    code = exc.code if isinstance(exc.code, int) else 2
+        finally:
+            if color is None:
+                os.environ.pop("CORE4_COLOR", None)
+            else:
+                os.environ["CORE4_COLOR"] = color
+        self.served += 1
+        return {"code": code, "stdout": out.getvalue(), "stderr": err.getvalue(), "journal": journal or None}
+
+    def dispatch(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        op = req.get("op")
+        if op == "habit":
+            return self.handle_habit(req)
+        if op == "status":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started),
+                "served": self.served,
+                "indexed_days": len(self.ops.index._days),
+            }
+        if op == "stop":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        return {"fallback": True, "reason": f"unknown op: {op}"}
+
+
+class Handler(socketserver.StreamRequestHandler):
+    server: Core4Daemon
+
+    def handle(self) -> None:
+        try:
+            req = recv_line(self.connection)
+        except ValueError:
+            return
+        try:
+            resp = self.server.dispatch(req)
+        except Exception as exc:
+            resp = {"code": 1, "stderr": f"core4 daemon: {exc}\n"}
+        with contextlib.suppress(OSError):
+            send_line(self.connection, resp)
+
+
+def serve(path: Optional[Path] = None) -> int:
+    path = path or socket_path()
+    if request({"op": "status"}, timeout=2.0):
+        print(f"core4 daemon: already running on {path}", file=sys.stderr)
+        return 1
+    server = Core4Daemon(path)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    print(f"core4 daemon: listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def daemon_command(argv: list[str]) -> int:
+    cmd = argv[0] if argv else "serve"
+    if cmd in ("serve", "start", "run"):
+        return serve()
+    if cmd in ("status", "stop"):
+        try:
+            resp = request({"op": cmd}, timeout=5.0)
+        except (OSError, ValueError) as exc:
+            resp = None
+            print(f"core4 daemon: {exc}", file=sys.stderr)
+        if not resp:
+            print(f"core4 daemon: not running ({socket_path()})")
+            return 1
+        print(json.dumps(resp, ensure_ascii=False))
+        return 0
+    print("usage: core4 daemon [serve|status|stop]", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(daemon_command(sys.argv[1:]))
@@ -1,6 +1,6 @@
 """
 core4_export.py — CSV export, finalize, prune, seed_week.
-Depends on: core4_types, core4_paths, core4_ledger, core4_tw
+Depends on: core4_types, core4_paths, core4_analytics, core4_ledger, core4_segments, core4_tw
 """
 
 from __future__ import annotations
@@ -9,11 +9,11 @@ import csv
 import json
 import re
 from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
 from typing import Any, Dict
 
 from core4_types import HABIT_ORDER, HABIT_TO_DOMAIN, Target, week_key
 from core4_paths import (
-    core4_daily_csv_path,
     core4_event_dir,
     core4_monthly_csv_path,
     core4_scores_csv_path,
@@ -21,14 +21,9 @@ from core4_paths import (
     core4_sealed_months_dir,
     primary_core4_dir,
 )
-from core4_ledger import build_day, build_week
-
-
-def _safe_float(value: Any, default: float = 0.0) -> float:
-    try:
-        return float(value)
-    except Exception:
-        return default
+from core4_analytics import LedgerFrame, export_all
+from core4_ledger import _core4_compute_totals, _merge_by_key
+from core4_segments import read_segment, write_segment
 
 
 def _parse_month(value: str) -> tuple[int, int]:
@@ -57,51 +52,19 @@ def _month_days(year: int, month: int) -> list[date]:
     return days
 
 
-def _day_row(day_data: Dict[str, Any], day: date) -> Dict[str, Any]:
-    totals = day_data.get("totals") if isinstance(day_data.get("totals"), dict) else {}
-    by_domain = totals.get("by_domain") if isinstance(totals.get("by_domain"), dict) else {}
-    total = _safe_float((totals.get("by_day") or {}).get(day.isoformat()), 0.0) if isinstance(totals.get("by_day"), dict) else 0.0
-    return {
-        "date": day.isoformat(),
-        "week": week_key(day),
-        "day_total": total,
-        "body": _safe_float(by_domain.get("body"), 0.0),
-        "being": _safe_float(by_domain.get("being"), 0.0),
-        "balance": _safe_float(by_domain.get("balance"), 0.0),
-        "business": _safe_float(by_domain.get("business"), 0.0),
-        "entry_count": int(len(day_data.get("entries") or [])),
-        "updated_at": str(day_data.get("updated_at") or ""),
-    }
-
-
 def export_daily_csv(*, days: int = 56) -> "Path":
-    """Regenerate `core4_daily.csv` for the last N days (default: 8 weeks)."""
-    from pathlib import Path
-    days = max(7, min(int(days), 365))
-    end = date.today()
-    start = end - timedelta(days=days - 1)
+    """Regenerate `core4_daily.csv` for the last N days (default: 8 weeks).
 
-    rows: list[Dict[str, Any]] = []
-    d = start
-    while d <= end:
-        day_data = build_day(d, write=True)
-        rows.append(_day_row(day_data, d))
-        d += timedelta(days=1)
-
-    path = core4_daily_csv_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=list(rows[0].keys()) if rows else [])
-        if rows:
-            writer.writeheader()
-            writer.writerows(rows)
-    return path
+    The weekly/monthly/habit rollups are written in the same ledger pass.
+    """
+    days = max(7, min(int(days), 365))
+    return export_all(days=days)["daily"]
 
 
 def finalize_month(month: str, *, force: bool = False) -> Dict[str, Any]:
     """
     Month close:
-    - rebuild day rows from event ledger
+    - compute day rows from the event ledger (one pass, no derived rewrites)
     - write `core4_YYYY-MM.csv` (one row per day)
     - mark sealed to avoid accidental duplicates
     """
@@ -112,10 +75,8 @@ def finalize_month(month: str, *, force: bool = False) -> Dict[str, Any]:
     if marker.exists() and not force:
         return {"ok": True, "sealed": True, "skipped": True, "month": month}
 
-    rows: list[Dict[str, Any]] = []
-    for d in _month_days(year, mon):
-        day_data = build_day(d, write=True)
-        rows.append(_day_row(day_data, d))
+    days = _month_days(year, mon)
+    rows = LedgerFrame.load(since=days[0]).daily_rows(days[0], days[-1])
 
     csv_path = core4_monthly_csv_path(month)
     csv_path.parent.mkdir(parents=True, exist_ok=True)
@@ -143,8 +104,6 @@ def _parse_week(value: str) -> date:
 
 def finalize_week(week: str, *, force: bool = False) -> Dict[str, Any]:
     start = _parse_week(week)
-    data = build_week(start, write=True)
-    totals = data.get("totals") if isinstance(data.get("totals"), dict) else {}
 
     sealed_dir = core4_sealed_dir()
     sealed_dir.mkdir(parents=True, exist_ok=True)
@@ -152,15 +111,16 @@ def finalize_week(week: str, *, force: bool = False) -> Dict[str, Any]:
     if marker.exists() and not force:
         return {"ok": True, "sealed": True, "skipped": True, "week": week}
 
+    days = LedgerFrame.load(since=start).daily_rows(start, start + timedelta(days=6))
     row = {
         "week": week,
-        "updated_at": str(data.get("updated_at") or ""),
-        "week_total": _safe_float(totals.get("week_total"), 0.0),
-        "body": _safe_float((totals.get("by_domain") or {}).get("body"), 0.0),
-        "being": _safe_float((totals.get("by_domain") or {}).get("being"), 0.0),
-        "balance": _safe_float((totals.get("by_domain") or {}).get("balance"), 0.0),
-        "business": _safe_float((totals.get("by_domain") or {}).get("business"), 0.0),
-        "entry_count": int(len(data.get("entries") or [])),
+        "updated_at": days[0]["updated_at"],
+        "week_total": sum(d["day_total"] for d in days),
+        "body": sum(d["body"] for d in days),
+        "being": sum(d["being"] for d in days),
+        "balance": sum(d["balance"] for d in days),
+        "business": sum(d["business"] for d in days),
+        "entry_count": sum(d["entry_count"] for d in days),
     }
 
     csv_path = core4_scores_csv_path()
@@ -178,43 +138,77 @@ def finalize_week(week: str, *, force: bool = False) -> Dict[str, Any]:
 
 def prune_events(*, keep_weeks: int = 8) -> Dict[str, Any]:
     """
-    Remove local event files older than `keep_weeks` to limit growth.
-    Only touches the *local* ledger under `~/.core4/events`.
+    Compact local event files older than `keep_weeks` into sealed weekly
+    segments (core4_segments), then remove the files. Only whole ISO weeks
+    that end before the cutoff are sealed; an existing segment for the same
+    week is merged, so re-running is safe. Only touches the *local* ledger
+    under `~/.core4/events`.
     """
     keep_weeks = max(1, min(int(keep_weeks), 52))
     cutoff = date.today() - timedelta(days=keep_weeks * 7)
     base = primary_core4_dir()
     ev_root = core4_event_dir(base)
-    deleted = 0
-    kept = 0
+    result: Dict[str, Any] = {
+        "ok": True,
+        "sealed_weeks": [],
+        "compacted": 0,
+        "deleted": 0,
+        "kept_days": 0,
+        "cutoff": cutoff.isoformat(),
+    }
     if not ev_root.exists():
-        return {"ok": True, "deleted": 0, "kept": 0, "cutoff": cutoff.isoformat()}
+        return result
 
+    weeks: Dict[str, list[Path]] = {}
     for day_dir in sorted(p for p in ev_root.glob("*") if p.is_dir()):
-        day_key = day_dir.name
         try:
-            d = datetime.strptime(day_key, "%Y-%m-%d").date()
+            d = datetime.strptime(day_dir.name, "%Y-%m-%d").date()
         except Exception:
             continue
-        if d >= cutoff:
-            kept += 1
+        # Sunday of the ISO week must be before the cutoff.
+        if d + timedelta(days=7 - d.isoweekday()) >= cutoff:
+            result["kept_days"] += 1
             continue
-        try:
-            for f in day_dir.glob("*.json"):
+        weeks.setdefault(week_key(d), []).append(day_dir)
+
+    for week, day_dirs in sorted(weeks.items()):
+        files: list[Path] = []
+        events: list[Dict[str, Any]] = list(read_segment(week)[1])
+        for day_dir in day_dirs:
+            for f in sorted(day_dir.glob("*.json")):
                 try:
-                    f.unlink(missing_ok=True)
-                    deleted += 1
+                    ev = json.loads(f.read_text(encoding="utf-8"))
                 except Exception:
                     continue
+                files.append(f)
+                if isinstance(ev, dict) and str(ev.get("date") or "").strip() == day_dir.name:
+                    events.append(ev)
+        if not files:
+            continue
+        totals = _core4_compute_totals(list(_merge_by_key(events).values()))
+        try:
+            write_segment(week, events, totals)
+        except OSError:
+            # Keep the hot files when the segment could not be written.
+            continue
+        result["sealed_weeks"].append(week)
+        result["compacted"] += len(files)
+        for f in files:
+            try:
+                f.unlink(missing_ok=True)
+                result["deleted"] += 1
+            except Exception:
+                continue
+        for day_dir in day_dirs:
             # remove empty dir
             try:
                 next(day_dir.iterdir())
             except StopIteration:
                 day_dir.rmdir()
-        except Exception:
-            continue
+            except OSError:
+                continue
 
-    return {"ok": True, "deleted": deleted, "kept_days": kept, "cutoff": cutoff.isoformat()}
+    return result
 
 
 def seed_week(day: date, *, dry_run: bool = False, force: bool = False) -> Dict[str, Any]:
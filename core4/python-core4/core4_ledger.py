@@ -1,11 +1,13 @@
 """
 core4_ledger.py — Event ledger read/write, build_day/week, bridge logging.
-Depends on: core4_types, core4_paths, core4_ui
+Depends on: core4_types, core4_paths, core4_scan, core4_segments
 """
 
 from __future__ import annotations
 
 import json
+import os
+import re
 import uuid
 from datetime import date, datetime, time, timedelta, timezone
 from pathlib import Path
@@ -23,10 +25,13 @@ from core4_paths import (
     core4_dirs,
     core4_day_path,
     core4_event_dir,
+    core4_migration_manifest_path,
     core4_week_path,
     primary_core4_dir,
     _safe_filename,
 )
+from core4_scan import any_events, scan_days
+from core4_segments import sealed_weeks
 
 
 def _safe_float(value: Any, default: float = 0.0) -> float:
@@ -98,19 +103,6 @@ def _event_key_from_entry(entry: Dict[str, Any]) -> str:
     return ""
 
 
-def _read_event_file(path: Path) -> Optional[Dict[str, Any]]:
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return None
-    if not isinstance(data, dict):
-        return None
-    key = _event_key_from_entry(data)
-    if key:
-        data["key"] = key
-    return data
-
-
 def _week_fallback(day: date) -> Dict[str, Any]:
     return {"week": week_key(day), "updated_at": "", "entries": [], "totals": {}}
 
@@ -125,24 +117,18 @@ def _legacy_week_paths(day: date) -> list[Path]:
 
 
 def _any_events_for_week(day: date) -> bool:
+    # A sealed week has no hot event files left but is still ledger-owned.
+    if week_key(day) in sealed_weeks():
+        return True
     start = day - timedelta(days=day.isoweekday() - 1)
-    for base in core4_dirs():
-        ev_dir = core4_event_dir(base)
-        for i in range(7):
-            d = start + timedelta(days=i)
-            if (ev_dir / d.isoformat()).exists():
-                try:
-                    if any((ev_dir / d.isoformat()).glob("*.json")):
-                        return True
-                except Exception:
-                    continue
-    return False
+    return any_events((start + timedelta(days=i)).isoformat() for i in range(7))
 
 
 def migrate_week_from_legacy(day: date) -> int:
     """
-    One-time migration: if we have legacy weekly JSON but no event ledger yet,
+    Migrate one week: if we have legacy weekly JSON but no event ledger yet,
     convert entries into append-only event files in the *primary* Core4 folder.
+    Driven by `migrate_legacy` (manifest); not called on the read path.
     """
     if _any_events_for_week(day):
         return 0
@@ -209,27 +195,103 @@ def migrate_week_from_legacy(day: date) -> int:
     return written
 
 
-def list_events_for_day(day: date) -> list[Dict[str, Any]]:
-    migrate_week_from_legacy(day)
-    date_key = day.isoformat()
-    events: list[Dict[str, Any]] = []
+_LEGACY_WEEK_RE = re.compile(r"^core4_week_(\d{4})-W(\d{2})\.json$")
+_migration_checked = False
+
+
+def _load_migration_manifest() -> Optional[Dict[str, Any]]:
+    path = core4_migration_manifest_path()
+    if not path.exists():
+        return None
+    data = _load_json_file(path, {})
+    if not isinstance(data.get("weeks"), dict):
+        data["weeks"] = {}
+    return data
+
+
+def _save_migration_manifest(data: Dict[str, Any]) -> None:
+    path = core4_migration_manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _legacy_week_files() -> Dict[str, date]:
+    """
+    Week key -> Monday for every `core4_week_*.json` in any Core4 root that is
+    still legacy-only. `build_week` writes the same name as a derived snapshot,
+    so weeks with ledger events or a sealed segment are skipped.
+    """
+    weeks: Dict[str, date] = {}
     for base in core4_dirs():
-        day_dir = core4_event_dir(base) / date_key
-        if not day_dir.exists():
-            continue
         try:
-            paths = sorted(p for p in day_dir.glob("*.json") if p.is_file())
-        except Exception:
+            with os.scandir(base) as it:
+                names = [e.name for e in it]
+        except OSError:
             continue
-        for path in paths:
-            ev = _read_event_file(path)
-            if not ev:
+        for name in names:
+            m = _LEGACY_WEEK_RE.match(name)
+            if not m:
                 continue
-            if str(ev.get("date") or "").strip() != date_key:
-                # tolerate mismatches but ignore for the day view
+            try:
+                weeks[f"{m.group(1)}-W{m.group(2)}"] = date.fromisocalendar(int(m.group(1)), int(m.group(2)), 1)
+            except ValueError:
                 continue
-            events.append(ev)
-    return events
+    return {wk: monday for wk, monday in weeks.items() if not _any_events_for_week(monday)}
+
+
+def migrate_legacy(*, force: bool = False) -> Dict[str, Any]:
+    """
+    Explicit legacy -> ledger migration over all legacy week files.
+    Each handled week is recorded in the manifest and never probed again
+    (unless `force`).
+    """
+    manifest = _load_migration_manifest() or {"version": 1, "weeks": {}}
+    done = manifest["weeks"]
+    migrated = 0
+    written = 0
+    for wk, monday in sorted(_legacy_week_files().items()):
+        if wk in done and not force:
+            continue
+        n = migrate_week_from_legacy(monday)
+        done[wk] = {"written": n, "migrated_at": datetime.now(timezone.utc).isoformat()}
+        migrated += 1
+        written += n
+    manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+    _save_migration_manifest(manifest)
+    return {"ok": True, "weeks": migrated, "written": written, "manifest": str(core4_migration_manifest_path())}
+
+
+def _ensure_legacy_migrated() -> None:
+    # First run without a manifest (upgrade): migrate once, then the read
+    # path only ever trusts the manifest. Later legacy imports: `core4 migrate-legacy`.
+    global _migration_checked
+    if _migration_checked:
+        return
+    _migration_checked = True
+    if core4_migration_manifest_path().exists():
+        return
+    try:
+        migrate_legacy()
+    except OSError:
+        _migration_checked = False
+
+
+def list_events_for_days(days: list[date]) -> Dict[str, list[Dict[str, Any]]]:
+    """Events per date key for `days`; all (root, day) dirs are scanned in parallel."""
+    _ensure_legacy_migrated()
+    scanned = scan_days(d.isoformat() for d in days)
+    for events in scanned.values():
+        for ev in events:
+            key = _event_key_from_entry(ev)
+            if key:
+                ev["key"] = key
+    return scanned
+
+
+def list_events_for_day(day: date) -> list[Dict[str, Any]]:
+    return list_events_for_days([day])[day.isoformat()]
 
 
 def _core4_compute_totals(entries: list[Dict[str, Any]]) -> Dict[str, Any]:
@@ -254,8 +316,7 @@ def _core4_compute_totals(entries: list[Dict[str, Any]]) -> Dict[str, Any]:
     return totals
 
 
-def build_day(day: date, *, write: bool) -> Dict[str, Any]:
-    events = list_events_for_day(day)
+def _merge_by_key(events) -> Dict[str, Dict[str, Any]]:
     by_key: Dict[str, Dict[str, Any]] = {}
     for ev in events:
         key = _event_key_from_entry(ev)
@@ -265,8 +326,27 @@ def build_day(day: date, *, write: bool) -> Dict[str, Any]:
             by_key[key] = _merge_entry(by_key[key], ev)
         else:
             by_key[key] = dict(ev)
+    return by_key
+
+
+def _week_days(day: date) -> list[date]:
+    start = day - timedelta(days=day.isoweekday() - 1)
+    return [start + timedelta(days=i) for i in range(7)]
+
+
+def _week_view(day: date, events) -> Dict[str, Any]:
+    data = _week_fallback(day)
+    data["week"] = week_key(day)
+    data["entries"] = list(_merge_by_key(events).values())
+    data["updated_at"] = datetime.now(timezone.utc).isoformat()
+    data["totals"] = _core4_compute_totals(data["entries"])
+    return data
+
+
+def build_day(day: date, *, write: bool) -> Dict[str, Any]:
+    events = list_events_for_day(day)
     data = _day_fallback(day)
-    data["entries"] = list(by_key.values())
+    data["entries"] = list(_merge_by_key(events).values())
     data["updated_at"] = datetime.now(timezone.utc).isoformat()
     data["totals"] = _core4_compute_totals(data["entries"])
     if write:
@@ -276,30 +356,51 @@ def build_day(day: date, *, write: bool) -> Dict[str, Any]:
 
 
 def build_week(day: date, *, write: bool) -> Dict[str, Any]:
-    wk = week_key(day)
-    start = day - timedelta(days=day.isoweekday() - 1)
-    by_key: Dict[str, Dict[str, Any]] = {}
-    for i in range(7):
-        d = start + timedelta(days=i)
-        for ev in list_events_for_day(d):
-            key = _event_key_from_entry(ev)
-            if not key:
-                continue
-            if key in by_key:
-                by_key[key] = _merge_entry(by_key[key], ev)
-            else:
-                by_key[key] = dict(ev)
-    data = _week_fallback(day)
-    data["week"] = wk
-    data["entries"] = list(by_key.values())
-    data["updated_at"] = datetime.now(timezone.utc).isoformat()
-    data["totals"] = _core4_compute_totals(data["entries"])
+    events: list[Dict[str, Any]] = []
+    for day_events in list_events_for_days(_week_days(day)).values():
+        events.extend(day_events)
+    data = _week_view(day, events)
     if write:
         path = core4_week_path(day)
         path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
     return data
 
 
+class WeekModel:
+    """
+    In-memory week view for interactive loops (the fzf menu).
+
+    Day event lists are cached and re-read only when one of that day's event
+    dirs (across all `core4_dirs()`) changes mtime, so a pick only re-reads the
+    day it logged to.
+    """
+
+    def __init__(self, day: date):
+        self.days = _week_days(day)
+        self.week = week_key(day)
+        self._events: Dict[str, tuple[tuple, list[Dict[str, Any]]]] = {}
+
+    def _signature(self, date_key: str) -> tuple:
+        sig = []
+        for base in core4_dirs():
+            try:
+                sig.append((core4_event_dir(base) / date_key).stat().st_mtime_ns)
+            except OSError:
+                sig.append(-1)
+        return tuple(sig)
+
+    def view(self) -> Dict[str, Any]:
+        sigs = {d: self._signature(d.isoformat()) for d in self.days}
+        stale = [d for d in self.days if self._events.get(d.isoformat(), (None,))[0] != sigs[d]]
+        if stale:
+            for date_key, day_events in list_events_for_days(stale).items():
+                self._events[date_key] = (sigs[date.fromisoformat(date_key)], day_events)
+        events: list[Dict[str, Any]] = []
+        for d in self.days:
+            events.extend(self._events[d.isoformat()][1])
+        return _week_view(self.days[0], events)
+
+
 def load_week(day: date) -> Dict[str, Any]:
     """Return a computed week view from the event ledger (read-only)."""
     return build_week(day, write=False)
@@ -322,11 +423,22 @@ def is_already_logged(target: Target) -> bool:
     return False
 
 
-def local_core4_log(target: Target, *, ts: str, source: str) -> None:
-    key = target.entry_key
-    event = {
+def logged_keys(days) -> set[str]:
+    """Done entry keys for `days`, from one scan of the ledger."""
+    keys: set[str] = set()
+    for events in list_events_for_days(days).values():
+        for ev in events:
+            if bool(ev.get("done", True)) and _safe_float(ev.get("points"), 0.0) >= 0.5:
+                key = _event_key_from_entry(ev)
+                if key:
+                    keys.add(key)
+    return keys
+
+
+def core4_event(target: Target, *, ts: str, source: str) -> Dict[str, Any]:
+    return {
         "id": str(uuid.uuid4()),
-        "key": key,
+        "key": target.entry_key,
         "ts": ts,
         "last_ts": ts,
         "date": target.date_key,
@@ -340,25 +452,35 @@ def local_core4_log(target: Target, *, ts: str, source: str) -> None:
         "user": {},
     }
 
-    base = primary_core4_dir()
-    day_dir = core4_event_dir(base) / target.date_key
+
+def _write_local_event(event: Dict[str, Any]) -> None:
+    date_key = str(event["date"])
+    day_dir = core4_event_dir(primary_core4_dir()) / date_key
     day_dir.mkdir(parents=True, exist_ok=True)
 
-    ts_safe = _safe_filename(ts.replace(":", "").replace("-", ""))
-    src_safe = _safe_filename(source)
-    habit_safe = _safe_filename(target.habit)
-    domain_safe = _safe_filename(target.domain)
-    name = f"{target.date_key}__{domain_safe}__{habit_safe}__{ts_safe}__{src_safe}.json"
+    ts_safe = _safe_filename(str(event["ts"]).replace(":", "").replace("-", ""))
+    src_safe = _safe_filename(str(event["source"]))
+    habit_safe = _safe_filename(str(event["task"]))
+    domain_safe = _safe_filename(str(event["domain"]))
+    name = f"{date_key}__{domain_safe}__{habit_safe}__{ts_safe}__{src_safe}.json"
     (day_dir / name).write_text(json.dumps(event, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
+
+def local_core4_log(target: Target, *, ts: str, source: str) -> None:
+    _write_local_event(core4_event(target, ts=ts, source=source))
+
     # Rebuild derived artifacts locally so rclone push can sync them.
     build_day(target.day, write=True)
     build_week(target.day, write=True)
 
 
-def bridge_core4_log(target: Target, *, source: str = "tracker") -> None:
+def _midday_ts(day: date) -> str:
     # Midday UTC avoids timezone edge cases; week/day derived from date.
-    ts = datetime.combine(target.day, time(12, 0, 0), tzinfo=TZ).astimezone(timezone.utc).isoformat()
+    return datetime.combine(day, time(12, 0, 0), tzinfo=TZ).astimezone(timezone.utc).isoformat()
+
+
+def bridge_core4_log(target: Target, *, source: str = "tracker") -> None:
+    ts = _midday_ts(target.day)
 
     # 1) Try Bridge API (if running)
     url = f"{BRIDGE_URL}/bridge/core4/log"
@@ -372,3 +494,31 @@ def bridge_core4_log(target: Target, *, source: str = "tracker") -> None:
     except (URLError, HTTPError):
         # 2) Fallback: write directly to the local event ledger + rebuild aggregates
         local_core4_log(target, ts=ts, source=source)
+
+
+def bridge_core4_log_batch(targets: list[Target], *, source: str = "tracker") -> int:
+    """Log many targets with one Bridge call (or one local pass); returns the count sent."""
+    if not targets:
+        return 0
+    events = [core4_event(t, ts=_midday_ts(t.day), source=source) for t in targets]
+
+    # 1) Try the Bridge bulk endpoint (if running)
+    url = f"{BRIDGE_URL}/bridge/core4/log/batch"
+    data = json.dumps({"events": events}, ensure_ascii=False).encode("utf-8")
+    req = request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with request.urlopen(req, timeout=10) as resp:
+            resp.read()
+        return len(events)
+    except (URLError, HTTPError):
+        pass
+
+    # 2) Fallback: append all events locally, rebuild each touched day/week once
+    for event in events:
+        _write_local_event(event)
+    days = sorted({t.day for t in targets})
+    for day in days:
+        build_day(day, write=True)
+    for day in {d - timedelta(days=d.isoweekday() - 1): d for d in days}.values():
+        build_week(day, write=True)
+    return len(events)
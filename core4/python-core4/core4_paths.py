@@ -85,6 +85,11 @@ def core4_day_path(day: date) -> Path:
     return primary_core4_dir() / f"core4_day_{day.isoformat()}.json"
 
 
+def core4_migration_manifest_path() -> Path:
+    # Local state: which legacy weeks were already converted into ledger events.
+    return primary_core4_dir() / "core4_legacy_migration.json"
+
+
 def _core4_store_dir(base_dir: Path, leaf: str) -> Path:
     """
     Resolve Core4 data folders with flat-first semantics and legacy fallback.
@@ -121,6 +126,18 @@ def core4_daily_csv_path() -> Path:
     return primary_core4_dir() / "core4_daily.csv"
 
 
+def core4_weekly_csv_path() -> Path:
+    return primary_core4_dir() / "core4_weekly.csv"
+
+
+def core4_monthly_rollup_csv_path() -> Path:
+    return primary_core4_dir() / "core4_monthly.csv"
+
+
+def core4_habits_csv_path() -> Path:
+    return primary_core4_dir() / "core4_habits.csv"
+
+
 def core4_monthly_csv_path(month: str) -> Path:
     # e.g. core4_2026-01.csv (daily rows for the month)
     return primary_core4_dir() / f"core4_{month}.csv"
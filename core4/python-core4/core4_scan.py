@@ -0,0 +1,113 @@
+"""
+core4_scan.py — Parallel event-ledger scanner across all Core4 roots.
+Depends on: core4_paths, core4_segments
+
+Every (root, day) directory is read on a shared thread pool with os.scandir,
+so a week view costs roughly the latency of the slowest root instead of the
+sum of 7 x N sequential directory scans. Per-root timings are kept for
+`core4 sources`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from core4_paths import core4_dirs, core4_event_dir
+from core4_segments import segment_events_for_days
+
+SCAN_WORKERS = int(os.environ.get("AOS_CORE4_SCAN_WORKERS", "8"))
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_stats_lock = threading.Lock()
+ROOT_STATS: Dict[str, Dict[str, float]] = {}
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=max(1, SCAN_WORKERS), thread_name_prefix="core4-scan")
+        return _pool
+
+
+def _record(root: Path, started: float, files: int) -> None:
+    ms = (time.perf_counter() - started) * 1000
+    with _stats_lock:
+        s = ROOT_STATS.setdefault(str(root), {"scans": 0, "files": 0, "total_ms": 0.0, "max_ms": 0.0})
+        s["scans"] += 1
+        s["files"] += files
+        s["total_ms"] += ms
+        s["max_ms"] = max(s["max_ms"], ms)
+
+
+def _read_day_dir(root: Path, day_dir: Path, date_key: str) -> list[Dict[str, Any]]:
+    started = time.perf_counter()
+    events: list[Dict[str, Any]] = []
+    try:
+        with os.scandir(day_dir) as it:
+            names = sorted(e.name for e in it if e.name.endswith(".json") and e.is_file())
+    except OSError:
+        names = []
+    for name in names:
+        try:
+            with open(os.path.join(day_dir, name), "r", encoding="utf-8") as handle:
+                ev = json.load(handle)
+        except (OSError, ValueError):
+            continue
+        if isinstance(ev, dict) and str(ev.get("date") or "").strip() == date_key:
+            events.append(ev)
+    _record(root, started, len(names))
+    return events
+
+
+def scan_days(date_keys: Iterable[str], roots: Optional[list[Path]] = None) -> Dict[str, list[Dict[str, Any]]]:
+    """Raw events per date key: sealed segments, then roots in priority order with files sorted by name."""
+    keys = list(dict.fromkeys(date_keys))
+    roots = roots if roots is not None else core4_dirs()
+    ev_roots = [(root, core4_event_dir(root)) for root in roots]
+    jobs = [(date_key, root, ev_root / date_key) for date_key in keys for root, ev_root in ev_roots]
+    if len(jobs) <= 1:
+        results = [_read_day_dir(root, path, date_key) for date_key, root, path in jobs]
+    else:
+        pool = _get_pool()
+        futures = [pool.submit(_read_day_dir, root, path, date_key) for date_key, root, path in jobs]
+        results = [f.result() for f in futures]
+    out: Dict[str, list[Dict[str, Any]]] = {k: [] for k in keys}
+    # Cold tier first: sealed weekly segments of the primary root.
+    for date_key, events in segment_events_for_days(keys).items():
+        out[date_key].extend(events)
+    for (date_key, _root, _path), events in zip(jobs, results):
+        out[date_key].extend(events)
+    return out
+
+
+def _has_json(day_dir: Path) -> bool:
+    try:
+        with os.scandir(day_dir) as it:
+            return any(e.name.endswith(".json") for e in it)
+    except OSError:
+        return False
+
+
+def any_events(date_keys: Iterable[str], roots: Optional[list[Path]] = None) -> bool:
+    keys = list(date_keys)
+    roots = roots if roots is not None else core4_dirs()
+    paths = [core4_event_dir(root) / k for root in roots for k in keys]
+    return any(_get_pool().map(_has_json, paths))
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        ROOT_STATS.clear()
+
+
+def root_stats() -> Dict[str, Dict[str, float]]:
+    with _stats_lock:
+        return {root: dict(s) for root, s in ROOT_STATS.items()}
@@ -7,8 +7,8 @@ from __future__ import annotations
 
 import re
 import sys
-from datetime import date
-from typing import Any, Dict
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
 
 from core4_types import (
     DISPLAY_HABIT,
@@ -22,10 +22,10 @@ from core4_types import (
 )
 from core4_ui import _cyan, _green, _yellow
 from core4_ledger import (
-    bridge_core4_log,
-    is_already_logged,
+    bridge_core4_log_batch,
     list_events_for_day,
     load_week,
+    logged_keys,
 )
 from core4_tw import (
     _parse_due_to_date,
@@ -142,79 +142,51 @@ def _week_done_by_day(data: Dict[str, Any], week: str) -> Dict[str, list[str]]:
     return {day: sorted(list(hs), key=lambda h: hab_idx.get(h, 999)) for day, hs in by_day.items()}
 
 
-def replay_from_taskwarrior(day: date, *, scope: str) -> int:
-    """Replay completed Core4 tasks into Bridge weekly JSON for a day or week."""
-    from datetime import timedelta
-    tasks = _tw_export_core4_completed()
-    if not tasks:
-        return 0
-    wk = week_key(day)
+def _tw_window(day: date, scope: str) -> list[date]:
+    if scope == "day":
+        return [day]
     start = day - timedelta(days=day.isoweekday() - 1)
-    end = start + timedelta(days=6)
+    return [start + timedelta(days=i) for i in range(7)]
 
-    replayed = 0
-    for task in tasks:
+
+def _tw_completed_targets(day: date, *, scope: str) -> Dict[str, Target]:
+    """Completed Core4 tasks due in the day/week window, by entry key (one windowed export)."""
+    days = _tw_window(day, scope)
+    window = set(days)
+    targets: Dict[str, Target] = {}
+    for task in _tw_export_core4_completed(days[0], days[-1]):
         if not isinstance(task, dict):
             continue
         due_day = _parse_due_to_date(task.get("due"))
-        if not due_day:
-            continue
-        if week_key(due_day) != wk:
+        if due_day not in window:
             continue
-        if scope == "day" and due_day != day:
-            continue
-        if scope == "week" and not (start <= due_day <= end):
-            continue
-
         habit = _tw_task_habit(task)
         if not habit:
             continue
         domain = str(task.get("domain") or "").strip().lower() or HABIT_TO_DOMAIN.get(habit, "")
         if not domain:
             continue
-
         target = Target(habit=habit, domain=domain, day=due_day)
-        try:
-            if is_already_logged(target):
-                continue
-            bridge_core4_log(target, source="tracker_replay_tw")
-            replayed += 1
-        except Exception:
-            continue
+        targets.setdefault(target.entry_key, target)
+    return targets
 
-    return replayed
 
+def replay_from_taskwarrior(day: date, *, scope: str, targets: Optional[Dict[str, Target]] = None) -> int:
+    """Replay completed Core4 tasks missing from the ledger for a day or week (one batch)."""
+    if targets is None:
+        targets = _tw_completed_targets(day, scope=scope)
+    if not targets:
+        return 0
+    logged = logged_keys(_tw_window(day, scope))
+    missing = [t for key, t in sorted(targets.items()) if key not in logged]
+    try:
+        return bridge_core4_log_batch(missing, source="tracker_replay_tw")
+    except Exception:
+        return 0
 
-def _expected_points_from_tw(day: date, *, scope: str) -> float:
-    from datetime import timedelta
-    tasks = _tw_export_core4_completed()
-    if not tasks:
-        return 0.0
-    wk = week_key(day)
-    start = day - timedelta(days=day.isoweekday() - 1)
-    end = start + timedelta(days=6)
 
-    seen: set[str] = set()
-    for task in tasks:
-        if not isinstance(task, dict):
-            continue
-        due_day = _parse_due_to_date(task.get("due"))
-        if not due_day:
-            continue
-        if week_key(due_day) != wk:
-            continue
-        if scope == "day" and due_day != day:
-            continue
-        if scope == "week" and not (start <= due_day <= end):
-            continue
-        habit = _tw_task_habit(task)
-        if not habit:
-            continue
-        domain = str(task.get("domain") or "").strip().lower() or HABIT_TO_DOMAIN.get(habit, "")
-        if not domain:
-            continue
-        seen.add(f"{due_day.isoformat()}:{domain}:{habit}")
-    return 0.5 * float(len(seen))
+def _expected_points_from_tw(day: date, *, scope: str) -> float:
+    return 0.5 * float(len(_tw_completed_targets(day, scope=scope)))
 
 
 def score_mode(argv: list[str]) -> int:
@@ -270,10 +242,11 @@ def score_mode(argv: list[str]) -> int:
 
     if mode == "week":
         current = week_total_from_week(data)
-        expected = _expected_points_from_tw(day, scope="week")
+        tw_targets = _tw_completed_targets(day, scope="week")
+        expected = 0.5 * len(tw_targets)
         has_any = bool(data.get("entries") or []) or expected > 0.0
         if expected > current + 1e-9:
-            replay_from_taskwarrior(day, scope="week")
+            replay_from_taskwarrior(day, scope="week", targets=tw_targets)
             data = load_week(day)
             current = week_total_from_week(data)
             has_any = bool(data.get("entries") or []) or expected > 0.0
@@ -291,10 +264,11 @@ def score_mode(argv: list[str]) -> int:
         return 0
 
     current = day_total_from_week(data, day)
-    expected = _expected_points_from_tw(day, scope="day")
+    tw_targets = _tw_completed_targets(day, scope="day")
+    expected = 0.5 * len(tw_targets)
     has_any = bool(list_events_for_day(day)) or expected > 0.0
     if expected > current + 1e-9:
-        replay_from_taskwarrior(day, scope="day")
+        replay_from_taskwarrior(day, scope="day", targets=tw_targets)
         data = load_week(day)
         current = day_total_from_week(data, day)
     total = current
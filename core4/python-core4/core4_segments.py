@@ -0,0 +1,147 @@
+"""
+core4_segments.py — Sealed weekly event segments (cold tier of the ledger).
+Depends on: core4_paths
+
+`prune_events` compacts local event files older than the retention window
+into one immutable segment per ISO week:
+
+    <sealed>/<YYYY-Www>.events.jsonl.gz
+      line 1: {"type": "header", "week", "sealed_at", "count", "totals"}
+      line 2+: the raw events, unchanged
+
+Readers (core4_scan.scan_days) merge segment events into day results, so
+old weeks stay available for analytics and replays without hot-dir scans.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from core4_paths import core4_sealed_dir
+
+SEGMENT_SUFFIX = ".events.jsonl.gz"
+_SEGMENT_RE = re.compile(r"^(\d{4})-W(\d{2})" + re.escape(SEGMENT_SUFFIX) + "$")
+_CACHE_SIZE = 256
+
+_lock = threading.Lock()
+_segments: "OrderedDict[str, tuple[int, Dict[str, Any], list[Dict[str, Any]]]]" = OrderedDict()
+_listing: Optional[tuple[str, int, Dict[str, date]]] = None
+
+
+def segment_path(week: str) -> Path:
+    return core4_sealed_dir() / f"{week}{SEGMENT_SUFFIX}"
+
+
+def sealed_weeks() -> Dict[str, date]:
+    """Week key -> Monday for every segment; re-listed only when the sealed dir changes."""
+    global _listing
+    sealed = core4_sealed_dir()
+    try:
+        mtime = sealed.stat().st_mtime_ns
+    except OSError:
+        return {}
+    with _lock:
+        if _listing and _listing[0] == str(sealed) and _listing[1] == mtime:
+            return _listing[2]
+    weeks: Dict[str, date] = {}
+    try:
+        with os.scandir(sealed) as it:
+            names = [e.name for e in it]
+    except OSError:
+        names = []
+    for name in names:
+        m = _SEGMENT_RE.match(name)
+        if m:
+            weeks[f"{m.group(1)}-W{m.group(2)}"] = date.fromisocalendar(int(m.group(1)), int(m.group(2)), 1)
+    with _lock:
+        _listing = (str(sealed), mtime, weeks)
+    return weeks
+
+
+def read_segment(week: str) -> tuple[Dict[str, Any], list[Dict[str, Any]]]:
+    """(header, events) for `week`; empty when there is no segment."""
+    path = segment_path(week)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return {}, []
+    key = str(path)
+    with _lock:
+        cached = _segments.get(key)
+        if cached and cached[0] == mtime:
+            _segments.move_to_end(key)
+            return cached[1], cached[2]
+    header: Dict[str, Any] = {}
+    events: list[Dict[str, Any]] = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(item, dict):
+                    continue
+                if item.get("type") == "header" and not header:
+                    header = item
+                else:
+                    events.append(item)
+    except (OSError, EOFError):
+        return {}, []
+    with _lock:
+        _segments[key] = (mtime, header, events)
+        while len(_segments) > _CACHE_SIZE:
+            _segments.popitem(last=False)
+    return header, events
+
+
+def write_segment(week: str, events: list[Dict[str, Any]], totals: Dict[str, Any]) -> Path:
+    """Write the segment for `week` atomically (callers pass the full event set)."""
+    path = segment_path(week)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = {
+        "type": "header",
+        "week": week,
+        "sealed_at": datetime.now(timezone.utc).isoformat(),
+        "count": len(events),
+        "totals": totals,
+    }
+    tmp = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as handle:
+        handle.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for ev in events:
+            handle.write(json.dumps(ev, ensure_ascii=False, separators=(",", ":")) + "\n")
+    os.replace(tmp, path)
+    return path
+
+
+def segment_events_for_days(date_keys: Iterable[str]) -> Dict[str, list[Dict[str, Any]]]:
+    """Segment events per date key (only keys that fall into a sealed week)."""
+    weeks = sealed_weeks()
+    if not weeks:
+        return {}
+    wanted: Dict[str, set[str]] = {}
+    for key in date_keys:
+        try:
+            iso = date.fromisoformat(key).isocalendar()
+        except ValueError:
+            continue
+        week = f"{iso.year}-W{iso.week:02d}"
+        if week in weeks:
+            wanted.setdefault(week, set()).add(key)
+    out: Dict[str, list[Dict[str, Any]]] = {}
+    for week, keys in wanted.items():
+        _header, events = read_segment(week)
+        for ev in events:
+            date_key = str(ev.get("date") or "").strip()
+            if date_key in keys:
+                out.setdefault(date_key, []).append(ev)
+    return out
@@ -74,12 +74,14 @@ def find_completed_uuid(target: Target) -> Optional[str]:
     return None
 
 
-def task_add(target: Target) -> None:
+def task_add(target: Target) -> Optional[str]:
+    """Create the pending Core4 task; returns its uuid when Taskwarrior reports it."""
     from core4_types import DISPLAY_HABIT
     habit_display = DISPLAY_HABIT.get(target.habit, target.habit)
     habit_tag = target.tw_habit_primary_tag
     title = f"Core4 {habit_display} ({target.date_key})"
     args = [
+        "rc.verbose=new-uuid",
         "add",
         title,
         f"project:{habit_tag}",
@@ -91,6 +93,8 @@ def task_add(target: Target) -> None:
     res = run_task(args, capture=True)
     if res.returncode != 0:
         raise RuntimeError(f"task add failed: {res.stderr.strip() or res.stdout.strip()}")
+    m = re.search(r"Created task ([0-9a-f]{8}-[0-9a-f-]{27})", res.stdout or "")
+    return m.group(1) if m else None
 
 
 def task_done(uuid: str) -> None:
@@ -171,12 +175,22 @@ def _parse_due_to_date(value: Any) -> Optional[date]:
     return None
 
 
-def _tw_export_core4_completed() -> list[Dict[str, Any]]:
+def _tw_export_core4_completed(start: Optional[date] = None, end: Optional[date] = None) -> list[Dict[str, Any]]:
+    """Completed +core4 tasks; with `start`/`end` only those due in that window.
+
+    The filter is widened by a day on each side (TW compares in local time,
+    `due` is stored in UTC); callers still check `_parse_due_to_date`.
+    """
     try:
         ensure_taskwarrior()
     except Exception:
         return []
-    res = run_task(["+core4", "status:completed", "export"])
+    query = ["+core4", "status:completed"]
+    if start is not None:
+        query.append(f"due.after:{(start - timedelta(days=1)).isoformat()}")
+    if end is not None:
+        query.append(f"due.before:{(end + timedelta(days=2)).isoformat()}")
+    res = run_task([*query, "export"])
     if res.returncode != 0:
         return []
     raw = (res.stdout or "").strip()
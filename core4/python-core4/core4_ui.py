@@ -1,6 +1,6 @@
 """
 core4_ui.py — Color helpers, fzf/gum menus, show_sources.
-Depends on: core4_types, core4_paths
+Depends on: core4_types, core4_paths, core4_scan
 """
 
 from __future__ import annotations
@@ -9,12 +9,15 @@ import os
 import subprocess
 import sys
 import termios
+import time
 import tty
+from datetime import date, timedelta
 from pathlib import Path
 from typing import Optional
 
 from core4_types import DOMAIN_ORDER, HABIT_ORDER, DISPLAY_HABIT
 from core4_paths import core4_dirs, core4_event_dir
+from core4_scan import reset_stats, root_stats, scan_days
 
 
 def _color(text: str, code: str) -> str:
@@ -124,6 +127,12 @@ def show_sources() -> int:
     if not dirs:
         print("core4 sources: none")
         return 0
+    # Timed probe: the last 7 days across all roots, scanned like a week view.
+    reset_stats()
+    started = time.perf_counter()
+    scan_days([(date.today() - timedelta(days=i)).isoformat() for i in range(7)], dirs)
+    wall_ms = (time.perf_counter() - started) * 1000
+    stats = root_stats()
     print("core4 sources:")
     for base in dirs:
         base = base.expanduser()
@@ -143,6 +152,12 @@ def show_sources() -> int:
             print(f"  latest_event: {_green(event_date)} {_cyan(display_habit)} at {timestamp}")
         else:
             print(f"  latest_event: {_yellow('n/a')}")
+        st = stats.get(str(base))
+        if st and st["scans"]:
+            avg = st["total_ms"] / st["scans"]
+            print(f"  scan_7d: {int(st['files'])} files, avg {avg:.1f}ms/dir, max {st['max_ms']:.1f}ms, sum {st['total_ms']:.1f}ms")
+    serial_ms = sum(st["total_ms"] for st in stats.values())
+    print(f"week scan: {wall_ms:.1f}ms wall (parallel) vs {serial_ms:.1f}ms summed dir scans")
     return 0
 
 
@@ -19,9 +19,9 @@ import os
 import re
 import subprocess
 import sys
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 # Allow module imports from python-core4/ (parent of this file).
 THIS_DIR = Path(__file__).resolve().parent
@@ -56,6 +56,8 @@ from core4_ledger import (
     build_week,
     is_already_logged,
     load_week,
+    migrate_legacy,
+    WeekModel,
 )
 from core4_tw import (
     ensure_taskwarrior,
@@ -90,7 +92,64 @@ def run_core4ctl(*args: str) -> bool:
     return res.returncode == 0
 
 
-def run_habit_flow(argv: list[str], finish, *, skip_journal: bool) -> int:
+class HabitOps:
+    """Ledger + Taskwarrior calls used by `run_habit_flow`.
+
+    The in-process default; `core4_daemon.WarmOps` answers the same calls from
+    its warm ledger index and Taskwarrior view.
+    """
+
+    is_already_logged = staticmethod(is_already_logged)
+    tw_has_completed = staticmethod(tw_has_completed)
+    ensure_taskwarrior = staticmethod(ensure_taskwarrior)
+    find_pending_uuid = staticmethod(find_pending_uuid)
+    find_completed_uuid = staticmethod(find_completed_uuid)
+    task_add = staticmethod(task_add)
+    task_done = staticmethod(task_done)
+    bridge_core4_log = staticmethod(bridge_core4_log)
+
+    def rebuild_derived(self, day: date) -> None:
+        build_week(day, write=True)
+        build_day(day, write=True)
+
+
+class DeferredRebuildOps(HabitOps):
+    """Collects derived rebuilds while the interactive menu runs; `flush()` writes them once."""
+
+    def __init__(self) -> None:
+        self.days: set[date] = set()
+
+    def rebuild_derived(self, day: date) -> None:
+        self.days.add(day)
+
+    def flush(self) -> None:
+        days, self.days = sorted(self.days), set()
+        for week_start in {d - timedelta(days=d.isoweekday() - 1) for d in days}:
+            try:
+                build_week(week_start, write=True)
+            except Exception as exc:
+                print(f"core4: rebuild week {week_start} failed: {exc}", file=sys.__stderr__)
+        for day in days:
+            try:
+                build_day(day, write=True)
+            except Exception as exc:
+                print(f"core4: rebuild {day} failed: {exc}", file=sys.__stderr__)
+
+
+def open_habit_journal(target: Target) -> None:
+    label = DISPLAY_HABIT.get(target.habit, target.habit)
+    open_core4_journal(label, task_label=label, task_uuid=get_task_uuid(target))
+
+
+def run_habit_flow(
+    argv: list[str],
+    finish,
+    *,
+    skip_journal: bool,
+    ops: Optional[HabitOps] = None,
+    open_journal: Callable[[Target], None] = open_habit_journal,
+) -> int:
+    ops = ops or HabitOps()
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "habit",
@@ -100,7 +159,10 @@ def run_habit_flow(argv: list[str], finish, *, skip_journal: bool) -> int:
     parser.add_argument("--date", dest="date", default=None, help="YYYY-MM-DD")
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--no-taskwarrior", action="store_true", help="Only check JSON, do not write")
-    args = parser.parse_args(argv)
+    # `-1d` looks like an option to argparse; pass it positionally.
+    rest_offsets = [tok for tok in argv if re.fullmatch(r"-\d+d", tok)]
+    args = parser.parse_args([tok for tok in argv if tok not in rest_offsets])
+    args.rest.extend(rest_offsets)
     mark_done = "done" in args.rest
     wants_journal = (not mark_done) and (not skip_journal)
 
@@ -120,31 +182,27 @@ def run_habit_flow(argv: list[str], finish, *, skip_journal: bool) -> int:
     def maybe_open_journal() -> None:
         if not wants_journal:
             return
-        subtask = DISPLAY_HABIT.get(target.habit, target.habit)
-        task_label = DISPLAY_HABIT.get(target.habit, target.habit)
-        task_uuid = get_task_uuid(target)
-        open_core4_journal(subtask, task_label=task_label, task_uuid=task_uuid)
+        open_journal(target)
 
     def rebuild_derived_best_effort() -> None:
         # Derived artifacts are rebuildable snapshots (NOT the truth). We keep them up to date on writes
         # so other tools (e.g. index-node scanners) can read a single file, but we avoid writing on reads.
         try:
-            build_week(target.day, write=True)
-            build_day(target.day, write=True)
+            ops.rebuild_derived(target.day)
         except Exception:
             pass
 
     if args.dry_run:
-        already = is_already_logged(target)
+        already = ops.is_already_logged(target)
         label = DISPLAY_HABIT.get(target.habit, target.habit)
         domain = target.domain.upper()
         date_s = target.date_key
 
         # TW status — read-only, no task_add called
         try:
-            ensure_taskwarrior()
-            tw_done_uuid = find_completed_uuid(target)
-            tw_pending_uuid = find_pending_uuid(target)
+            ops.ensure_taskwarrior()
+            tw_done_uuid = ops.find_completed_uuid(target)
+            tw_pending_uuid = ops.find_pending_uuid(target)
             if tw_done_uuid:
                 tw_status = f"completed ({tw_done_uuid[:8]})"
             elif tw_pending_uuid:
@@ -161,7 +219,7 @@ def run_habit_flow(argv: list[str], finish, *, skip_journal: bool) -> int:
         print(f"  json: {'logged' if already else 'not logged'}  |  taskwarrior: {tw_status}")
         return finish(0)
 
-    if is_already_logged(target):
+    if ops.is_already_logged(target):
         print(_green(f"✓ core4 {target.habit} ({target.date_key}) already logged (json)"))
         maybe_open_journal()
         return finish(0)
@@ -172,10 +230,10 @@ def run_habit_flow(argv: list[str], finish, *, skip_journal: bool) -> int:
         return finish(1)
 
     # Fail-safe: if TW already contains the completion, just replay into JSON.
-    if tw_has_completed(target):
+    if ops.tw_has_completed(target):
         try:
-            bridge_core4_log(target, source="tracker_replay")
-            if is_already_logged(target):
+            ops.bridge_core4_log(target, source="tracker_replay")
+            if ops.is_already_logged(target):
                 print(_green(f"✓ core4 {target.habit} ({target.date_key}) already done (replayed json)"))
             else:
                 print(_green(f"✓ core4 {target.habit} ({target.date_key}) already done (replay queued)"))
@@ -186,12 +244,12 @@ def run_habit_flow(argv: list[str], finish, *, skip_journal: bool) -> int:
             # Fall through to task-based approach.
 
     try:
-        ensure_taskwarrior()
+        ops.ensure_taskwarrior()
         # Concurrency/idempotency: if a pending task already exists, just complete it.
-        pending_uuid = find_pending_uuid(target)
+        pending_uuid = ops.find_pending_uuid(target)
         if pending_uuid:
-            task_done(pending_uuid)
-            if is_already_logged(target):
+            ops.task_done(pending_uuid)
+            if ops.is_already_logged(target):
                 print(_green(f"✓ core4 {target.habit} ({target.date_key}) → done existing (json ok)"))
             else:
                 print(_green(f"✓ core4 {target.habit} ({target.date_key}) → done existing (json pending)"))
@@ -200,24 +258,23 @@ def run_habit_flow(argv: list[str], finish, *, skip_journal: bool) -> int:
             return finish(0)
 
         # Extra safety: if a completed task exists under the stable tag, replay JSON and exit.
-        completed_uuid = find_completed_uuid(target)
+        completed_uuid = ops.find_completed_uuid(target)
         if completed_uuid:
-            bridge_core4_log(target, source="tracker_replay_uuid")
+            ops.bridge_core4_log(target, source="tracker_replay_uuid")
             print(_green(f"✓ core4 {target.habit} ({target.date_key}) already done (uuid)"))
             maybe_open_journal()
             return finish(0)
 
         # Create+complete via Taskwarrior so hooks handle Bridge+TickTick.
-        task_add(target)
-        pending_uuid = find_pending_uuid(target)
+        pending_uuid = ops.task_add(target) or ops.find_pending_uuid(target)
         if pending_uuid:
-            task_done(pending_uuid)
+            ops.task_done(pending_uuid)
     except Exception as exc:
         print(f"core4: {exc}", file=sys.stderr)
         return finish(1)
 
     # Best-effort verification: if hooks/bridge are fast, JSON should now contain it.
-    if is_already_logged(target):
+    if ops.is_already_logged(target):
         print(_green(f"✓ core4 {target.habit} ({target.date_key}) → created+done (json ok)"))
         rebuild_derived_best_effort()
         maybe_open_journal()
@@ -258,6 +315,9 @@ def main(argv: list[str]) -> int:
             "  core4 sources     # show local Core4 sources\n"
             "  core4 menu        # full action menu (fzf/gum)\n"
             "  core4 build       # write derived day+week snapshots (from ledger)\n"
+            "  core4 migrate-legacy [--force]  # convert legacy week JSON into ledger events (once per week)\n"
+            "  core4 daemon      # warm service; `core4 <habit>` forwards to it when running\n"
+            "  core4 daemon status|stop\n"
             "\n"
             "Show score (JSON-backed, with TW replay if behind):\n"
             "  core4 -d            # today\n"
@@ -292,20 +352,27 @@ def main(argv: list[str]) -> int:
             "declare",
         ]
         if _have_cmd("fzf"):
-            while True:
-                day = date.today()
-                data = load_week(day)
-                done = {habit for _, habit in _day_done_list(data, day)}
-                picked = fzf_pick_habit(options, done)
-                if not picked:
-                    return finish(0)
-                habit, action = picked
-                if not habit or action == "noop":
-                    continue
-                if action == "done":
-                    run_habit_flow([habit, "done"], finish, skip_journal=True)
-                else:
-                    run_habit_flow([habit], finish, skip_journal=False)
+            model: Optional[WeekModel] = None
+            ops = DeferredRebuildOps()
+            try:
+                while True:
+                    day = date.today()
+                    if model is None or day not in model.days:
+                        model = WeekModel(day)
+                    done = {habit for _, habit in _day_done_list(model.view(), day)}
+                    picked = fzf_pick_habit(options, done)
+                    if not picked:
+                        return finish(0)
+                    habit, action = picked
+                    if not habit or action == "noop":
+                        continue
+                    # view() re-reads the days whose event dirs changed, so it only shows real ledger writes.
+                    if action == "done":
+                        run_habit_flow([habit, "done"], finish, skip_journal=True, ops=ops)
+                    else:
+                        run_habit_flow([habit], finish, skip_journal=False, ops=ops)
+            finally:
+                ops.flush()
         day = date.today()
         data = load_week(day)
         done = {habit for _, habit in _day_done_list(data, day)}
@@ -367,13 +434,38 @@ def main(argv: list[str]) -> int:
         elif choice == "Finalize month":
             month = f"{date.today().year:04d}-{date.today().month:02d}"
             return 0 if run_core4ctl("finalize-month", month) else 1
-        return finish(0)
+        if choice != "Log habit":
+            return finish(0)
+
+    # Score shortcuts:
+    # - `core4 -w` (week total)
+    # - `core4 -d` (day total, default today)
+    # - `core4 -1d` (day total yesterday)
+    if not argv:
+        return finish(score_mode(["-d"]))
+    if argv[0].startswith("-") and argv[0] not in ("--date", "--dry-run", "--no-taskwarrior"):
+        return finish(score_mode(argv))
+    return run_habit_flow(argv, finish, skip_journal=skip_journal)
 
 
 def handle_admin_command(argv: list[str], *, finish, run_core4ctl) -> Optional[int]:
     if argv and argv[0] in ("sources", "source", "debug"):
         return finish(show_sources())
 
+    if argv and argv[0] in ("daemon", "serve"):
+        from core4_daemon import daemon_command
+
+        return finish(daemon_command(argv[1:]))
+
+    if argv and argv[0] in ("migrate-legacy", "migrate"):
+        try:
+            res = migrate_legacy(force="--force" in argv)
+        except Exception as exc:
+            print(f"core4: migrate-legacy failed: {exc}", file=sys.stderr)
+            return finish(1)
+        print(json.dumps(res, ensure_ascii=False))
+        return finish(0)
+
     if argv and argv[0] in ("build", "rebuild"):
         day_raw = argv[1] if len(argv) > 1 else None
         try:
@@ -492,16 +584,6 @@ def handle_admin_command(argv: list[str], *, finish, run_core4ctl) -> Optional[i
 
     return None
 
-    # Score shortcuts:
-    # - `core4 -w` (week total)
-    # - `core4 -d` (day total, default today)
-    # - `core4 -1d` (day total yesterday)
-    if not argv:
-        return finish(score_mode(["-d"]))
-    if argv[0].startswith("-") and argv[0] not in ("--date", "--dry-run", "--no-taskwarrior"):
-        return finish(score_mode(argv))
-    return run_habit_flow(argv, finish, skip_journal=skip_journal)
-
 
 if __name__ == "__main__":
     sys.exit(main(sys.argv[1:]))
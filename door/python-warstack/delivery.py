@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Async outbound delivery for the War Stack bot (GAS webhook + Bridge).
+
+- one shared aiohttp session for all posts
+- posts of one War Stack run concurrently
+- failed posts go to a persistent JSON outbox (WARSTACK_DATA_DIR) and are
+  retried with exponential backoff until they succeed or run out of attempts
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class Delivery:
+    """Shared HTTP poster with a persistent retry outbox"""
+
+    def __init__(
+        self,
+        outbox_path: Path,
+        retry_interval: float = 60.0,
+        max_attempts: int = 10,
+    ):
+        self.outbox_path = outbox_path
+        self.retry_interval = retry_interval
+        self.max_attempts = max_attempts
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._outbox: Optional[List[Dict[str, Any]]] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60)
+            )
+        return self._session
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def post(self, url: str, payload: Any, timeout: float) -> Tuple[bool, str]:
+        """POST JSON; (ok, error). Never raises."""
+        try:
+            async with self._get_session().post(
+                url, json=payload, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as resp:
+                await resp.read()
+                if resp.status >= 300:
+                    return False, f"HTTP {resp.status}"
+                return True, ""
+        except asyncio.TimeoutError:
+            return False, f"timeout after {timeout}s"
+        except aiohttp.ClientError as exc:
+            return False, str(exc) or exc.__class__.__name__
+
+    async def deliver(
+        self,
+        jobs: Dict[str, Dict[str, Any]],
+        chat_id: Optional[int] = None,
+    ) -> Dict[str, Tuple[bool, str]]:
+        """Post all jobs concurrently; queue failures in the outbox.
+
+        jobs: name -> {"url", "payload", "timeout"}
+        Returns name -> (ok, error).
+        """
+        names = list(jobs)
+        results = await asyncio.gather(
+            *(self.post(jobs[n]["url"], jobs[n]["payload"], jobs[n]["timeout"]) for n in names)
+        )
+        outcome = dict(zip(names, results))
+        failed = [
+            self._entry(name, jobs[name], chat_id, err)
+            for name, (ok, err) in outcome.items()
+            if not ok
+        ]
+        if failed:
+            async with self._get_lock():
+                outbox = await self._load()
+                outbox.extend(failed)
+                await self._save(outbox)
+        return outcome
+
+    def _entry(self, name: str, job: Dict[str, Any], chat_id: Optional[int], error: str) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "id": uuid.uuid4().hex,
+            "target": name,
+            "url": job["url"],
+            "payload": job["payload"],
+            "timeout": job["timeout"],
+            "chat_id": chat_id,
+            "attempts": 1,
+            "created": now,
+            "next_at": now + self.retry_interval,
+            "last_error": error,
+        }
+
+    async def retry_outbox(self) -> List[Tuple[Dict[str, Any], bool]]:
+        """Retry due outbox entries.
+
+        Returns (entry, delivered) for entries that left the outbox:
+        delivered=True on success, False when max attempts were exhausted.
+        """
+        async with self._get_lock():
+            outbox = await self._load()
+            now = time.time()
+            due = [e for e in outbox if e.get("next_at", 0) <= now]
+            if not due:
+                return []
+            results = await asyncio.gather(
+                *(self.post(e["url"], e["payload"], e["timeout"]) for e in due)
+            )
+            finished: List[Tuple[Dict[str, Any], bool]] = []
+            done_ids = set()
+            for entry, (ok, err) in zip(due, results):
+                entry["attempts"] = int(entry.get("attempts", 0)) + 1
+                entry["last_error"] = err
+                if ok or entry["attempts"] >= self.max_attempts:
+                    finished.append((entry, ok))
+                    done_ids.add(entry["id"])
+                    if not ok:
+                        logger.error(f"Outbox {entry['target']} dropped after {entry['attempts']} attempts: {err}")
+                else:
+                    backoff = self.retry_interval * 2 ** (entry["attempts"] - 1)
+                    entry["next_at"] = now + min(backoff, 6 * 3600)
+            self._outbox = [e for e in outbox if e["id"] not in done_ids]
+            await self._save(self._outbox)
+            return finished
+
+    def pending(self) -> int:
+        return len(self._outbox or [])
+
+    async def _load(self) -> List[Dict[str, Any]]:
+        if self._outbox is None:
+            self._outbox = await asyncio.to_thread(self._read)
+        return self._outbox
+
+    def _read(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.outbox_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except FileNotFoundError:
+            return []
+        except Exception as exc:
+            logger.error(f"Failed to read outbox {self.outbox_path}: {exc}")
+            return []
+
+    async def _save(self, outbox: List[Dict[str, Any]]) -> None:
+        data = list(outbox)
+        try:
+            await asyncio.to_thread(self._write, data)
+        except Exception as exc:
+            logger.error(f"Failed to write outbox {self.outbox_path}: {exc}")
+
+    def _write(self, data: List[Dict[str, Any]]) -> None:
+        tmp = self.outbox_path.with_suffix(".json.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.outbox_path)
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
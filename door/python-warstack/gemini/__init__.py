@@ -1,4 +1,6 @@
 from .client import GeminiClient
+from .pipeline import StrategistPipeline
 from .registry import get_command
+from .stub import StubClient
 
-__all__ = ["GeminiClient", "get_command"]
+__all__ = ["GeminiClient", "StrategistPipeline", "StubClient", "get_command"]
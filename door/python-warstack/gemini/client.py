@@ -1,17 +1,16 @@
 from __future__ import annotations
 
-from typing import Any
-
-try:
-    import google.generativeai as genai
-except ImportError as exc:
-    raise SystemExit(
-        "Missing google-generativeai. Install with: pip install google-generativeai"
-    ) from exc
+from typing import Any, Iterator
 
 
 class GeminiClient:
     def __init__(self, api_key: str, model_name: str) -> None:
+        try:
+            import google.generativeai as genai
+        except ImportError as exc:
+            raise SystemExit(
+                "Missing google-generativeai. Install with: pip install google-generativeai"
+            ) from exc
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model_name)
         self.generation_config = {
@@ -26,3 +25,12 @@ class GeminiClient:
             prompt, generation_config=self.generation_config
         )
         return getattr(response, "text", "") or ""
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        response = self.model.generate_content(
+            prompt, generation_config=self.generation_config, stream=True
+        )
+        for chunk in response:
+            text = getattr(chunk, "text", "") or ""
+            if text:
+                yield text
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Dict
+import hashlib
+from typing import Dict, Iterator
 
 
 def _format_hits(hits: list[dict]) -> str:
@@ -43,3 +44,17 @@ Respond in German. Keep it under 350 words. Use short sections with headings.
 def run(client, war_stack: Dict) -> str:
     prompt = build_prompt(war_stack)
     return client.generate(prompt)
+
+
+def cache_key(war_stack: Dict) -> str:
+    """Content hash of the prompt (ignores user/date so identical stacks share it)."""
+    return hashlib.sha256(build_prompt(war_stack).encode("utf-8")).hexdigest()
+
+
+def stream(client, war_stack: Dict) -> Iterator[str]:
+    prompt = build_prompt(war_stack)
+    generate_stream = getattr(client, "generate_stream", None)
+    if generate_stream is None:
+        yield client.generate(prompt)
+        return
+    yield from generate_stream(prompt)
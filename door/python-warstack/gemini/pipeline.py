@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+from .commands.strategist import cache_key, stream
+
+logger = logging.getLogger(__name__)
+
+# on_text(text_so_far, done)
+TextCallback = Callable[[str, bool], Awaitable[None]]
+
+
+class StrategistPipeline:
+    """Streaming, cached strategist runs.
+
+    - results are cached by `strategist.cache_key` (content hash) in memory and
+      in a JSON file, so an unchanged War Stack never costs a second LLM call
+    - concurrent runs for the same key share one generation
+    - at most `max_concurrency` generations run at once
+    - tokens are streamed from a worker thread; `on_text` is called at most
+      every `update_interval` seconds plus once at the end
+    """
+
+    def __init__(
+        self,
+        client,
+        cache_path: Optional[Path] = None,
+        max_concurrency: int = 2,
+        update_interval: float = 1.5,
+        max_entries: int = 200,
+    ) -> None:
+        self.client = client
+        self.cache_path = cache_path
+        self.update_interval = update_interval
+        self.max_entries = max_entries
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._cache: Optional[Dict[str, str]] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def cached(self, war_stack: Dict) -> Optional[str]:
+        cache = await self._load()
+        return cache.get(cache_key(war_stack))
+
+    async def prefetch(self, war_stack: Dict) -> None:
+        """Generate into the cache without a consumer (errors are logged)."""
+        try:
+            await self.run(war_stack)
+        except Exception as exc:
+            logger.warning("Strategist prefetch failed: %s", exc)
+
+    async def run(self, war_stack: Dict, on_text: Optional[TextCallback] = None) -> str:
+        key = cache_key(war_stack)
+        cache = await self._load()
+        if key in cache:
+            if on_text:
+                await on_text(cache[key], True)
+            return cache[key]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            text = await asyncio.shield(pending)
+            if on_text:
+                await on_text(text, True)
+            return text
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            async with self._semaphore:
+                text = await self._generate(war_stack, on_text)
+            if text:
+                cache[key] = text
+                while len(cache) > self.max_entries:
+                    cache.pop(next(iter(cache)))
+                await self._save()
+            fut.set_result(text)
+            return text
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as exc:
+            fut.set_exception(exc)
+            fut.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _generate(self, war_stack: Dict, on_text: Optional[TextCallback]) -> str:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def produce() -> None:
+            try:
+                for chunk in stream(self.client, war_stack):
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except Exception as exc:
+                loop.call_soon_threadsafe(queue.put_nowait, exc)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        worker = loop.run_in_executor(None, produce)
+        parts: list[str] = []
+        last_update = time.monotonic()
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                await worker
+                raise item
+            parts.append(item)
+            if on_text and time.monotonic() - last_update >= self.update_interval:
+                last_update = time.monotonic()
+                await on_text("".join(parts), False)
+        await worker
+        text = "".join(parts).strip()
+        if on_text and text:
+            await on_text(text, True)
+        return text
+
+    async def _load(self) -> Dict[str, str]:
+        if self._cache is None:
+            data = await asyncio.to_thread(self._read) if self.cache_path else {}
+            # A concurrent caller may have finished loading meanwhile.
+            if self._cache is None:
+                self._cache = data
+        return self._cache
+
+    def _read(self) -> Dict[str, str]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as exc:
+            logger.warning("Failed to read strategist cache %s: %s", self.cache_path, exc)
+            return {}
+
+    async def _save(self) -> None:
+        if not self.cache_path:
+            return
+        data = dict(self._cache or {})
+        try:
+            await asyncio.to_thread(self._write, data)
+        except Exception as exc:
+            logger.warning("Failed to write strategist cache %s: %s", self.cache_path, exc)
+
+    def _write(self, data: Dict[str, str]) -> None:
+        tmp = self.cache_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.cache_path)
@@ -7,7 +7,7 @@ from .commands import strategist
 CommandFn = Callable[[object, dict], str]
 
 _COMMANDS: Dict[str, CommandFn] = {
-    "strategist": strategist.run,
+    "strategist": strategist,
 }
 
 
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Iterator
+
+
+class StubClient:
+    """Offline stand-in for GeminiClient (GEMINI_STUB=1): deterministic, no network."""
+
+    def __init__(self, delay: float = 0.05) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    def _text(self, prompt: str) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        return (
+            f"## Hebel\nStub-Analyse {digest}: Fokus auf die Domino Door halten.\n\n"
+            "## Risiken\nHits 2 und 3 hängen voneinander ab.\n\n"
+            "## Nächster Schritt\nHit 1 morgen früh als Erstes erledigen.\n"
+        )
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        return self._text(prompt)
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        self.calls += 1
+        for line in self._text(prompt).splitlines(keepends=True):
+            if self.delay:
+                time.sleep(self.delay)
+            yield line
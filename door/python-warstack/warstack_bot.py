@@ -12,16 +12,14 @@ import datetime
 import logging
 import asyncio
 import shlex
-import urllib.request
-import urllib.error
 import time
 from pathlib import Path
 from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
 from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, ConversationHandler, CallbackQueryHandler, PicklePersistence
 
-from gemini import GeminiClient, get_command
+from delivery import Delivery
+from gemini import GeminiClient, StrategistPipeline, StubClient
 
 # ================================================================
 # CONFIGURATION
@@ -37,6 +35,8 @@ if not BOT_TOKEN:
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "").strip()
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash").strip()
 GEMINI_DELAY_SECONDS = int(os.getenv("GEMINI_DELAY_SECONDS", "1800"))
+GEMINI_STUB = os.getenv("GEMINI_STUB", "0").strip() == "1"
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "2"))
 
 # GAS output (optional)
 GAS_WEBHOOK_URL = (
@@ -47,8 +47,13 @@ GAS_TIMEOUT = int(os.getenv("WARSTACK_GAS_TIMEOUT", "6"))
 # Optional: direct task push to Bridge
 AOS_BRIDGE_URL = os.getenv("AOS_BRIDGE_URL", "").strip()
 AOS_BRIDGE_TIMEOUT = int(os.getenv("AOS_BRIDGE_TIMEOUT", "5"))
+# Failed GAS/Bridge posts are kept in an outbox and retried with backoff
+OUTBOX_RETRY_SECONDS = int(os.getenv("WARSTACK_OUTBOX_RETRY", "60"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("WARSTACK_OUTBOX_MAX_ATTEMPTS", "10"))
 
 IDLE_TIMEOUT_SECONDS = int(os.getenv("WARSTACK_IDLE_TIMEOUT", "900"))
+# Write-behind debounce for conversation state (seconds)
+WARSTACK_FLUSH_DELAY = float(os.getenv("WARSTACK_FLUSH_DELAY", "2"))
 
 # Paths
 OBSIDIAN_VAULT = Path(os.getenv("OBSIDIAN_VAULT", "~/vault")).expanduser()
@@ -76,90 +81,209 @@ logger = logging.getLogger(__name__)
 # DATA MODELS
 # ================================================================
 
-@dataclass
 class Hit:
-    fact: str = ""
-    obstacle: str = ""
-    strike: str = ""
-    responsibility: str = "Me"
+    __slots__ = ("fact", "obstacle", "strike", "responsibility")
+
+    def __init__(self, fact: str = "", obstacle: str = "", strike: str = "", responsibility: str = "Me"):
+        self.fact = fact
+        self.obstacle = obstacle
+        self.strike = strike
+        self.responsibility = responsibility
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Hit":
+        return cls(**{k: v for k, v in (data or {}).items() if k in cls.__slots__})
+
+    def __repr__(self) -> str:
+        return f"Hit({self.to_dict()!r})"
+
 
-@dataclass
 class WarStack:
-    user_id: int = 0
-    title: str = ""
-    domain: str = ""
-    subdomain: str = ""
-    domino_door: str = ""
-    trigger: str = ""
-    narrative: str = ""
-    validation: str = ""
-    impact: str = ""
-    consequences: str = ""
-    hits: list[Hit] = None
-    insights: str = ""
-    lessons: str = ""
-    date: str = ""
-    week: str = ""
-    
-    def __post_init__(self):
-        if self.hits is None:
-            self.hits = [Hit() for _ in range(4)]
-        if not self.date:
-            self.date = datetime.datetime.now().strftime('%Y-%m-%d')
-        if not self.week:
-            self.week = datetime.datetime.now().strftime('%Y-W%U')
+    __slots__ = (
+        "user_id", "title", "domain", "subdomain", "domino_door", "trigger",
+        "narrative", "validation", "impact", "consequences", "hits",
+        "insights", "lessons", "date", "week",
+    )
+
+    def __init__(
+        self,
+        user_id: int = 0,
+        title: str = "",
+        domain: str = "",
+        subdomain: str = "",
+        domino_door: str = "",
+        trigger: str = "",
+        narrative: str = "",
+        validation: str = "",
+        impact: str = "",
+        consequences: str = "",
+        hits: Optional[list[Hit]] = None,
+        insights: str = "",
+        lessons: str = "",
+        date: str = "",
+        week: str = "",
+    ):
+        self.user_id = user_id
+        self.title = title
+        self.domain = domain
+        self.subdomain = subdomain
+        self.domino_door = domino_door
+        self.trigger = trigger
+        self.narrative = narrative
+        self.validation = validation
+        self.impact = impact
+        self.consequences = consequences
+        self.hits = hits if hits is not None else [Hit() for _ in range(4)]
+        self.insights = insights
+        self.lessons = lessons
+        self.date = date or datetime.datetime.now().strftime('%Y-%m-%d')
+        self.week = week or datetime.datetime.now().strftime('%Y-W%U')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict (same shape the old dataclass `asdict()` produced)"""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["hits"] = [hit.to_dict() for hit in self.hits]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WarStack":
+        fields = {k: v for k, v in data.items() if k in cls.__slots__}
+        if fields.get("hits") is not None:
+            fields["hits"] = [Hit.from_dict(hit) for hit in fields["hits"]]
+        return cls(**fields)
+
+    def __repr__(self) -> str:
+        return f"WarStack(user_id={self.user_id!r}, title={self.title!r}, week={self.week!r})"
 
 # ================================================================
 # PERSISTENCE MANAGER
 # ================================================================
 
 class WarStackPersistence:
-    """Handles saving and loading war stack data per user"""
-    
+    """In-memory War Stack sessions with write-behind to JSON files.
+
+    Handlers read and mutate the cached object; `save_war_stack` only marks it
+    dirty and (re)arms a debounce timer. Dirty stacks are written atomically
+    (tmp + rename) in a worker thread, on the timer, on conversation state
+    transitions (`flush`) and on shutdown. Drafts pushed into the data dir by
+    the Bridge are picked up again via the file mtime.
+    """
+
+    def __init__(self, data_dir: Path, flush_delay: float = 2.0):
+        self.data_dir = data_dir
+        self.flush_delay = flush_delay
+        self._cache: Dict[int, WarStack] = {}
+        self._mtimes: Dict[int, float] = {}
+        self._dirty: set[int] = set()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _path(self, user_id: int) -> Path:
+        return self.data_dir / f"warstack_{user_id}.json"
+
+    @staticmethod
+    def _mtime(filepath: Path) -> float:
+        try:
+            return filepath.stat().st_mtime
+        except OSError:
+            return 0.0
+
     def save_war_stack(self, user_id: int, war_stack: WarStack) -> None:
-        """Save war stack to JSON file"""
+        """Cache the war stack and schedule a debounced flush"""
+        self._cache[user_id] = war_stack
+        self._dirty.add(user_id)
         try:
-            filepath = PERSISTENCE_DIR / f"warstack_{user_id}.json"
-            # Convert dataclass to dict, handling nested Hit objects
-            data = asdict(war_stack)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            logger.info(f"War stack saved for user {user_id}")
-        except Exception as e:
-            logger.error(f"Failed to save war stack for user {user_id}: {e}")
-            raise
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts/tests): write through.
+            self._write(user_id, war_stack.to_dict())
+            self._dirty.discard(user_id)
+            return
+        if self._timer:
+            self._timer.cancel()
+        self._timer = loop.call_later(self.flush_delay, lambda: asyncio.ensure_future(self.flush()))
 
     def load_war_stack(self, user_id: int) -> Optional[WarStack]:
-        """Load war stack from JSON file"""
+        """Cached war stack, (re)loaded from JSON if the file changed behind our back"""
+        filepath = self._path(user_id)
+        cached = self._cache.get(user_id)
+        if cached is not None and user_id in self._dirty:
+            return cached
+        mtime = self._mtime(filepath)
+        if cached is not None and mtime == self._mtimes.get(user_id):
+            return cached
+        if not mtime:
+            self._cache.pop(user_id, None)
+            return None
         try:
-            filepath = PERSISTENCE_DIR / f"warstack_{user_id}.json"
-            if not filepath.exists():
-                return None
-            
             with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Convert hits back to Hit objects
-            if 'hits' in data:
-                data['hits'] = [Hit(**hit) for hit in data['hits']]
-            
-            return WarStack(**data)
+                war_stack = WarStack.from_dict(json.load(f))
         except Exception as e:
             logger.error(f"Failed to load war stack for user {user_id}: {e}")
             return None
-
-    def delete_war_stack(self, user_id: int) -> None:
-        """Delete war stack file"""
-        try:
-            filepath = PERSISTENCE_DIR / f"warstack_{user_id}.json"
-            if filepath.exists():
-                filepath.unlink()
-            logger.info(f"War stack deleted for user {user_id}")
-        except Exception as e:
-            logger.error(f"Failed to delete war stack for user {user_id}: {e}")
+        self._cache[user_id] = war_stack
+        self._mtimes[user_id] = mtime
+        return war_stack
+
+    def _write(self, user_id: int, data: Dict[str, Any]) -> float:
+        filepath = self._path(user_id)
+        tmp = filepath.with_suffix(".json.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, filepath)
+        return self._mtime(filepath)
+
+    async def flush(self, user_id: Optional[int] = None) -> None:
+        """Write dirty stacks (all, or one user) off the event loop"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if user_id is None:
+                if self._timer:
+                    self._timer.cancel()
+                    self._timer = None
+                pending = list(self._dirty)
+            else:
+                pending = [user_id] if user_id in self._dirty else []
+            for uid in pending:
+                war_stack = self._cache.get(uid)
+                self._dirty.discard(uid)
+                if war_stack is None:
+                    continue
+                # Snapshot on the loop; handlers may keep mutating the object.
+                data = war_stack.to_dict()
+                try:
+                    self._mtimes[uid] = await asyncio.to_thread(self._write, uid, data)
+                    logger.info(f"War stack saved for user {uid}")
+                except Exception as e:
+                    self._dirty.add(uid)
+                    logger.error(f"Failed to save war stack for user {uid}: {e}")
+
+    async def delete_war_stack(self, user_id: int) -> None:
+        """Drop the cached session and delete its file"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._cache.pop(user_id, None)
+            self._mtimes.pop(user_id, None)
+            self._dirty.discard(user_id)
+            try:
+                await asyncio.to_thread(self._path(user_id).unlink, missing_ok=True)
+                logger.info(f"War stack deleted for user {user_id}")
+            except Exception as e:
+                logger.error(f"Failed to delete war stack for user {user_id}: {e}")
 
 # Global persistence manager
-persistence = WarStackPersistence()
+persistence = WarStackPersistence(PERSISTENCE_DIR, WARSTACK_FLUSH_DELAY)
+
+# Runtime services, set up in main(). Kept out of bot_data: PicklePersistence
+# deep-copies bot_data on every update, and neither the delivery's aiohttp
+# session nor the strategist's semaphore/worker threads can be copied.
+delivery: Optional[Delivery] = None
+strategist: Optional[StrategistPipeline] = None
 
 # ================================================================
 # DOMAIN CONFIGURATIONS
@@ -219,7 +343,7 @@ def get_war_stack(user_id: int) -> WarStack:
     return war_stack
 
 def save_war_stack(war_stack: WarStack) -> None:
-    """Save war stack with error handling"""
+    """Save war stack (write-behind) with error handling"""
     try:
         persistence.save_war_stack(war_stack.user_id, war_stack)
     except Exception as e:
@@ -239,6 +363,7 @@ async def idle_watchdog(context: ContextTypes.DEFAULT_TYPE) -> None:
     if time.time() - last < IDLE_TIMEOUT_SECONDS:
         return
     logger.info("Idle timeout reached, shutting down.")
+    await persistence.flush()
     try:
         await context.application.stop()
         await context.application.shutdown()
@@ -257,6 +382,9 @@ async def send_validation_error(update: Update, message: str) -> None:
 # ================================================================
 
 def build_gemini_client() -> Optional[GeminiClient]:
+    if GEMINI_STUB:
+        logger.info("GEMINI_STUB=1; using local stub strategist")
+        return StubClient()
     if not GEMINI_API_KEY:
         logger.warning("GEMINI_API_KEY not set; strategist feedback disabled")
         return None
@@ -278,6 +406,36 @@ def split_message(text: str, max_len: int = 3800) -> list[str]:
     return chunks or [text]
 
 
+class ProgressiveMessage:
+    """Telegram message(s) edited in place as streamed text grows"""
+
+    def __init__(self, bot, chat_id: int, header: str, max_len: int = 3800):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.header = header
+        self.max_len = max_len
+        self.sent: list = []
+        self.texts: list[str] = []
+
+    async def update(self, text: str, done: bool) -> None:
+        body = text if done else f"{text} …"
+        chunks = split_message(f"{self.header}\n\n{body}", max_len=self.max_len)
+        for idx, chunk in enumerate(chunks):
+            if idx < len(self.sent):
+                if self.texts[idx] == chunk:
+                    continue
+                try:
+                    await self.sent[idx].edit_text(chunk)
+                except Exception as exc:
+                    # "message is not modified" and edit flood limits are not fatal
+                    logger.debug(f"Strategist edit skipped: {exc}")
+                    continue
+                self.texts[idx] = chunk
+            else:
+                self.sent.append(await self.bot.send_message(chat_id=self.chat_id, text=chunk))
+                self.texts.append(chunk)
+
+
 async def send_strategist_feedback(context: ContextTypes.DEFAULT_TYPE) -> None:
     payload = context.job.data or {}
     user_id = payload.get("user_id")
@@ -285,31 +443,25 @@ async def send_strategist_feedback(context: ContextTypes.DEFAULT_TYPE) -> None:
     if not user_id or not war_stack:
         return
 
-    client = context.application.bot_data.get("gemini_client")
-    if not client:
+    if not strategist:
         return
 
-    command = get_command("strategist")
-    if not command:
-        return
-
-    loop = asyncio.get_running_loop()
-    response = await loop.run_in_executor(None, command, client, war_stack)
-    if not response:
-        return
-
-    header = "Strategic Review (Gemini)"
-    for chunk in split_message(response):
-        await context.bot.send_message(chat_id=user_id, text=f"{header}\n\n{chunk}")
-        header = ""
+    message = ProgressiveMessage(context.bot, user_id, "Strategic Review (Gemini)")
+    try:
+        await strategist.run(war_stack, on_text=message.update)
+    except Exception as exc:
+        logger.error(f"Strategist feedback failed for user {user_id}: {exc}")
 
 
 def schedule_strategist_feedback(application: Application, user_id: int, war_stack: WarStack) -> None:
     if not application.job_queue:
         return
-    if not application.bot_data.get("gemini_client"):
+    if not strategist:
         return
-    payload = {"user_id": user_id, "war_stack": asdict(war_stack)}
+    payload = {"user_id": user_id, "war_stack": war_stack.to_dict()}
+    if GEMINI_DELAY_SECONDS > 0:
+        # Generate now into the cache; the delayed job then only sends it.
+        application.create_task(strategist.prefetch(payload["war_stack"]))
     application.job_queue.run_once(
         send_strategist_feedback,
         when=GEMINI_DELAY_SECONDS,
@@ -584,6 +736,7 @@ async def consequences_set(update: Update, context: ContextTypes.DEFAULT_TYPE):
     war_stack = get_war_stack(user_id)
     war_stack.consequences = text.strip()
     save_war_stack(war_stack)
+    await persistence.flush(user_id)
     
     await update.message.reply_text(
         "⚔️ **DIE VIER HITS**\n\n"
@@ -819,44 +972,54 @@ def build_task_payloads(war_stack: WarStack) -> list[dict]:
     return tasks
 
 
-def post_tasks_to_bridge(tasks: list[dict]) -> tuple[bool, str]:
+def bridge_job(tasks: list[dict]) -> dict:
     """Optional: push tasks directly to Bridge -> Taskwarrior"""
-    if not AOS_BRIDGE_URL:
-        return False, "AOS_BRIDGE_URL not set"
-    try:
-        payload = json.dumps({"source": "warstack_bot", "tasks": tasks}).encode("utf-8")
-        url = AOS_BRIDGE_URL.rstrip("/") + "/bridge/task/execute"
-        req = urllib.request.Request(
-            url,
-            data=payload,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-        with urllib.request.urlopen(req, timeout=AOS_BRIDGE_TIMEOUT) as resp:
-            if 200 <= resp.status < 300:
-                return True, "ok"
-            return False, f"HTTP {resp.status}"
-    except Exception as exc:
-        return False, str(exc)
+    return {
+        "url": AOS_BRIDGE_URL.rstrip("/") + "/bridge/task/execute",
+        "payload": {"source": "warstack_bot", "tasks": tasks},
+        "timeout": AOS_BRIDGE_TIMEOUT,
+    }
 
 
-def post_to_gas(payload: dict) -> tuple[bool, str]:
-    if not GAS_WEBHOOK_URL:
-        return False, "WARSTACK_GAS_WEBHOOK_URL not set"
-    try:
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            GAS_WEBHOOK_URL,
-            data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST",
+def gas_job(payload: dict) -> dict:
+    return {"url": GAS_WEBHOOK_URL, "payload": payload, "timeout": GAS_TIMEOUT}
+
+
+DELIVERY_LABELS = {"gas": "GAS Sync", "bridge": "Bridge Task Push"}
+
+
+async def deliver_and_report(application: Application, chat_id: int, jobs: dict) -> None:
+    """Post GAS/Bridge jobs concurrently in the background and report failures"""
+    outcome = await delivery.deliver(jobs, chat_id=chat_id)
+    for name, (ok, err) in outcome.items():
+        if ok:
+            continue
+        logger.warning(f"{DELIVERY_LABELS.get(name, name)} failed: {err}")
+        try:
+            await application.bot.send_message(
+                chat_id=chat_id,
+                text=f"⚠️ {DELIVERY_LABELS.get(name, name)} fehlgeschlagen: {err}\n"
+                     f"Wird automatisch erneut versucht.",
+            )
+        except Exception as exc:
+            logger.error(f"Failed to report delivery outcome: {exc}")
+
+
+async def retry_outbox_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    for entry, delivered in await delivery.retry_outbox():
+        chat_id = entry.get("chat_id")
+        if not chat_id:
+            continue
+        label = DELIVERY_LABELS.get(entry["target"], entry["target"])
+        text = (
+            f"✅ {label} nachgeliefert."
+            if delivered
+            else f"❌ {label} endgültig fehlgeschlagen: {entry.get('last_error')}"
         )
-        with urllib.request.urlopen(req, timeout=GAS_TIMEOUT) as resp:
-            if resp.status >= 300:
-                return False, f"GAS HTTP {resp.status}"
-    except urllib.error.URLError as exc:
-        return False, str(exc)
-    return True, ""
+        try:
+            await context.bot.send_message(chat_id=chat_id, text=text)
+        except Exception as exc:
+            logger.error(f"Failed to report outbox retry: {exc}")
 
 # ================================================================
 # ADDITIONAL COMMANDS
@@ -1204,6 +1367,7 @@ async def prompt_lessons(update: Update) -> int:
 
 
 async def timeout_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    await persistence.flush()
     if update and update.effective_chat:
         try:
             await context.bot.send_message(
@@ -1249,7 +1413,7 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Cancel current conversation"""
     user_id = update.effective_user.id
-    persistence.delete_war_stack(user_id)
+    await persistence.delete_war_stack(user_id)
     
     await update.message.reply_text(
         "❌ War Stack Erstellung abgebrochen.\n\n"
@@ -1354,6 +1518,7 @@ async def hit1_strike_set(update: Update, context: ContextTypes.DEFAULT_TYPE):
     war_stack = get_war_stack(user_id)
     war_stack.hits[0].strike = text.strip()
     save_war_stack(war_stack)
+    await persistence.flush(user_id)
     
     await update.message.reply_text(
         "✅ **Hit 1 Komplett!**\n\n"
@@ -1416,6 +1581,7 @@ async def hit2_strike_set(update: Update, context: ContextTypes.DEFAULT_TYPE):
     war_stack = get_war_stack(user_id)
     war_stack.hits[1].strike = text.strip()
     save_war_stack(war_stack)
+    await persistence.flush(user_id)
     
     await update.message.reply_text(
         "🎯 **HIT 3 - FAKT**\n\nMessbares Ergebnis für Hit 3?", 
@@ -1474,6 +1640,7 @@ async def hit3_strike_set(update: Update, context: ContextTypes.DEFAULT_TYPE):
     war_stack = get_war_stack(user_id)
     war_stack.hits[2].strike = text.strip()
     save_war_stack(war_stack)
+    await persistence.flush(user_id)
     
     await update.message.reply_text(
         "🎯 **HIT 4 - FAKT**\n\nFinales messbares Ergebnis?", 
@@ -1532,6 +1699,7 @@ async def hit4_strike_set(update: Update, context: ContextTypes.DEFAULT_TYPE):
     war_stack = get_war_stack(user_id)
     war_stack.hits[3].strike = text.strip()
     save_war_stack(war_stack)
+    await persistence.flush(user_id)
     
     await update.message.reply_text(
         "🧠 **ERKENNTNISSE**\n\n"
@@ -1581,6 +1749,7 @@ async def lessons_set(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not (war_stack.title or "").strip():
         war_stack.title = (war_stack.domino_door or f"{war_stack.domain} War Stack").strip()
     save_war_stack(war_stack)
+    await persistence.flush(user_id)
     
     # Create outputs with error handling
     try:
@@ -1640,9 +1809,10 @@ Bereit, diese Woche zu dominieren! 💪💀
                 parse_mode='Markdown'
             )
 
-        # Push to GAS (optional)
+        # Push to GAS / Bridge (optional) in the background; outcome is reported later
+        jobs = {}
         if GAS_WEBHOOK_URL:
-            payload = {
+            jobs["gas"] = gas_job({
                 "kind": "warstack_complete",
                 "payload": {
                     "user_id": war_stack.user_id,
@@ -1654,23 +1824,13 @@ Bereit, diese Woche zu dominieren! 💪💀
                     "markdown": markdown,
                     "tasks": build_task_payloads(war_stack),
                 },
-            }
-            ok, err = post_to_gas(payload)
-            if not ok:
-                await update.message.reply_text(
-                    f"⚠️ GAS Sync fehlgeschlagen: {err}",
-                    parse_mode='Markdown'
-                )
-
-        # Optional: direct task push to Bridge
+            })
         if AOS_BRIDGE_URL:
-            bridge_ok, bridge_err = post_tasks_to_bridge(build_task_payloads(war_stack))
-            if not bridge_ok:
-                logger.warning(f"Bridge task push failed: {bridge_err}")
-                await update.message.reply_text(
-                    f"⚠️ Bridge Task Push fehlgeschlagen: {bridge_err}",
-                    parse_mode='Markdown'
-                )
+            jobs["bridge"] = bridge_job(build_task_payloads(war_stack))
+        if jobs:
+            context.application.create_task(
+                deliver_and_report(context.application, update.effective_chat.id, jobs)
+            )
 
         schedule_strategist_feedback(context.application, user_id, war_stack)
         await update.message.reply_text(
@@ -1708,12 +1868,18 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             parse_mode='Markdown'
         )
 
+async def flush_on_shutdown(application: Application) -> None:
+    await persistence.flush()
+    if delivery:
+        await delivery.close()
+
 # ================================================================
 # MAIN BOT SETUP
 # ================================================================
 
 def main():
     """Run the bot with improved error handling and configuration"""
+    global delivery, strategist
     
     # Validate configuration
     if not OBSIDIAN_VAULT.exists():
@@ -1725,10 +1891,27 @@ def main():
     pickle_persistence = PicklePersistence(filepath=PERSISTENCE_DIR / "bot_persistence.pickle")
     
     # Create application with persistence
-    application = Application.builder().token(BOT_TOKEN).persistence(pickle_persistence).build()
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .persistence(pickle_persistence)
+        .post_shutdown(flush_on_shutdown)
+        .build()
+    )
 
     gemini_client = build_gemini_client()
     application.bot_data["gemini_client"] = gemini_client
+    if gemini_client:
+        strategist = StrategistPipeline(
+            gemini_client,
+            cache_path=PERSISTENCE_DIR / "strategist_cache.json",
+            max_concurrency=GEMINI_MAX_CONCURRENCY,
+        )
+    delivery = Delivery(
+        PERSISTENCE_DIR / "outbox.json",
+        retry_interval=OUTBOX_RETRY_SECONDS,
+        max_attempts=OUTBOX_MAX_ATTEMPTS,
+    )
     
     # Create conversation handler for War Stack
     war_stack_handler = ConversationHandler(
@@ -1791,6 +1974,7 @@ def main():
     touch_activity(application)
     if application.job_queue:
         application.job_queue.run_repeating(idle_watchdog, interval=60, first=60)
+        application.job_queue.run_repeating(retry_outbox_job, interval=OUTBOX_RETRY_SECONDS, first=10)
     application.run_polling(allowed_updates=Update.ALL_TYPES)
 
 if __name__ == '__main__':
@@ -377,8 +377,21 @@ def debug_counts(scope: str) -> Dict[str, int]:
     }
 
 
-def build_overdue_messages() -> List[str]:
-    raw_tasks = _load_tasks_snapshot()
+def load_tasks_snapshot() -> List[Dict[str, Any]]:
+    """Public snapshot loader (export file → task export → stale file)."""
+    return _load_tasks_snapshot()
+
+
+def task_export_mtime() -> float:
+    """mtime of the export snapshot file (0.0 if missing); cheap staleness probe."""
+    try:
+        return TASK_EXPORT_PATH.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def build_overdue_messages(tasks: List[Dict[str, Any]] | None = None) -> List[str]:
+    raw_tasks = tasks if tasks is not None else _load_tasks_snapshot()
     today_start = dt.datetime.now(TZ).replace(hour=0, minute=0, second=0, microsecond=0)
     tasks = _dedup(_select_overdue(raw_tasks, today_start=today_start))
     tasks = [t for t in tasks if (not REQUIRE_DOMAIN or _has_valid_domain(t))]
@@ -418,14 +431,14 @@ def build_overdue_messages() -> List[str]:
     return ["✅ No overdue fire tasks."]
 
 
-def build_project_messages(scope: str) -> List[str]:
+def build_project_messages(scope: str, tasks: List[Dict[str, Any]] | None = None) -> List[str]:
     scope = str(scope or "").strip().lower()
     if scope not in ("daily", "weekly"):
         return []
 
     today = _today()
 
-    raw_tasks = _load_tasks_snapshot()
+    raw_tasks = tasks if tasks is not None else _load_tasks_snapshot()
     today_start = dt.datetime.now(TZ).replace(hour=0, minute=0, second=0, microsecond=0)
     tomorrow_start = today_start + dt.timedelta(days=1)
     week_start = today_start - dt.timedelta(days=today_start.isoweekday() - 1)
@@ -473,8 +486,11 @@ def build_project_messages(scope: str) -> List[str]:
     return out
 
 
-def build_all_messages(scope: str) -> List[str]:
+def build_all_messages(scope: str, tasks: List[Dict[str, Any]] | None = None) -> List[str]:
+    # One snapshot for overdue + project views (callers may pass a warm one).
+    if tasks is None:
+        tasks = _load_tasks_snapshot()
     msgs: List[str] = []
-    msgs.extend([m for m in build_overdue_messages() if str(m).strip()])
-    msgs.extend(build_project_messages(scope))
+    msgs.extend([m for m in build_overdue_messages(tasks) if str(m).strip()])
+    msgs.extend(build_project_messages(scope, tasks))
     return [m for m in msgs if str(m).strip()]
@@ -5,26 +5,29 @@ Changes vs your version:
 - Use Telegram parse_mode=HTML (robust)
 - Escape content safely
 - Chunk long messages
-- Persist update offset to disk
+- Persist update offset to disk (once per getUpdates batch)
+- `listen` runs an asyncio loop: commands go to a worker pool, so a slow
+  weekly render never blocks `#id done`; Telegram calls reuse keep-alive
+  HTTPS connections
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import datetime as dt
 import html
-import json
 import os
 import shlex
 import subprocess
-import time
+import sys
 from pathlib import Path
-from typing import List
-from urllib import parse, request
+from typing import Any, Dict, List
 
 BASE_DIR = Path(__file__).resolve().parent
 ENV_PATH = BASE_DIR / ".env"
 OFFSET_PATH = BASE_DIR / ".offset"
+SEND_QUEUE_PATH = BASE_DIR / ".send_queue.json"
 
 
 def load_dotenv(path: Path) -> None:
@@ -78,6 +81,13 @@ load_default_env()
 
 from firemap import build_all_messages, debug_counts  # noqa: E402
 
+# Shared Telegram sender lives in the repo-level lib/ (stdlib only).
+_LIB_DIR = str(BASE_DIR.parents[1] / "lib")
+if _LIB_DIR not in sys.path:
+    sys.path.append(_LIB_DIR)
+
+from tg_sender import TelegramApi, TelegramSender  # noqa: E402
+
 TASK_BIN = os.environ.get("AOS_TASK_BIN", "task")
 TELE_BIN = os.environ.get("AOS_TELE_BIN", "tele")
 BOT_TOKEN = os.environ.get("AOS_FIREMAP_BOT_TOKEN", "")
@@ -93,6 +103,8 @@ ALLOW_TELE_FALLBACK = os.environ.get("AOS_FIREMAP_ALLOW_TELE_FALLBACK", "0").str
 
 # Telegram hard-ish limit: keep margin
 MAX_TG_CHARS = int(os.environ.get("AOS_FIREMAP_MAX_TG_CHARS", "3600") or "3600")
+# listen mode: parallel command workers
+LISTEN_WORKERS = max(1, int(os.environ.get("AOS_FIREMAP_LISTEN_WORKERS", "3") or "3"))
 
 
 def _parse_chat_ids() -> List[str]:
@@ -184,42 +196,53 @@ def _to_html_message(text: str) -> str:
     return html.escape(raw)
 
 
-def _send_msg_via_api(text: str, chat_ids: List[str], *, debug: bool = False) -> bool:
+def render_html_chunks(text: str) -> List[str]:
+    """Engine output → Telegram-ready HTML chunks (parse_mode=HTML)."""
+    return _chunk(_to_html_message(text), MAX_TG_CHARS)
+
+
+_SENDER: TelegramSender | None = None
+
+
+def _sender() -> TelegramSender:
+    """Shared rate-limited sender (process-wide; retry queue next to .offset)."""
+    global _SENDER
+    if _SENDER is None:
+        _SENDER = TelegramSender(
+            BOT_TOKEN,
+            queue_path=SEND_QUEUE_PATH,
+            log=lambda msg: print("WARN:", msg),
+        )
+    return _SENDER
+
+
+def _send_html_via_api(chunks: List[str], chat_ids: List[str], *, debug: bool = False) -> bool:
     if not BOT_TOKEN or not chat_ids:
         return False
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-    html_msg = _to_html_message(text)
-    chunks = _chunk(html_msg, MAX_TG_CHARS)
-
-    ok = True
-    any_ok = False
-    for chat_id in chat_ids:
-        for c in chunks:
-            data = parse.urlencode({"chat_id": chat_id, "text": c, "parse_mode": "HTML"}).encode("utf-8")
-            req = request.Request(url, data=data)
-            try:
-                raw = request.urlopen(req, timeout=10).read().decode("utf-8", errors="ignore")
-                any_ok = True
-                if debug:
-                    print("DEBUG: sent via api url=", url, "chat_id=", chat_id)
-                    print("DEBUG: response=", raw[:800])
-            except Exception as exc:
-                if debug:
-                    print("DEBUG: api send failed chat_id=", chat_id, "err=", repr(exc))
-                ok = False
+    sender = _sender()
+    before = sender.stats["requests"]
+    # Merge only up to the same margin the chunks were split at.
+    ok = sender.send_many(chat_ids, chunks, parse_mode="HTML", limit=MAX_TG_CHARS)
     if debug:
-        print("DEBUG: api any_ok=", any_ok, "all_ok=", ok)
-    return any_ok and ok
+        print("DEBUG: api chunks=", len(chunks), "chats=", len(chat_ids), "requests=", sender.stats["requests"] - before)
+        print("DEBUG: api ok=", ok, "stats=", sender.stats)
+    return ok
 
 
-def send_msg(
-    text: str,
+def _send_msg_via_api(text: str, chat_ids: List[str], *, debug: bool = False) -> bool:
+    return _send_html_via_api(render_html_chunks(text), chat_ids, debug=debug)
+
+
+def send_msgs(
+    texts: List[str],
     *,
     prefer_api: bool = False,
     debug: bool = False,
     chat_ids: List[str] | None = None,
 ) -> bool:
-    if not text:
+    """Send several engine messages; the API path packs them into as few requests as possible."""
+    texts = [t for t in texts if t]
+    if not texts:
         return True
 
     targets = list(chat_ids) if chat_ids is not None else list(CHAT_IDS)
@@ -227,28 +250,35 @@ def send_msg(
     if sender not in ("api", "tele", "auto"):
         sender = "api"
 
+    def via_tele() -> bool:
+        ok = True
+        for text in texts:
+            ok = try_send_via_tele(text) and ok
+        return ok
+
     # Explicit tele mode: always use tele helper only.
     if sender == "tele":
-        return try_send_via_tele(text)
+        return via_tele()
 
     # Tele helper can only target its configured default chat, so only use it
     # as primary path when we don't need fanout.
     if sender == "auto" and len(targets) <= 1:
-        if try_send_via_tele(text):
+        if via_tele():
             if debug:
                 print("DEBUG: sent via tele")
             return True
 
     # API path is canonical when token + targets are available.
     if BOT_TOKEN and targets:
-        ok = _send_msg_via_api(text, targets, debug=debug)
+        chunks = [c for text in texts for c in render_html_chunks(text)]
+        ok = _send_html_via_api(chunks, targets, debug=debug)
         if ok:
             return True
         # Avoid mixed/duplicate sender paths unless explicitly enabled.
         if not ALLOW_TELE_FALLBACK:
             return False
 
-    if try_send_via_tele(text):
+    if via_tele():
         if debug:
             print("DEBUG: sent via tele (fallback)")
         return True
@@ -256,15 +286,21 @@ def send_msg(
     return False
 
 
+def send_msg(
+    text: str,
+    *,
+    prefer_api: bool = False,
+    debug: bool = False,
+    chat_ids: List[str] | None = None,
+) -> bool:
+    return send_msgs([text], prefer_api=prefer_api, debug=debug, chat_ids=chat_ids)
+
+
 def send_firemap(scope: str, *, debug: bool = False) -> bool:
     msgs = build_all_messages(scope)
     if not msgs:
         msgs = ["🟦 Firemap: (no tasks)"]
-
-    ok = True
-    for msg in msgs:
-        ok = send_msg(msg, debug=debug) and ok
-    return ok
+    return send_msgs(msgs, debug=debug)
 
 
 def _read_offset() -> int:
@@ -281,67 +317,106 @@ def _write_offset(val: int) -> None:
         return
 
 
-def listen_for_done() -> None:
-    if not BOT_TOKEN:
-        print("ERR: AOS_FIREMAP_BOT_TOKEN missing; listen disabled.")
-        return
+HELP_TEXT = (
+    "<b>AlphaOS Fire Bot</b>\n\n"
+    "<code>/fire</code> — today (due/scheduled/wait)\n"
+    "<code>/fireweek</code> — this week (Mon–Sun)\n\n"
+    "<b>Notes</b>\n"
+    "- due/scheduled/wait tasks are included regardless of tags\n"
+    "- undated tasks are included by tags via <code>AOS_FIREMAP_TAGS</code> (default: <code>production,hit,fire</code>)\n"
+    "- undated mode via <code>AOS_FIREMAP_TAGS_MODE</code> (<code>any</code>/<code>all</code>)\n"
+    "- include undated in daily via <code>AOS_FIREMAP_INCLUDE_UNDATED_DAILY</code>\n"
+    "- overdue is sent separately\n\n"
+    "<b>Debug (terminal)</b>\n"
+    "<code>firectl doctor</code>\n"
+    "<code>firectl test --debug --scope daily</code>"
+)
 
-    offset = _read_offset() or None
 
-    while True:
-        try:
-            params = {"timeout": 30}
+def _mark_done(task_id: str) -> None:
+    subprocess.run([TASK_BIN, task_id, "done"], check=False)
+    send_msg(f"OK: task #{task_id} marked as done.")
+
+
+def _command_for(text: str):
+    """Map an incoming message to (key, sync job) or None."""
+    if text in ("/fire", "/fire@alphaos_firebot"):
+        return "fire:daily", lambda: send_firemap("daily")
+    if text in ("/fireweek", "/fireweekend", "/fire7", "/fireweek@alphaos_firebot"):
+        return "fire:weekly", lambda: send_firemap("weekly")
+    if text in ("/firehelp", "/help", "/start"):
+        return "help", lambda: send_msg(HELP_TEXT, prefer_api=True)
+    if text.endswith(" done") and text.startswith("#"):
+        task_id = text.split()[0].replace("#", "")
+        return f"done:{task_id}", lambda: _mark_done(task_id)
+    return None
+
+
+async def _listen_async(workers: int = LISTEN_WORKERS) -> None:
+    poll_api = TelegramApi(BOT_TOKEN)
+    queue: asyncio.Queue = asyncio.Queue()
+    queued: set[str] = set()
+
+    async def worker() -> None:
+        while True:
+            key, job = await queue.get()
+            queued.discard(key)
+            try:
+                await asyncio.to_thread(job)
+            except Exception as exc:
+                print(f"WARN: command {key} failed:", repr(exc))
+            finally:
+                queue.task_done()
+
+    pool = [asyncio.create_task(worker()) for _ in range(workers)]
+    offset = _read_offset() or None
+    try:
+        while True:
+            params: Dict[str, Any] = {"timeout": 30}
             if offset is not None and int(offset) > 0:
                 params["offset"] = int(offset)
+            try:
+                resp = await asyncio.to_thread(poll_api.call, "getUpdates", params, timeout=40)
+            except Exception as exc:
+                # Minimal visibility; back off only on errors
+                print("WARN: listen loop error:", repr(exc))
+                await asyncio.sleep(2)
+                continue
 
-            url = f"https://api.telegram.org/bot{BOT_TOKEN}/getUpdates?" + parse.urlencode(params)
-            resp = request.urlopen(url, timeout=40).read().decode("utf-8")
-            updates = json.loads(resp).get("result", [])
-
+            updates = resp.get("result", [])
+            if not updates and "drain" not in queued:
+                # Idle poll: retry anything left in the send queue.
+                queued.add("drain")
+                queue.put_nowait(("drain", _sender().drain_queue))
             for update in updates:
                 offset = int(update.get("update_id", 0)) + 1
-                _write_offset(offset)
-
                 text = (update.get("message", {}).get("text", "") or "").strip().lower()
-                if not text:
+                cmd = _command_for(text) if text else None
+                if cmd is None:
                     continue
-
-                if text in ("/fire", "/fire@alphaos_firebot"):
-                    send_firemap("daily")
+                key, job = cmd
+                # Identical requests still waiting in the queue collapse into one.
+                if key in queued:
                     continue
+                queued.add(key)
+                queue.put_nowait((key, job))
 
-                if text in ("/fireweek", "/fireweekend", "/fire7", "/fireweek@alphaos_firebot"):
-                    send_firemap("weekly")
-                    continue
+            if updates:
+                await asyncio.to_thread(_write_offset, offset)
+    finally:
+        for task in pool:
+            task.cancel()
+        poll_api.close()
 
-                if text in ("/firehelp", "/help", "/start"):
-                    help_text = (
-                        "<b>AlphaOS Fire Bot</b>\n\n"
-                        "<code>/fire</code> — today (due/scheduled/wait)\n"
-                        "<code>/fireweek</code> — this week (Mon–Sun)\n\n"
-                        "<b>Notes</b>\n"
-                        "- due/scheduled/wait tasks are included regardless of tags\n"
-                        "- undated tasks are included by tags via <code>AOS_FIREMAP_TAGS</code> (default: <code>production,hit,fire</code>)\n"
-                        "- undated mode via <code>AOS_FIREMAP_TAGS_MODE</code> (<code>any</code>/<code>all</code>)\n"
-                        "- include undated in daily via <code>AOS_FIREMAP_INCLUDE_UNDATED_DAILY</code>\n"
-                        "- overdue is sent separately\n\n"
-                        "<b>Debug (terminal)</b>\n"
-                        "<code>firectl doctor</code>\n"
-                        "<code>firectl test --debug --scope daily</code>"
-                    )
-                    send_msg(help_text, prefer_api=True)
-                    continue
 
-                if text.endswith(" done") and text.startswith("#"):
-                    task_id = text.split()[0].replace("#", "")
-                    subprocess.run([TASK_BIN, task_id, "done"], check=False)
-                    send_msg(f"OK: task #{task_id} marked as done.")
-
-        except Exception as exc:
-            # Minimal visibility
-            print("WARN: listen loop error:", repr(exc))
-
-        time.sleep(2)
+def listen_for_done() -> None:
+    if not BOT_TOKEN:
+        print("ERR: AOS_FIREMAP_BOT_TOKEN missing; listen disabled.")
+        return
+    try:
+        asyncio.run(_listen_async())
+    except KeyboardInterrupt:
+        pass
 
 
 def main() -> int:
@@ -374,10 +449,7 @@ def main() -> int:
                 except Exception:
                     print("DEBUG: counts= (failed)")
 
-            ok = True
-            for msg in msgs:
-                ok = send_msg(msg, debug=bool(args.debug)) and ok
-            return 0 if ok else 1
+            return 0 if send_msgs(msgs, debug=bool(args.debug)) else 1
 
         text = str(args.text or "").strip() or f"🧪 Firemap bot test ({dt.datetime.now().isoformat(timespec='seconds')})"
         return 0 if send_msg(text, debug=bool(args.debug)) else 1
@@ -5,24 +5,36 @@ Sends General's Tent Strategic Intelligence to Telegram every Sunday
 """
 
 import os
+import sys
 import asyncio
 from datetime import datetime, timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 from aiogram import Bot, Dispatcher, types
 from aiogram.filters import Command
-import aiohttp
 
 HERE = Path(__file__).resolve().parent
 load_dotenv(HERE / ".env")
 
+# Shared Tent report cache lives in the repo-level lib/ (also used by the Bridge).
+LIB_DIR = str(HERE.parents[2] / "lib")
+if LIB_DIR not in sys.path:
+    sys.path.append(LIB_DIR)
+
+from tent_cache import TentReportCache  # noqa: E402
+
 # Config
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 ALLOWED_USER_ID = int(os.getenv("ALLOWED_USER_ID", "0"))
 INDEX_API_BASE = os.getenv("INDEX_API_BASE", "http://127.0.0.1:8799")
+# Current week: served stale-while-revalidate and precomputed every N seconds
+TENT_CACHE_TTL = int(os.getenv("TENT_CACHE_TTL", "900"))
+TENT_PRECOMPUTE_INTERVAL = int(os.getenv("TENT_PRECOMPUTE_INTERVAL", "900"))
+TENT_FETCH_TIMEOUT = int(os.getenv("TENT_FETCH_TIMEOUT", "10"))
 
 bot = Bot(token=TELEGRAM_BOT_TOKEN)
 dp = Dispatcher()
+tent_cache = TentReportCache(INDEX_API_BASE, ttl=TENT_CACHE_TTL, timeout=TENT_FETCH_TIMEOUT)
 
 
 def get_current_week():
@@ -33,18 +45,8 @@ def get_current_week():
 
 
 async def fetch_tent_data(week: str = None):
-    """Fetch Tent component data from Index Node API"""
-    if not week:
-        week = get_current_week()
-
-    url = f"{INDEX_API_BASE}/api/tent/component/return-report?week={week}"
-
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            if resp.status != 200:
-                raise Exception(f"API returned {resp.status}")
-            data = await resp.json()
-            return data
+    """Fetch Tent component data (shared per-week cache in front of the Index Node API)"""
+    return await tent_cache.get(week or get_current_week())
 
 
 def format_domain_health_line(domain: str, voice_count: int, war_stacks: int, fire_hits: int, core4: int):
@@ -209,9 +211,14 @@ async def main():
 
     # Start weekly report background task
     asyncio.create_task(weekly_report_loop())
+    if TENT_PRECOMPUTE_INTERVAL > 0:
+        asyncio.create_task(tent_cache.precompute_loop(TENT_PRECOMPUTE_INTERVAL))
 
     # Start bot polling
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        await tent_cache.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+"""
+In-process async event bus with coalescing consumers.
+Used by the Bridge for Core4 log side effects (notify, auto-push, TW mirror).
+
+- `publish` never blocks or awaits: the caller (an HTTP handler) returns
+  right after its own work, consumers run on their own tasks
+- each consumer has its own queue; after the first event it waits `window`
+  seconds and then handles everything queued so far in one call
+- `min_interval` spaces consecutive runs (e.g. one push per N seconds);
+  events arriving meanwhile are folded into the next run
+- `flush(urgent=True)` (shutdown) cuts pending window/min_interval waits short
+  so queued side effects still run; `close()` logs whatever is left unhandled
+- per-consumer metrics: queue depth, runs, errors, publish->done lag
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[List[Any]], Awaitable[None]]
+
+
+class Consumer:
+    def __init__(self, name: str, handler: Handler, *, window: float = 0.0, min_interval: float = 0.0):
+        self.name = name
+        self.handler = handler
+        self.window = max(0.0, float(window))
+        self.min_interval = max(0.0, float(min_interval))
+        self.queue: "asyncio.Queue[tuple[float, Any]]" = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+        self.last_run_mono = 0.0
+        self.urgent = asyncio.Event()
+        self.stats: Dict[str, Any] = {
+            "published": 0,
+            "handled": 0,
+            "runs": 0,
+            "errors": 0,
+            "last_error": "",
+            "last_lag_ms": 0.0,
+            "max_lag_ms": 0.0,
+            "total_lag_ms": 0.0,
+            "last_run_at": 0.0,
+        }
+
+    def _drain(self) -> List[tuple[float, Any]]:
+        items = []
+        while True:
+            try:
+                items.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return items
+
+    async def run(self) -> None:
+        while True:
+            first = await self.queue.get()
+            delay = self.window
+            if self.min_interval:
+                delay = max(delay, self.last_run_mono + self.min_interval - time.monotonic())
+            if delay > 0 and not self.urgent.is_set():
+                try:
+                    await asyncio.wait_for(self.urgent.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+            items = [first, *self._drain()]
+            self.last_run_mono = time.monotonic()
+            try:
+                await self.handler([event for _, event in items])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.stats["errors"] += 1
+                self.stats["last_error"] = str(exc)[:200]
+                logger.warning("event bus consumer %s failed: %s", self.name, exc)
+            lag_ms = (time.monotonic() - min(ts for ts, _ in items)) * 1000
+            self.stats["handled"] += len(items)
+            self.stats["runs"] += 1
+            self.stats["last_lag_ms"] = round(lag_ms, 1)
+            self.stats["max_lag_ms"] = round(max(self.stats["max_lag_ms"], lag_ms), 1)
+            self.stats["total_lag_ms"] += lag_ms
+            self.stats["last_run_at"] = time.time()
+
+    def metrics(self) -> Dict[str, Any]:
+        out = dict(self.stats)
+        out["queued"] = self.queue.qsize()
+        out["avg_lag_ms"] = round(out.pop("total_lag_ms") / out["runs"], 1) if out["runs"] else 0.0
+        out["window_s"] = self.window
+        out["min_interval_s"] = self.min_interval
+        out["running"] = self.task is not None and not self.task.done()
+        return out
+
+
+class EventBus:
+    """Topic -> consumers. Consumers start lazily on the first publish inside a running loop."""
+
+    def __init__(self) -> None:
+        self._topics: Dict[str, List[Consumer]] = {}
+
+    def subscribe(
+        self, topic: str, name: str, handler: Handler, *, window: float = 0.0, min_interval: float = 0.0
+    ) -> Consumer:
+        consumer = Consumer(name, handler, window=window, min_interval=min_interval)
+        self._topics.setdefault(topic, []).append(consumer)
+        return consumer
+
+    def consumers(self) -> List[Consumer]:
+        return [c for consumers in self._topics.values() for c in consumers]
+
+    def publish(self, topic: str, event: Any) -> None:
+        now = time.monotonic()
+        for consumer in self._topics.get(topic, []):
+            if consumer.task is None or consumer.task.done():
+                consumer.task = asyncio.get_running_loop().create_task(consumer.run())
+            consumer.queue.put_nowait((now, event))
+            consumer.stats["published"] += 1
+
+    async def flush(self, timeout: float = 30.0, *, urgent: bool = False) -> None:
+        """Wait until every queue is empty and in-flight runs are done (tests, shutdown).
+
+        `urgent` skips the remaining window/min_interval waits (used on shutdown).
+        """
+        if urgent:
+            for consumer in self.consumers():
+                consumer.urgent.set()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            busy = [c for c in self.consumers() if c.queue.qsize() or c.stats["handled"] < c.stats["published"]]
+            if not busy:
+                return
+            await asyncio.sleep(0.01)
+
+    async def close(self) -> None:
+        for consumer in self.consumers():
+            dropped = consumer.stats["published"] - consumer.stats["handled"]
+            if dropped:
+                logger.warning("event bus consumer %s closed with %d unhandled events", consumer.name, dropped)
+            if consumer.task is None:
+                continue
+            consumer.task.cancel()
+            try:
+                await consumer.task
+            except asyncio.CancelledError:
+                pass
+            consumer.task = None
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {c.name: c.metrics() for c in self.consumers()}
@@ -0,0 +1,182 @@
+"""
+Shared per-week cache for the Index Node Tent `return-report`.
+Used by the Tent bot (game/tent/bot/tent_bot.py) and the Bridge.
+
+- closed weeks (before the current ISO week) are immutable: fetched once,
+  then served from disk forever
+- the current week is served stale-while-revalidate (`ttl` seconds) and can
+  be precomputed on a schedule (`precompute_loop`)
+- entries live in `cache_dir/<week>.json`, so every process shares them
+- concurrent misses for a week share one request; one aiohttp session
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(
+    os.getenv("AOS_TENT_CACHE_DIR", Path.home() / ".cache" / "alphaos" / "tent")
+).expanduser()
+
+
+class TentFetchError(RuntimeError):
+    pass
+
+
+def current_week(now: Optional[datetime] = None) -> str:
+    iso = (now or datetime.now()).isocalendar()
+    return f"{iso[0]}-W{iso[1]:02d}"
+
+
+def _week_key(week: str) -> tuple:
+    try:
+        year, num = week.upper().split("-W", 1)
+        return int(year), int(num)
+    except ValueError:
+        return (0, 0)
+
+
+def is_closed(week: str, now: Optional[datetime] = None) -> bool:
+    key = _week_key(week)
+    return key != (0, 0) and key < _week_key(current_week(now))
+
+
+class TentReportCache:
+    def __init__(
+        self,
+        index_base: str,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        ttl: float = 900.0,
+        timeout: float = 10.0,
+    ):
+        self.index_base = index_base.rstrip("/")
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.timeout = timeout
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    # -- public API ---------------------------------------------------------
+
+    async def get(self, week: Optional[str] = None) -> Dict[str, Any]:
+        """Report for `week` (default: current). Raises TentFetchError/TimeoutError on a cold miss."""
+        week = week or current_week()
+        entry = await self._entry(week)
+        if entry is not None:
+            if entry.get("closed"):
+                return entry["data"]
+            if not is_closed(week):
+                if time.time() - entry["fetched_at"] >= self.ttl:
+                    # Stale current week: answer now, refresh in the background.
+                    self._refresh_task(week)
+                return entry["data"]
+            # Fetched while the week was still running: take the final report once.
+            try:
+                return await asyncio.shield(self._refresh_task(week))
+            except Exception:
+                return entry["data"]
+        return await asyncio.shield(self._refresh_task(week))
+
+    async def ensure_fresh(self, week: Optional[str] = None) -> None:
+        """Refresh `week` if its entry is missing or older than `ttl` (any process)."""
+        week = week or current_week()
+        entry = await self._entry(week)
+        if entry is not None and (entry.get("closed") or time.time() - entry["fetched_at"] < self.ttl):
+            return
+        await asyncio.shield(self._refresh_task(week))
+
+    async def precompute_loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.ensure_fresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Tent precompute failed: %s", exc)
+            await asyncio.sleep(interval)
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    # -- internals ----------------------------------------------------------
+
+    def _path(self, week: str) -> Path:
+        safe = "".join(c for c in week if c.isalnum() or c == "-")
+        return self.cache_dir / f"{safe}.json"
+
+    async def _entry(self, week: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(week)
+        if entry is not None and (entry.get("closed") or time.time() - entry["fetched_at"] < self.ttl):
+            return entry
+        # Another process may have refreshed it meanwhile.
+        disk = await asyncio.to_thread(self._read, week)
+        if disk is not None and (entry is None or disk["fetched_at"] > entry["fetched_at"]):
+            self._entries[week] = disk
+            return disk
+        return entry
+
+    def _read(self, week: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(week), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or "data" not in entry:
+            return None
+        entry["fetched_at"] = float(entry.get("fetched_at") or 0)
+        return entry
+
+    def _write(self, week: str, entry: Dict[str, Any]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(week)
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def _refresh_task(self, week: str) -> asyncio.Task:
+        task = self._inflight.get(week)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(week))
+            self._inflight[week] = task
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def _refresh(self, week: str) -> Dict[str, Any]:
+        try:
+            # Closed-ness is decided before the fetch so a report taken while
+            # the week was still running is never frozen.
+            closed = is_closed(week)
+            data = await self._fetch(week)
+            entry = {"week": week, "fetched_at": time.time(), "closed": closed, "data": data}
+            self._entries[week] = entry
+            try:
+                await asyncio.to_thread(self._write, week, entry)
+            except OSError as exc:
+                logger.warning("Tent cache write failed: %s", exc)
+            return data
+        finally:
+            self._inflight.pop(week, None)
+
+    async def _fetch(self, week: str) -> Dict[str, Any]:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        url = f"{self.index_base}/api/tent/component/return-report"
+        async with self._session.get(
+            url, params={"week": week}, timeout=aiohttp.ClientTimeout(total=self.timeout)
+        ) as resp:
+            if resp.status != 200:
+                raise TentFetchError(f"Index Node returned {resp.status}")
+            return await resp.json()
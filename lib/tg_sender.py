@@ -0,0 +1,367 @@
+"""
+Shared outbound Telegram sender (stdlib only, thread-safe).
+Used by the Fire Map bot (game/fire/firemap_bot.py) and the Bridge.
+
+- one keep-alive HTTPS connection per TelegramApi
+- global + per-chat token buckets (Bot API: ~30 msg/s overall, ~1 msg/s per chat)
+- small messages are merged up to the 4096-char limit before sending
+  (counted in UTF-16 units like Telegram, so emoji count double)
+- 429 responses are retried after `parameters.retry_after`
+- messages that still fail are kept in a JSON retry queue on disk
+"""
+
+import http.client
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib import parse
+
+TG_LIMIT = 4096
+
+
+class TelegramApiError(RuntimeError):
+    def __init__(self, method: str, status: int, description: str = "", retry_after: float = 0.0):
+        super().__init__(f"{method}: HTTP {status} {description}".strip())
+        self.status = status
+        self.description = description
+        self.retry_after = retry_after
+
+
+class TelegramApi:
+    """Minimal Bot API client on one keep-alive HTTPS connection."""
+
+    HOST = "api.telegram.org"
+
+    def __init__(self, token: str, timeout: float = 10.0):
+        self.token = token
+        self.timeout = timeout
+        self._conn: Optional[http.client.HTTPSConnection] = None
+        self._lock = threading.Lock()
+
+    def _reset(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = None
+
+    def call(self, method: str, params: Dict[str, Any], *, timeout: Optional[float] = None) -> Dict[str, Any]:
+        body = parse.urlencode(params).encode("utf-8")
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        wait = timeout if timeout is not None else self.timeout
+        with self._lock:
+            for attempt in (1, 2):
+                reused = self._conn is not None
+                if self._conn is None:
+                    self._conn = http.client.HTTPSConnection(self.HOST, timeout=wait)
+                conn = self._conn
+                try:
+                    if conn.sock is not None:
+                        conn.sock.settimeout(wait)
+                    conn.request("POST", f"/bot{self.token}/{method}", body=body, headers=headers)
+                    resp = conn.getresponse()
+                    raw = resp.read()
+                except (http.client.HTTPException, OSError):
+                    self._reset()
+                    # A stale keep-alive socket gets one retry on a fresh connection.
+                    if reused and attempt == 1:
+                        continue
+                    raise
+                if resp.will_close:
+                    self._reset()
+                try:
+                    data = json.loads(raw.decode("utf-8", errors="ignore") or "{}")
+                except ValueError:
+                    data = {}
+                if not data.get("ok"):
+                    params_ = data.get("parameters") or {}
+                    raise TelegramApiError(
+                        method,
+                        int(data.get("error_code") or resp.status),
+                        str(data.get("description") or ""),
+                        float(params_.get("retry_after") or 0),
+                    )
+                return data
+        raise TelegramApiError(method, 0, "no response")
+
+    def close(self) -> None:
+        with self._lock:
+            self._reset()
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token; returns how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def penalize(self, seconds: float) -> None:
+        """Block the bucket for `seconds` (429 retry_after)."""
+        with self._lock:
+            # Leaves exactly `seconds` until the next reserve() is allowed through.
+            self.tokens = min(self.tokens, 1 - seconds * self.rate)
+            self.updated = time.monotonic()
+
+
+def tg_len(text: str) -> int:
+    """Length as Telegram counts it (UTF-16 code units)."""
+    return len(text) + sum(1 for ch in text if ord(ch) > 0xFFFF)
+
+
+def _fit(text: str, limit: int) -> int:
+    """Number of leading characters of `text` that fit into `limit` UTF-16 units."""
+    units = 0
+    for i, ch in enumerate(text):
+        units += 2 if ord(ch) > 0xFFFF else 1
+        if units > limit:
+            return i
+    return len(text)
+
+
+def merge_texts(texts: List[str], limit: int = TG_LIMIT, sep: str = "\n\n") -> List[str]:
+    """Greedily join consecutive texts while the result stays within `limit`."""
+    out: List[str] = []
+    for text in texts:
+        text = (text or "").strip()
+        if not text:
+            continue
+        if out and tg_len(out[-1]) + len(sep) + tg_len(text) <= limit:
+            out[-1] = out[-1] + sep + text
+        else:
+            out.append(text)
+    return out
+
+
+def split_text(text: str, limit: int = TG_LIMIT) -> List[str]:
+    """Split plain text on line boundaries so every part fits `limit`."""
+    text = (text or "").strip()
+    parts: List[str] = []
+    while tg_len(text) > limit:
+        end = _fit(text, limit)
+        cut = text.rfind("\n", 0, end)
+        if cut <= 0:
+            cut = end
+        parts.append(text[:cut].rstrip())
+        text = text[cut:].lstrip("\n")
+    if text:
+        parts.append(text)
+    return parts
+
+
+class TelegramSender:
+    """Rate-limited fan-out sender with a persistent retry queue."""
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        queue_path: Optional[Path] = None,
+        global_rate: float = 25.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        max_attempts: int = 5,
+        max_queue_attempts: int = 20,
+        log: Callable[[str], None] = lambda msg: None,
+    ):
+        self.api = TelegramApi(token)
+        self.queue_path = queue_path
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_attempts = max_attempts
+        self.max_queue_attempts = max_queue_attempts
+        self.log = log
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        self._queue_lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0, "queued": 0, "failed": 0}
+
+    def _bucket(self, chat_id: str) -> TokenBucket:
+        with self._buckets_lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                bucket = TokenBucket(self.chat_rate, self.chat_burst)
+                self._chat_buckets[chat_id] = bucket
+            return bucket
+
+    def _post(self, chat_id: str, text: str, parse_mode: str = "", silent: bool = False) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"chat_id": chat_id, "text": text}
+        if parse_mode:
+            params["parse_mode"] = parse_mode
+        if silent:
+            params["disable_notification"] = "true"
+        bucket = self._bucket(chat_id)
+        for attempt in range(1, self.max_attempts + 1):
+            wait = max(bucket.reserve(), self.global_bucket.reserve())
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                self.stats["requests"] += 1
+                return self.api.call("sendMessage", params)
+            except TelegramApiError as exc:
+                if exc.status == 429 and attempt < self.max_attempts:
+                    self.stats["throttled"] += 1
+                    retry_after = exc.retry_after or 1.0
+                    bucket.penalize(retry_after)
+                    self.log(f"telegram 429 chat={chat_id}; retry after {retry_after}s")
+                    continue
+                raise
+        raise TelegramApiError("sendMessage", 0, "retries exhausted")
+
+    def _send_chat(self, chat_id: str, texts: List[str], parse_mode: str, silent: bool) -> bool:
+        ok = True
+        for idx, text in enumerate(texts):
+            try:
+                self._post(chat_id, text, parse_mode, silent)
+            except TelegramApiError as exc:
+                if 400 <= exc.status < 500 and exc.status != 429:
+                    # Permanent (bad request / blocked): retrying will not help.
+                    self.stats["failed"] += 1
+                    self.log(f"telegram send failed chat={chat_id}: {exc}")
+                    ok = False
+                    continue
+                self._enqueue(chat_id, texts[idx:], parse_mode, silent, str(exc))
+                return False
+            except (http.client.HTTPException, OSError) as exc:
+                self._enqueue(chat_id, texts[idx:], parse_mode, silent, repr(exc))
+                return False
+        return ok
+
+    def send_many(
+        self,
+        chat_ids: List[str],
+        texts: List[str],
+        *,
+        parse_mode: str = "",
+        silent: bool = False,
+        merge: bool = True,
+        limit: int = TG_LIMIT,
+    ) -> bool:
+        """Send `texts` (in order) to every chat; chats are served in parallel.
+
+        Texts must already be <= `limit` each; with `merge`, consecutive texts
+        are packed into as few messages as possible without exceeding it.
+        """
+        self.drain_queue()
+        texts = merge_texts(texts, limit) if merge else [t for t in texts if t]
+        targets = [str(c) for c in chat_ids if str(c).strip()]
+        if not texts:
+            return True
+        if not targets:
+            return False
+        if len(targets) == 1:
+            return self._send_chat(targets[0], texts, parse_mode, silent)
+        with ThreadPoolExecutor(max_workers=min(8, len(targets))) as pool:
+            results = list(pool.map(lambda cid: self._send_chat(cid, texts, parse_mode, silent), targets))
+        return all(results)
+
+    # -- persistent retry queue ---------------------------------------------
+
+    def _read_queue(self) -> List[Dict[str, Any]]:
+        if not self.queue_path:
+            return []
+        try:
+            data = json.loads(self.queue_path.read_text(encoding="utf-8"))
+            return data if isinstance(data, list) else []
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError):
+            return []
+
+    def _write_queue(self, items: List[Dict[str, Any]]) -> None:
+        if not self.queue_path:
+            return
+        if not items:
+            try:
+                self.queue_path.unlink()
+            except FileNotFoundError:
+                pass
+            return
+        self.queue_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.queue_path.with_suffix(self.queue_path.suffix + ".tmp")
+        tmp.write_text(json.dumps(items, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.queue_path)
+
+    def _enqueue(self, chat_id: str, texts: List[str], parse_mode: str, silent: bool, error: str) -> None:
+        self.log(f"telegram send deferred chat={chat_id} ({len(texts)} msg): {error}")
+        if not self.queue_path:
+            self.stats["failed"] += len(texts)
+            return
+        with self._queue_lock:
+            items = self._read_queue()
+            for text in texts:
+                items.append(
+                    {
+                        "chat_id": chat_id,
+                        "text": text,
+                        "parse_mode": parse_mode,
+                        "silent": silent,
+                        "attempts": 1,
+                        "next_at": time.time() + 30,
+                        "error": error,
+                    }
+                )
+            self._write_queue(items)
+        self.stats["queued"] += len(texts)
+
+    def pending(self) -> int:
+        with self._queue_lock:
+            return len(self._read_queue())
+
+    def drain_queue(self) -> int:
+        """Retry due queued messages (oldest first, per-chat order kept). Returns sent count."""
+        if not self.queue_path:
+            return 0
+        with self._queue_lock:
+            items = self._read_queue()
+            if not items:
+                return 0
+            now = time.time()
+            sent = 0
+            keep: List[Dict[str, Any]] = []
+            blocked: set = set()
+            for item in items:
+                chat_id = str(item.get("chat_id") or "")
+                if chat_id in blocked or float(item.get("next_at") or 0) > now:
+                    blocked.add(chat_id)
+                    keep.append(item)
+                    continue
+                try:
+                    self._post(chat_id, str(item.get("text") or ""), item.get("parse_mode") or "", bool(item.get("silent")))
+                    sent += 1
+                    continue
+                except TelegramApiError as exc:
+                    if 400 <= exc.status < 500 and exc.status != 429:
+                        self.stats["failed"] += 1
+                        continue
+                    item["error"] = str(exc)
+                except (http.client.HTTPException, OSError) as exc:
+                    item["error"] = repr(exc)
+                item["attempts"] = int(item.get("attempts") or 0) + 1
+                if item["attempts"] >= self.max_queue_attempts:
+                    self.stats["failed"] += 1
+                    self.log(f"telegram queue drop chat={chat_id}: {item['error']}")
+                    continue
+                item["next_at"] = now + min(30 * 2 ** item["attempts"], 3600)
+                blocked.add(chat_id)
+                keep.append(item)
+            self._write_queue(keep)
+            return sent
+
+    def close(self) -> None:
+        self.api.close()
@@ -11,14 +11,20 @@ For each TickTick task:
 3. Add entry to hotlist_index.json with UUID
 
 Usage:
-    ticktick_hotlist_sync.py --sync     # Sync TickTick → .md + Taskwarrior + JSON
-    ticktick_hotlist_sync.py --status   # Show current status
+    ticktick_hotlist_sync.py --sync                 # Sync TickTick → .md + Taskwarrior + JSON
+    ticktick_hotlist_sync.py --sync --incremental   # Only tasks modified since last run
+    ticktick_hotlist_sync.py --status               # Show current status
+
+Incremental mode persists a modifiedTime high-water mark in STATE_PATH and
+skips everything at or below it. New ideas are created in Taskwarrior with one
+batched `task import`, markdown files are written through a thread pool.
 
 Environment:
     TICKTICK_TOKEN               # TickTick API token
     HOT_TICKTICK_PROJECT_ID      # TickTick project ID (default: inbox)
     HOT_TICKTICK_TAG             # TickTick tag to filter (default: hot)
     ALPHAOS_VAULT                # AlphaOS Vault path (default: ~/vault)
+    HOT_SYNC_WORKERS             # Markdown writer threads (default: 8)
 """
 
 from __future__ import annotations
@@ -30,14 +36,17 @@ import re
 import secrets
 import subprocess
 import sys
-from datetime import datetime
+import uuid as uuidlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.request import Request, urlopen
 
 
 BASE_URL = "https://api.ticktick.com/open/v1"
 LOG_PATH = Path.home() / ".local" / "share" / "alphaos" / "logs" / "ticktick_hotlist.log"
+STATE_PATH = Path.home() / ".local" / "share" / "alphaos" / "ticktick_hotlist_state.json"
 HOT_PROJECT = "HotList"
 
 
@@ -133,6 +142,45 @@ def ticktick_fetch_tasks() -> List[Dict]:
     return data if isinstance(data, list) else []
 
 
+def parse_modified(value: Optional[str]) -> Optional[datetime]:
+    """Parse TickTick modifiedTime (e.g. 2024-01-31T10:00:00.000+0000)."""
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def load_state() -> Dict:
+    """Load incremental sync state (modifiedTime high-water mark)."""
+    if not STATE_PATH.exists():
+        return {}
+    try:
+        data = json.loads(STATE_PATH.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except Exception as e:
+        log_line(f"Load sync state failed: {e}")
+        return {}
+
+
+def save_state(state: Dict) -> None:
+    """Persist incremental sync state atomically."""
+    try:
+        STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = STATE_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        tmp.replace(STATE_PATH)
+    except Exception as e:
+        log_line(f"Save sync state failed: {e}")
+
+
 def load_hotlist_json() -> Dict:
     """Load existing hotlist_index.json."""
     path = hotlist_json_path()
@@ -201,51 +249,66 @@ tw_uuid: {tw_uuid}
     return file_path
 
 
-def create_taskwarrior_task(idea: str) -> Optional[str]:
-    """Create Taskwarrior task and return UUID."""
-    try:
-        # Add task to Taskwarrior
-        cmd = [
-            "task", "add",
-            f"project:{HOT_PROJECT}",
-            "prio:L",
-            "+hot",
-            "+potential",
-            idea
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+def _tw_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 
-        # Extract task ID from output (e.g., "Created task 123.")
-        match = re.search(r'Created task (\d+)', result.stdout)
-        if not match:
-            log_line(f"Could not extract task ID from: {result.stdout}")
-            return None
 
-        task_id = match.group(1)
+def create_taskwarrior_tasks(ideas: List[str]) -> List[Optional[str]]:
+    """
+    Create Taskwarrior tasks for all ideas with a single `task import`.
 
-        # Get UUID using task _get
-        uuid_result = subprocess.run(
-            ["task", "_get", f"{task_id}.uuid"],
+    UUIDs are assigned up front, so no `task _get` round-trip is needed.
+    Returns one UUID per idea (None for every idea if the import failed).
+    """
+    if not ideas:
+        return []
+    entry = _tw_now()
+    records = [
+        {
+            "uuid": str(uuidlib.uuid4()),
+            "description": idea,
+            "project": HOT_PROJECT,
+            "priority": "L",
+            "tags": ["hot", "potential"],
+            "status": "pending",
+            "entry": entry,
+        }
+        for idea in ideas
+    ]
+    try:
+        subprocess.run(
+            ["task", "rc.verbose=0", "rc.confirmation=no", "import", "-"],
+            input=json.dumps(records),
             capture_output=True,
             text=True,
-            check=True
+            check=True,
         )
-        uuid = uuid_result.stdout.strip()
+    except subprocess.CalledProcessError as e:
+        log_line(f"Taskwarrior import failed: {e.stderr.strip() if e.stderr else e}")
+        return [None] * len(ideas)
+    except Exception as e:
+        log_line(f"Unexpected error importing Taskwarrior tasks: {e}")
+        return [None] * len(ideas)
+    log_line(f"Imported {len(records)} Taskwarrior tasks")
+    return [r["uuid"] for r in records]
 
-        if uuid:
-            log_line(f"Created Taskwarrior task {task_id} with UUID {uuid}")
-            return uuid
-        return None
 
-    except subprocess.CalledProcessError as e:
-        log_line(f"Taskwarrior add failed: {e}")
-        return None
+def sync_workers() -> int:
+    try:
+        return max(1, int(os.getenv("HOT_SYNC_WORKERS", "8")))
+    except ValueError:
+        return 8
+
+
+def _write_markdown(job: Tuple[str, str, str]) -> Tuple[Optional[Path], Optional[str]]:
+    title, ticktick_id, tw_uuid = job
+    try:
+        return create_markdown_file(title, ticktick_id, tw_uuid), None
     except Exception as e:
-        log_line(f"Unexpected error creating Taskwarrior task: {e}")
-        return None
+        return None, str(e)
 
 
-def sync_ticktick_to_hotlist() -> Dict:
+def sync_ticktick_to_hotlist(incremental: bool = False) -> Dict:
     """
     Sync TickTick tasks to Hot List.
 
@@ -254,23 +317,41 @@ def sync_ticktick_to_hotlist() -> Dict:
     2. Create Taskwarrior task → get UUID
     3. Add entry to hotlist_index.json with UUID
 
-    Avoids duplicates by checking ticktick_id.
+    Avoids duplicates by checking ticktick_id. With incremental=True only
+    tasks modified after the stored high-water mark are considered.
     """
     filter_tag = ticktick_filter_tag()
+    state = load_state() if incremental else {}
+    watermark = parse_modified(state.get("modified_hwm")) if incremental else None
 
     # Fetch tasks from TickTick
     all_tasks = ticktick_fetch_tasks()
     log_line(f"Fetched {len(all_tasks)} tasks from TickTick project {ticktick_project_id()}")
 
+    # The Open API has no server-side "modified since" filter; drop unchanged
+    # tasks before any per-item work happens.
+    newest = watermark
+    candidates = all_tasks
+    if incremental:
+        candidates = []
+        for t in all_tasks:
+            modified = parse_modified(t.get("modifiedTime"))
+            if modified and watermark and modified <= watermark:
+                continue
+            if modified and (newest is None or modified > newest):
+                newest = modified
+            candidates.append(t)
+        log_line(f"Incremental: {len(candidates)} tasks changed since {state.get('modified_hwm') or 'start'}")
+
     # Filter by tag if specified
     if filter_tag:
         filtered = [
-            t for t in all_tasks
+            t for t in candidates
             if filter_tag in [tag.lower() for tag in t.get("tags", [])]
         ]
         log_line(f"Filtered to {len(filtered)} tasks with tag '{filter_tag}'")
     else:
-        filtered = all_tasks
+        filtered = candidates
 
     # Load existing hotlist
     hotlist = load_hotlist_json()
@@ -283,10 +364,10 @@ def sync_ticktick_to_hotlist() -> Dict:
         if item.get("ticktick_id")
     }
 
-    # Process each new task
-    added = 0
+    # Collect new tasks first, then create them in bulk
     skipped = 0
     failed = 0
+    pending: List[Tuple[str, str]] = []
 
     for task in filtered:
         ticktick_id = task.get("id", "")
@@ -300,41 +381,58 @@ def sync_ticktick_to_hotlist() -> Dict:
             skipped += 1
             continue
 
-        # Create Taskwarrior task
-        tw_uuid = create_taskwarrior_task(title)
+        pending.append((ticktick_id, title))
+        existing_ids.add(ticktick_id)
+
+    # Create Taskwarrior tasks (one import)
+    uuids = create_taskwarrior_tasks([title for _, title in pending])
+    jobs: List[Tuple[str, str, str]] = []
+    for (ticktick_id, title), tw_uuid in zip(pending, uuids):
         if not tw_uuid:
             log_line(f"Skipping '{title}' - Taskwarrior failed")
             failed += 1
             continue
+        jobs.append((title, ticktick_id, tw_uuid))
 
-        # Create markdown file
-        try:
-            md_file = create_markdown_file(title, ticktick_id, tw_uuid)
-        except Exception as e:
-            log_line(f"Markdown creation failed for '{title}': {e}")
-            failed += 1
-            continue
-
-        # Add to JSON
-        iso = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
-        entry = {
-            "idea": title,
-            "created": iso,
-            "file": str(md_file),
-            "ticktick_id": ticktick_id,
-            "tw_uuid": tw_uuid,
-            "status": "active",
-            "quadrant": 2,
-            "tags": ["hot", "potential"]
-        }
-
-        items.append(entry)
-        existing_ids.add(ticktick_id)
-        added += 1
+    # Create markdown files (thread pool; results keep input order)
+    added = 0
+    if jobs:
+        hot_dir().mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=min(sync_workers(), len(jobs))) as pool:
+            results = list(pool.map(_write_markdown, jobs))
+        for (title, ticktick_id, tw_uuid), (md_file, error) in zip(jobs, results):
+            if md_file is None:
+                log_line(f"Markdown creation failed for '{title}': {error}")
+                failed += 1
+                continue
+
+            # Add to JSON
+            iso = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+            entry = {
+                "idea": title,
+                "created": iso,
+                "file": str(md_file),
+                "ticktick_id": ticktick_id,
+                "tw_uuid": tw_uuid,
+                "status": "active",
+                "quadrant": 2,
+                "tags": ["hot", "potential"]
+            }
+
+            items.append(entry)
+            added += 1
 
     # Save updated JSON
     hotlist["items"] = items
-    save_hotlist_json(hotlist)
+    if added or not incremental:
+        save_hotlist_json(hotlist)
+
+    # Only advance the high-water mark when everything landed, so failed
+    # items are retried on the next run (ticktick_id dedupe covers the rest).
+    if incremental and all_tasks and not failed and newest and newest != watermark:
+        state["modified_hwm"] = newest.strftime("%Y-%m-%dT%H:%M:%S.%f%z")
+        state["updated_at"] = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+        save_state(state)
 
     log_line(f"Sync complete: {added} added, {skipped} skipped, {failed} failed")
 
@@ -371,6 +469,7 @@ def show_status() -> None:
     print(f"  Project ID: {ticktick_project_id()}")
     print(f"  Filter tag: {ticktick_filter_tag()}")
     print(f"  Token: {'SET' if ticktick_token() else 'MISSING'}")
+    print(f"  Incremental HWM: {load_state().get('modified_hwm') or '-'}")
 
 
 def main():
@@ -382,6 +481,11 @@ def main():
         action="store_true",
         help="Sync TickTick → .md files + Taskwarrior + hotlist_index.json"
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="With --sync: only process tasks modified since the last run"
+    )
     parser.add_argument(
         "--status",
         action="store_true",
@@ -393,7 +497,7 @@ def main():
     if args.sync:
         print("🔄 Syncing TickTick → Hot List...")
         print("   (creates .md files + Taskwarrior tasks + JSON entries)")
-        result = sync_ticktick_to_hotlist()
+        result = sync_ticktick_to_hotlist(incremental=args.incremental)
         print(f"\n✅ Sync complete!")
         print(f"   Fetched: {result['fetched']}")
         print(f"   Filtered: {result['filtered']}")
@@ -6,18 +6,20 @@ TickTick sync helper for Core4 (add + get + gemini match).
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import subprocess
 import sys
 from datetime import datetime, time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.request import Request, urlopen
 
 
 BASE_URL = "https://api.ticktick.com/open/v1"
 LOG_PATH = Path.home() / ".local" / "share" / "alphaos" / "logs" / "core4_ticktick.log"
+GEMINI_CACHE_PATH = Path.home() / ".local" / "share" / "alphaos" / "core4_gemini_cache.json"
 
 SUBTASKS = [
     "fitness",
@@ -146,18 +148,51 @@ def task_export(filters: List[str]) -> List[Dict]:
         return []
 
 
-def task_done(uuid: str) -> None:
-    if not uuid:
-        return
+def task_done(uuid: str) -> bool:
+    return tasks_done([uuid])
+
+
+def tasks_done(uuids: List[str]) -> bool:
+    """Mark all uuids done in one `task <uuid1> <uuid2> ... done`; False when the command failed."""
+    uuids = [u for u in dict.fromkeys(uuids) if u]
+    if not uuids:
+        return True
+    cmd = ["task", "rc.verbose=0", "rc.confirmation=no", "rc.bulk=0"] + uuids + ["done"]
     try:
-        subprocess.run(["task", uuid, "done"], check=True, stdout=subprocess.DEVNULL)
-    except Exception:
-        return
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+    except Exception as exc:
+        log_line(f"task done failed for {len(uuids)} task(s): {exc}")
+        return False
+    return True
+
 
+def core4_today_index() -> Tuple[List[Dict], Dict[str, Dict]]:
+    """
+    Single export of today's pending Core4 tasks.
 
-def pending_core4_today() -> List[Dict]:
-    # Core4 tasks are identified by the date-tag (core4_YYYYMMDD).
-    return task_export([f"+{today_core4_tag()}", "status:pending"])
+    Returns (date-tagged pending tasks, first pending task per subtask tag).
+    Date-tag tasks win over legacy `+core4 due:today` tasks for the same subtask.
+    """
+    tag = today_core4_tag()
+    tasks = task_export(
+        ["status:pending", "(", f"+{tag}", "or", "(", "+core4", "due:today", ")", ")"]
+    )
+    pending: List[Dict] = []
+    by_subtask: Dict[str, Dict] = {}
+    legacy: Dict[str, Dict] = {}
+    for task in tasks:
+        tags = [str(t) for t in task.get("tags", [])]
+        dated = tag in tags
+        if dated:
+            pending.append(task)
+        subtask = subtask_from_tags(tags)
+        if not subtask:
+            continue
+        target = by_subtask if dated else legacy
+        target.setdefault(subtask, task)
+    for subtask, task in legacy.items():
+        by_subtask.setdefault(subtask, task)
+    return pending, by_subtask
 
 
 def completed_core4_today() -> List[Dict]:
@@ -197,9 +232,54 @@ def gemini_enabled(force: bool) -> bool:
     )
 
 
+def gemini_cache_enabled() -> bool:
+    return os.getenv("CORE4_GEMINI_CACHE", "1") == "1"
+
+
+_GEMINI_CACHE: Optional[Dict[str, str]] = None
+
+
+def _gemini_cache() -> Dict[str, str]:
+    global _GEMINI_CACHE
+    if _GEMINI_CACHE is None:
+        _GEMINI_CACHE = {}
+        if gemini_cache_enabled() and GEMINI_CACHE_PATH.exists():
+            try:
+                data = json.loads(GEMINI_CACHE_PATH.read_text(encoding="utf-8"))
+                if isinstance(data, dict):
+                    _GEMINI_CACHE = {str(k): str(v) for k, v in data.items()}
+            except Exception:
+                pass
+    return _GEMINI_CACHE
+
+
+def _save_gemini_cache() -> None:
+    if not gemini_cache_enabled() or _GEMINI_CACHE is None:
+        return
+    try:
+        GEMINI_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = GEMINI_CACHE_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(_GEMINI_CACHE, indent=2), encoding="utf-8")
+        tmp.replace(GEMINI_CACHE_PATH)
+    except Exception:
+        return
+
+
+def _title_hash(title: str) -> str:
+    norm = " ".join(title.lower().split())
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()
+
+
 def classify_subtask_gemini(title: str, force: bool) -> Optional[str]:
     if not gemini_enabled(force):
         return None
+    # Memoized by title hash; "none" is cached too so no-fit titles stay cheap.
+    cache = _gemini_cache()
+    key = _title_hash(title)
+    if key in cache:
+        hit = cache[key]
+        return hit if hit in SUBTASKS else None
+
     try:
         import google.generativeai as genai
     except Exception:
@@ -220,9 +300,10 @@ def classify_subtask_gemini(title: str, force: bool) -> Optional[str]:
         text = (resp.text or "").strip().lower()
     except Exception:
         return None
-    if text in SUBTASKS:
-        return text
-    return None
+    result = text if text in SUBTASKS else None
+    cache[key] = result or "none"
+    _save_gemini_cache()
+    return result
 
 
 def subtask_from_tags(tags: List[str]) -> Optional[str]:
@@ -297,25 +378,21 @@ def handle_sync(use_gemini: bool, send_tele_flag: bool, status_flag: bool) -> in
     tasks = ticktick_fetch_tasks()
     tasks_by_id = {t.get("id"): t for t in tasks if t.get("id")}
 
-    updated = 0
-    # Legacy matcher (by subtask tag) is best-effort; Core4 tasks may not carry subtask tags anymore.
-    pending_by_subtask = {}
-    for subtask in SUBTASKS:
-        # Prefer date-tag identification; keep legacy +core4 matching as fallback.
-        tw = task_export([f"+{today_core4_tag()}", f"+{subtask}", "status:pending"])
-        if not tw:
-            tw = task_export([f"+core4", f"+{subtask}", "due:today", "status:pending"])
-        if tw:
-            pending_by_subtask[subtask] = tw[0]
+    # One export for the whole run; legacy +core4 due:today tasks are folded in
+    # as fallback per subtask (Core4 tasks may not carry subtask tags anymore).
+    pending, pending_by_subtask = core4_today_index()
+    # Only tasks that are still open: mapped uuids completed by an earlier run
+    # would make `task ... done` exit 1 for the whole batch.
+    open_uuids = {t.get("uuid") for t in [*pending, *pending_by_subtask.values()] if t.get("uuid")}
+    to_complete: List[str] = []
 
     for tw_uuid, info in mapping.items():
         tick_id = info.get("ticktick_id")
         tt = tasks_by_id.get(tick_id)
         if not tt:
             continue
-        if tt.get("status") == 2 and parse_completed_today(tt):
-            task_done(tw_uuid)
-            updated += 1
+        if tt.get("status") == 2 and parse_completed_today(tt) and tw_uuid in open_uuids:
+            to_complete.append(tw_uuid)
             log_line(f"sync: completed {tw_uuid} via ticktick {tick_id}")
 
     for tt in tasks:
@@ -332,11 +409,18 @@ def handle_sync(use_gemini: bool, send_tele_flag: bool, status_flag: bool) -> in
             continue
         tw_task = pending_by_subtask.get(subtask)
         if tw_task:
-            task_done(tw_task.get("uuid", ""))
-            updated += 1
+            to_complete.append(tw_task.get("uuid", ""))
             log_line(f"match: completed {tw_task.get('uuid','')} via {subtask}")
 
-    pending = pending_core4_today()
+    completed = {u for u in to_complete if u}
+    if not tasks_done(to_complete):
+        # Partial failure: trust Taskwarrior's view of what is still pending.
+        pending, pending_by_subtask = core4_today_index()
+        still_open = {t.get("uuid") for t in [*pending, *pending_by_subtask.values()]}
+        completed -= still_open
+    updated = len(completed)
+
+    pending = [p for p in pending if p.get("uuid") not in completed]
     pending_titles = [p.get("description", "Core4") for p in pending]
 
     if send_tele_flag and pending_titles:
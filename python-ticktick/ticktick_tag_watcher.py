@@ -2,12 +2,31 @@
 """
 Watch TickTick tasks for tag changes (#potential → #plan → #production → #profit).
 Triggers door_lifecycle.sh for file moves and automation.
+
+Usage:
+    ticktick_tag_watcher.py            # one-shot (cron/timer)
+    ticktick_tag_watcher.py --daemon   # long-running poller
+
+Daemon mode keeps the tag cache in memory, polls fast after recent activity
+and slows down when idle, writes CACHE_FILE only when it changed, and runs
+door_lifecycle.sh through a bounded async subprocess pool. Transitions for
+the same task always run in detection order.
+
+Environment (daemon):
+    TAG_WATCHER_FAST_INTERVAL     # seconds between polls when active (default: 5)
+    TAG_WATCHER_SLOW_INTERVAL     # seconds between polls when idle (default: 60)
+    TAG_WATCHER_ACTIVE_WINDOW     # seconds a change keeps polling fast (default: 300)
+    TAG_WATCHER_MAX_JOBS          # concurrent lifecycle runs (default: 4)
 """
 
+import argparse
+import asyncio
 import json
 import os
+import signal
 import subprocess
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from urllib.request import Request, urlopen
@@ -110,15 +129,22 @@ def detect_transitions(old_cache: dict, new_tasks: list) -> list:
 
     return transitions
 
-def trigger_lifecycle(transition: dict):
-    """Call door_lifecycle.sh to handle transition"""
+def build_cache(tasks: list) -> dict:
+    """Reduce fetched tasks to the cached {id: {tag}} shape"""
+    return {
+        task["id"]: {"tag": task["tags"][0] if task["tags"] else None}
+        for task in tasks
+    }
+
+def lifecycle_cmd(transition: dict):
+    """Build door_lifecycle.sh argv, or None if the script is missing"""
     script = Path.home() / "bin/door_lifecycle.sh"
 
     if not script.exists():
         log(f"ERROR: door_lifecycle.sh not found at {script}")
-        return
+        return None
 
-    cmd = [
+    return [
         str(script),
         transition["from"],
         transition["to"],
@@ -126,6 +152,12 @@ def trigger_lifecycle(transition: dict):
         transition["title"]
     ]
 
+def trigger_lifecycle(transition: dict):
+    """Call door_lifecycle.sh to handle transition"""
+    cmd = lifecycle_cmd(transition)
+    if not cmd:
+        return
+
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
         log(f"✓ Transition: {transition['title']}: {transition['from']} → {transition['to']}")
@@ -134,7 +166,107 @@ def trigger_lifecycle(transition: dict):
     except subprocess.CalledProcessError as e:
         log(f"✗ Lifecycle failed: {e.stderr if e.stderr else str(e)}")
 
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "").strip() or default)
+    except ValueError:
+        return default
+
+class LifecyclePool:
+    """Bounded async runner for door_lifecycle.sh with per-task ordering"""
+
+    def __init__(self, max_jobs: int):
+        self._sem = asyncio.Semaphore(max(1, max_jobs))
+        self._tails: dict = {}
+
+    def submit(self, transition: dict):
+        # Chain onto the previous job for the same task so A→B→C never reorders.
+        task_id = transition["task_id"]
+        prev = self._tails.get(task_id)
+        job = asyncio.ensure_future(self._run_after(prev, transition))
+        self._tails[task_id] = job
+        job.add_done_callback(lambda fut, key=task_id: self._release(key, fut))
+
+    def _release(self, task_id: str, fut):
+        if self._tails.get(task_id) is fut:
+            del self._tails[task_id]
+
+    async def _run_after(self, prev, transition: dict):
+        if prev is not None:
+            await asyncio.gather(prev, return_exceptions=True)
+        cmd = lifecycle_cmd(transition)
+        if not cmd:
+            return
+        async with self._sem:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, stderr = await proc.communicate()
+        if proc.returncode == 0:
+            log(f"✓ Transition: {transition['title']}: {transition['from']} → {transition['to']}")
+            if stdout.strip():
+                log(f"  {stdout.decode(errors='replace').strip()}")
+        else:
+            err = stderr.decode(errors="replace").strip() or f"exit {proc.returncode}"
+            log(f"✗ Lifecycle failed: {err}")
+
+    async def drain(self):
+        pending = list(self._tails.values())
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+async def run_daemon():
+    fast = _env_float("TAG_WATCHER_FAST_INTERVAL", 5)
+    slow = _env_float("TAG_WATCHER_SLOW_INTERVAL", 60)
+    window = _env_float("TAG_WATCHER_ACTIVE_WINDOW", 300)
+    pool = LifecyclePool(int(_env_float("TAG_WATCHER_MAX_JOBS", 4)))
+
+    log(f"=== Tag Watcher Daemon Started (fast={fast}s slow={slow}s) ===")
+    cache = load_cache()
+    last_activity = 0.0
+
+    # systemd stop: leave the poll loop and let in-flight lifecycle jobs finish.
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+
+    try:
+        while not stop.is_set():
+            tasks = await asyncio.to_thread(fetch_door_tasks)
+            if tasks:
+                new_cache = build_cache(tasks)
+                transitions = detect_transitions(cache, tasks)
+                for transition in transitions:
+                    pool.submit(transition)
+                if new_cache != cache:
+                    cache = new_cache
+                    await asyncio.to_thread(save_cache, cache)
+                    last_activity = time.monotonic()
+                if transitions:
+                    log(f"Checked {len(tasks)} tasks, {len(transitions)} transitions")
+
+            active = time.monotonic() - last_activity < window
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=fast if active else slow)
+            except asyncio.TimeoutError:
+                pass
+        log("=== Tag Watcher Daemon stopping (SIGTERM), draining lifecycle jobs ===")
+    finally:
+        await pool.drain()
+
 def main():
+    parser = argparse.ArgumentParser(description="Watch TickTick lifecycle tags")
+    parser.add_argument("--daemon", action="store_true", help="Run as long-lived poller")
+    args = parser.parse_args()
+
+    if args.daemon:
+        try:
+            asyncio.run(run_daemon())
+        except KeyboardInterrupt:
+            pass
+        return
+
     log("=== Tag Watcher Started ===")
 
     # Load previous state
@@ -144,10 +276,7 @@ def main():
     tasks = fetch_door_tasks()
 
     # Build new cache
-    new_cache = {
-        task["id"]: {"tag": task["tags"][0] if task["tags"] else None}
-        for task in tasks
-    }
+    new_cache = build_cache(tasks)
 
     # Detect transitions
     transitions = detect_transitions(old_cache, tasks)
@@ -156,8 +285,9 @@ def main():
     for transition in transitions:
         trigger_lifecycle(transition)
 
-    # Save new cache
-    save_cache(new_cache)
+    # Save new cache (only when something changed)
+    if new_cache != old_cache:
+        save_cache(new_cache)
 
     log(f"Checked {len(tasks)} tasks, {len(transitions)} transitions")
 
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: messages/sec through the router dispatch path.
+
+Compares the old per-message path (extension_command_set + centre lookup)
+with the compiled DispatchTable. Needs no bot token, aiogram or network.
+
+Usage:
+    python bench_dispatch.py [-n 200000] [--config config.yaml]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import yaml
+
+from router_app.commands import extension_command_set
+from router_app.dispatch import CORE_COMMANDS, KIND_CENTRE, DispatchTable
+
+
+class _Centre(SimpleNamespace):
+    pass
+
+
+class _Ext:
+    """Mimics a loaded extension instance (module name is what counts)."""
+
+
+def _fake_state(config: dict) -> SimpleNamespace:
+    names = [str(n) for n in config.get("extensions", []) if str(n).strip()]
+    exts = []
+    for name in names:
+        cls = type(name, (_Ext,), {"__module__": f"extensions.{name}"})
+        exts.append(cls())
+    loader = SimpleNamespace(extensions=exts, generation=len(exts))
+    centres = {
+        cmd: _Centre(cmd=cmd, label=cmd.title(), url=f"http://127.0.0.1:8799/{cmd}")
+        for cmd in ("voice", "door", "game", "frame", "freedom", "focus", "tent", "fruits", "core4")
+    }
+    cache = SimpleNamespace(centres=centres, generation=1)
+
+    def loaded_extension_names() -> set[str]:
+        return {e.__class__.__module__.split(".")[-1] for e in loader.extensions}
+
+    return SimpleNamespace(
+        config=config,
+        cache=cache,
+        extension_loader=loader,
+        loaded_extension_names=loaded_extension_names,
+        dispatch=DispatchTable(),
+    )
+
+
+def _legacy_route(state, cmd: str):
+    if cmd in CORE_COMMANDS:
+        return "skip"
+    if cmd in extension_command_set(state.config, state.loaded_extension_names()):
+        return "skip"
+    return state.cache.centres.get(cmd)
+
+
+def _compiled_route(state, cmd: str):
+    route = state.dispatch.resolve(state, cmd)
+    if route and route[0] != KIND_CENTRE:
+        return "skip"
+    return route[1] if route else None
+
+
+def _run(label: str, fn, state, cmds: list[str], n: int) -> float:
+    started = time.perf_counter()
+    for i in range(n):
+        fn(state, cmds[i % len(cmds)])
+    elapsed = time.perf_counter() - started
+    rate = n / elapsed if elapsed else float("inf")
+    print(f"{label:<10} {n} msgs in {elapsed * 1000:8.1f}ms  →  {rate:12,.0f} msg/s")
+    return rate
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=200_000, help="messages per run")
+    parser.add_argument("--config", default=str(Path(__file__).with_name("config.yaml")))
+    args = parser.parse_args()
+
+    config = yaml.safe_load(Path(args.config).read_text(encoding="utf-8")) or {}
+    state = _fake_state(config)
+    cmds = ["fire", "voice", "fit", "menu", "door", "nope", "war", "tent", "help", "game"]
+
+    legacy = _run("legacy", _legacy_route, state, cmds, args.n)
+    compiled = _run("compiled", _compiled_route, state, cmds, args.n)
+    print(f"speedup    {compiled / legacy:.1f}x  (table rebuilds: {state.dispatch.rebuilds})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
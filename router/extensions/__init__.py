@@ -1,11 +1,27 @@
 #!/usr/bin/env python3
-"""Extension loader for router bot."""
+"""Extension loader for router bot.
 
+Extensions listed in `extensions/manifest.py` are loaded lazily by default:
+their commands are registered at boot from the manifest, while module import,
+`setup()` and session creation happen on the first matching message. Idle
+lazy extensions are torn down again (`extension_idle_timeout`). Set
+`lazy_extensions: false` (global) or `<name>.lazy: false` to load eagerly.
+"""
+
+import asyncio
+import datetime as dt
 import importlib
 import logging
-from typing import List, TYPE_CHECKING
+import time
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from aiogram import F, Router
+from aiogram.dispatcher.event.bases import UNHANDLED, SkipHandler
+from aiogram.filters import Command
+from aiogram.types import Message
 
 from .base import Extension
+from .manifest import manifest_for
 
 if TYPE_CHECKING:
     from aiogram import Bot, Dispatcher
@@ -13,21 +29,48 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _truthy(value, default: bool = True) -> bool:
+    if value is None:
+        return default
+    return str(value).strip().lower() not in ("0", "false", "no", "off")
+
+
+class _LazySlot:
+    """One lazily activated extension: manifest + current instance."""
+
+    def __init__(self, name: str, manifest: dict):
+        self.name = name
+        self.manifest = manifest
+        self.extension: Optional[Extension] = None
+        self.router: Optional[Router] = None
+        self.last_used = 0.0
+        self.lock = asyncio.Lock()
+
+
 class ExtensionLoader:
     """Loads and manages router bot extensions."""
 
-    def __init__(self, bot: "Bot", dp: "Dispatcher", config: dict):
+    def __init__(self, bot: "Bot", dp: "Dispatcher", config: dict, state=None):
         """Initialize extension loader.
 
         Args:
             bot: Aiogram Bot instance
             dp: Aiogram Dispatcher instance
             config: Full config dict from config.yaml
+            state: Router AppState handed to every extension (optional)
         """
         self.bot = bot
         self.dp = dp
         self.config = config
+        self.state = state
         self.extensions: List[Extension] = []
+        self.lazy: Dict[str, _LazySlot] = {}
+        self.timings: Dict[str, Dict[str, int]] = {}
+        # Bumped on every load so the router dispatch table knows to rebuild.
+        self.generation = 0
+        self.lazy_enabled = _truthy(config.get("lazy_extensions"), default=True)
+        self.idle_timeout = float(config.get("extension_idle_timeout", 1800) or 0)
+        self._background: List[asyncio.Task] = []
 
     async def load_extensions(self, extension_names: List[str]) -> None:
         """Load extensions by name.
@@ -37,23 +80,52 @@ class ExtensionLoader:
         """
         for name in extension_names:
             try:
-                await self._load_extension(name)
+                manifest = manifest_for(name, self.config) if self.lazy_enabled else None
+                ext_config = self.config.get(name, {})
+                if manifest and _truthy(
+                    ext_config.get("lazy") if isinstance(ext_config, dict) else None
+                ):
+                    self._register_lazy(name, manifest)
+                else:
+                    await self._load_extension(name)
             except Exception as exc:
                 logger.error(f"Failed to load extension '{name}': {exc}")
                 # Fail-soft: continue loading other extensions
 
+        if self.lazy and self.idle_timeout > 0:
+            self._background.append(asyncio.create_task(self._idle_loop()))
+
+    def extension_names(self) -> set:
+        """Names of eagerly loaded and lazily registered extensions."""
+        names = set(self.lazy.keys())
+        for ext in self.extensions:
+            module = ext.__class__.__module__
+            if module.startswith("extensions."):
+                names.add(module.split(".")[-1])
+        return names
+
     async def _load_extension(self, name: str) -> None:
         """Load a single extension by module name.
 
         Args:
             name: Extension module name (e.g., 'core4_actions')
         """
+        extension = await self._instantiate(name, self.dp)
+        self.extensions.append(extension)
+        self.generation += 1
+        logger.info(f"Loaded extension: {extension.get_name()}")
+
+    async def _instantiate(self, name: str, dp) -> Extension:
+        """Import, construct and set up an extension against `dp` (timed)."""
+        started = time.monotonic()
+
         # Import the extension module
         module_path = f"extensions.{name}"
         try:
             module = importlib.import_module(module_path)
         except ImportError as exc:
             raise ImportError(f"Extension module '{module_path}' not found") from exc
+        imported = time.monotonic()
 
         # Find the Extension class in the module
         extension_class = None
@@ -74,14 +146,117 @@ class ExtensionLoader:
         ext_config = self.config.get(name, {})
 
         # Instantiate and setup
-        extension = extension_class(self.bot, self.dp, ext_config)
+        extension = extension_class(self.bot, dp, ext_config)
+        extension.state = self.state
         await extension.setup()
 
-        self.extensions.append(extension)
-        logger.info(f"Loaded extension: {extension.get_name()}")
+        import_ms = int((imported - started) * 1000)
+        setup_ms = int((time.monotonic() - imported) * 1000)
+        self.timings[name] = {"import_ms": import_ms, "setup_ms": setup_ms}
+        logger.info(f"Extension {name}: import {import_ms}ms, setup {setup_ms}ms")
+        return extension
+
+    # -- lazy activation ----------------------------------------------------
+
+    def _register_lazy(self, name: str, manifest: dict) -> None:
+        slot = _LazySlot(name, manifest)
+        self.lazy[name] = slot
+        self.generation += 1
+
+        async def proxy(m: Message, **data):
+            await self._forward(slot, m, data, activate=True)
+
+        async def text_proxy(m: Message, **data):
+            await self._forward(slot, m, data, activate=manifest["text"] == "activate")
+
+        if manifest["commands"]:
+            self.dp.message(Command(*manifest["commands"]))(proxy)
+        if manifest.get("text"):
+            self.dp.message(F.text & ~F.text.regexp(r"^/"))(text_proxy)
+        if manifest.get("schedule"):
+            self._background.append(asyncio.create_task(self._wake_loop(slot)))
+
+        logger.info(f"Registered lazy extension: {name} ({', '.join(manifest['commands']) or 'no commands'})")
+
+    async def _activate(self, slot: _LazySlot) -> Optional[Router]:
+        async with slot.lock:
+            if slot.router is None:
+                router = Router(name=f"lazy:{slot.name}")
+                try:
+                    slot.extension = await self._instantiate(slot.name, router)
+                except Exception as exc:
+                    logger.error(f"Failed to activate extension '{slot.name}': {exc}")
+                    return None
+                slot.router = router
+                logger.info(f"Activated extension: {slot.extension.get_name()}")
+            slot.last_used = time.monotonic()
+            return slot.router
+
+    async def _forward(self, slot: _LazySlot, m: Message, data: dict, *, activate: bool) -> None:
+        router = slot.router
+        if router is None and activate:
+            router = await self._activate(slot)
+        if router is None:
+            raise SkipHandler
+        slot.last_used = time.monotonic()
+        result = await router.propagate_event("message", m, **data)
+        if result is UNHANDLED:
+            raise SkipHandler
+
+    async def _deactivate(self, slot: _LazySlot) -> None:
+        async with slot.lock:
+            ext = slot.extension
+            slot.extension = None
+            slot.router = None
+        if ext:
+            try:
+                await ext.teardown()
+                logger.info(f"Tore down extension: {ext.get_name()}")
+            except Exception as exc:
+                logger.warning(f"Error tearing down {ext.get_name()}: {exc}")
+
+    async def _idle_loop(self) -> None:
+        interval = max(30.0, min(300.0, self.idle_timeout / 4))
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for slot in self.lazy.values():
+                if slot.router is None or slot.manifest.get("stateful"):
+                    continue
+                if now - slot.last_used >= self.idle_timeout:
+                    logger.info(f"Extension {slot.name} idle for {int(now - slot.last_used)}s")
+                    await self._deactivate(slot)
+
+    async def _wake_loop(self, slot: _LazySlot) -> None:
+        """Activate a scheduled extension one minute before its daily job."""
+        ext_config = self.config.get(slot.name, {}) or {}
+        while True:
+            try:
+                # The module owns its schedule (env > config > default); importing it is
+                # cheap, instantiation and setup() stay deferred until the wake-up.
+                next_run = getattr(importlib.import_module(f"extensions.{slot.name}"), slot.manifest["schedule"])
+                run = next_run(ext_config)
+                now = dt.datetime.now(run.tzinfo)
+                wake = run - dt.timedelta(minutes=1)
+                if wake <= now:
+                    wake = next_run(ext_config, run) - dt.timedelta(minutes=1)
+                await asyncio.sleep((wake - now).total_seconds())
+                if await self._activate(slot) is not None:
+                    # Hold past the job so the idle janitor does not race it.
+                    slot.last_used = time.monotonic() + 120
+            except asyncio.CancelledError:
+                break
+            except Exception as exc:
+                logger.warning(f"Wake loop for {slot.name} failed: {exc}")
+                await asyncio.sleep(60)
 
     async def teardown_all(self) -> None:
         """Teardown all loaded extensions."""
+        for task in self._background:
+            task.cancel()
+        for slot in reversed(list(self.lazy.values())):
+            if slot.router is not None:
+                await self._deactivate(slot)
         for ext in reversed(self.extensions):  # Reverse order for cleanup
             try:
                 await ext.teardown()
@@ -13,6 +13,10 @@ class Extension(ABC):
 
     Extensions can register additional handlers, commands, or
     modify bot behavior without touching the core router logic.
+
+    `state` is the router AppState (shared services such as the Taskwarrior
+    executor); the loader sets it before `setup()`. It stays None when an
+    extension is used outside the router.
     """
 
     def __init__(self, bot: "Bot", dp: "Dispatcher", config: dict):
@@ -26,6 +30,7 @@ class Extension(ABC):
         self.bot = bot
         self.dp = dp
         self.config = config
+        self.state = None
 
     @abstractmethod
     async def setup(self) -> None:
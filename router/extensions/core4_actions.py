@@ -7,6 +7,7 @@ task with the matching tag as done.
 
 Example:
   /fit → task +core4 +fitness due:today done
+         (via the router-wide TaskwarriorExecutor: serialized, batched)
   /fit Felt strong today → also saves journal note via Index Node API
 
 Configuration in config.yaml:
@@ -23,16 +24,16 @@ Configuration in config.yaml:
       dec: declare
 """
 
-import asyncio
-import json
 import logging
 import os
 from typing import Dict
 
-import aiohttp
 from aiogram.filters import Command
 from aiogram.types import Message
 
+from router_app.api_client import ApiClient
+from router_app.taskwarrior import TaskwarriorExecutor
+
 from .base import Extension
 
 logger = logging.getLogger(__name__)
@@ -53,15 +54,23 @@ class Core4ActionsExtension(Extension):
         self.tag_map: Dict[str, str] = config.get("tags", {})
         api_base = os.getenv("CORE4_API_BASE") or config.get("api_base", "http://127.0.0.1:8799")
         self.api_base = str(api_base).rstrip("/")
-        self._session: aiohttp.ClientSession | None = None
+        self._api: ApiClient | None = None
+        self._owns_api = False
+        self._tw: TaskwarriorExecutor | None = None
+        self._owns_tw = False
         if not self.tag_map:
             logger.warning("Core4ActionsExtension: No tags configured")
 
     async def setup(self) -> None:
         """Register Core4 command handlers."""
-        self._session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=5)
-        )
+        self._api = getattr(self.state, "api", None)
+        if self._api is None:
+            self._api = ApiClient()
+            self._owns_api = True
+        self._tw = getattr(self.state, "taskwarrior", None)
+        if self._tw is None:
+            self._tw = TaskwarriorExecutor()
+            self._owns_tw = True
         # Register handlers for each tag
         for cmd, tag in self.tag_map.items():
             self._register_core4_handler(cmd, tag)
@@ -69,8 +78,10 @@ class Core4ActionsExtension(Extension):
         logger.info(f"Core4ActionsExtension: Registered {len(self.tag_map)} commands")
 
     async def teardown(self) -> None:
-        if self._session:
-            await self._session.close()
+        if self._api and self._owns_api:
+            await self._api.close()
+        if self._tw and self._owns_tw:
+            await self._tw.close()
 
     def _register_core4_handler(self, cmd: str, tag: str) -> None:
         """Register a handler for a Core4 command.
@@ -108,15 +119,14 @@ class Core4ActionsExtension(Extension):
         return "⚠️ Journal save failed."
 
     async def _api_post(self, path: str, payload: dict) -> dict | None:
-        if not self._session:
+        if not self._api:
             return None
         url = f"{self.api_base}{path}"
         try:
-            async with self._session.post(url, json=payload) as resp:
-                data = await resp.json(content_type=None)
-                if resp.status >= 400:
-                    return {"ok": False, "error": data or f"HTTP {resp.status}"}
-                return data if isinstance(data, dict) else {"ok": True}
+            status, data = await self._api.post_json(url, payload)
+            if status >= 400:
+                return {"ok": False, "error": data or f"HTTP {status}"}
+            return data if isinstance(data, dict) else {"ok": True}
         except Exception as exc:
             logger.error(f"Core4ActionsExtension API error: {exc}")
             return None
@@ -124,8 +134,9 @@ class Core4ActionsExtension(Extension):
     async def _mark_task_done_by_tag(self, tag: str) -> str:
         """Mark a Taskwarrior task as done by tag.
 
-        Finds the first pending task with +{tag} (optionally +core4) due:today
-        and marks it as done.
+        Finds the first pending task with +{tag} due:today and marks it as
+        done. Concurrent commands are serialized by the executor, so two quick
+        taps complete two different tasks (or report that none is left).
 
         Args:
             tag: Taskwarrior tag to search for
@@ -134,54 +145,21 @@ class Core4ActionsExtension(Extension):
             Status message (success or error)
         """
         try:
-            export_cmd = [
-                "task",
-                "rc.verbose=0",
-                "rc.confirmation=no",
-                f"+{tag}",
-                "due:today",
-                "status:pending",
-                "export",
-            ]
-            proc = await asyncio.create_subprocess_exec(
-                *export_cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.DEVNULL
-            )
-            out, _ = await proc.communicate()
-            text = (out or b"").decode("utf-8", errors="ignore").strip()
-            tasks = json.loads(text) if text else []
-            if not tasks:
-                return f"❌ No pending +{tag} task due today"
-
-            # Get first task UUID
-            task_uuid = tasks[0].get("uuid")
-            if not task_uuid:
-                return f"❌ Task found but no UUID"
-
-            # Mark as done
-            done_cmd = ["task", task_uuid, "done"]
-            proc = await asyncio.create_subprocess_exec(
-                *done_cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT
+            result = await self._tw.complete_first(
+                [f"+{tag}", "due:today", "status:pending"],
+                label=f"core4:{tag}",
             )
-            out, _ = await proc.communicate()
-            result = (out or b"").decode("utf-8", errors="ignore").strip()
-
-            # Check if successful
-            if proc.returncode == 0:
-                task_desc = tasks[0].get("description", "task")
-                return f"✅ Done: {task_desc}\n+{tag}"
-            else:
-                return f"❌ Failed to mark done: {result[:200]}"
-
-        except json.JSONDecodeError:
-            return f"❌ Invalid task export format"
         except Exception as exc:
             logger.error(f"Error marking task done: {exc}")
             return f"❌ Error: {exc}"
 
+        if result.task is None:
+            return f"❌ No pending +{tag} task due today"
+        if not result.ok:
+            return f"❌ Failed to mark done: {result.error}"
+        task_desc = result.task.get("description", "task")
+        return f"✅ Done: {task_desc}\n+{tag} ({result.latency_ms}ms)"
+
     def get_name(self) -> str:
         """Get extension name."""
         return "Core4Actions"
@@ -12,11 +12,12 @@ Commands:
 import logging
 import os
 
-import aiohttp
 from aiogram import F
 from aiogram.filters import Command
 from aiogram.types import Message
 
+from router_app.api_client import ApiClient
+
 from .base import Extension
 
 logger = logging.getLogger(__name__)
@@ -37,13 +38,15 @@ class DoorFlowExtension(Extension):
         else:
             env_allowed = os.getenv("ALLOWED_USER_ID", "").strip()
             self.allowed_user_ids = {env_allowed} if env_allowed else set()
-        self._session: aiohttp.ClientSession | None = None
+        self._api: ApiClient | None = None
+        self._owns_api = False
         self._sessions: dict[str, str] = {}
 
     async def setup(self) -> None:
-        self._session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=5)
-        )
+        self._api = getattr(self.state, "api", None)
+        if self._api is None:
+            self._api = ApiClient()
+            self._owns_api = True
 
         @self.dp.message(Command("warstack"))
         async def warstack_command(m: Message):
@@ -75,8 +78,8 @@ class DoorFlowExtension(Extension):
         logger.info("DoorFlowExtension: handlers registered")
 
     async def teardown(self) -> None:
-        if self._session:
-            await self._session.close()
+        if self._api and self._owns_api:
+            await self._api.close()
 
     def _allowed(self, m: Message) -> bool:
         if not self.allowed_user_ids:
@@ -148,12 +151,12 @@ class DoorFlowExtension(Extension):
         await m.answer(prompt)
 
     async def _api_post(self, path: str, payload: dict) -> dict:
-        if not self._session:
+        if not self._api:
             return {}
         url = f"{self.api_base}{path}"
         try:
-            async with self._session.post(url, json=payload) as response:
-                return await response.json()
+            _status, data = await self._api.post_json(url, payload)
+            return data if isinstance(data, dict) else {}
         except Exception as exc:
             logger.warning(f"Door API error: {exc}")
             return {}
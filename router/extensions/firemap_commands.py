@@ -5,7 +5,10 @@ Commands:
   /fire     - run firemap bot (daily)
   /fireweek - run firemap bot (weekly)
 
-Prefers starting a user systemd unit (if present) and falls back to running the bot script.
+Default: renders in-process through FireMapService (engine imported once, warm
+task snapshot, reply via the router Bot). With `in_process: false`, or if the
+engine cannot be imported, prefers starting a user systemd unit (if present)
+and falls back to running the bot script.
 """
 
 import asyncio
@@ -17,6 +20,7 @@ from aiogram.filters import Command
 from aiogram.types import Message
 
 from .base import Extension
+from .firemap_service import FireMapSendError, FireMapService
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +49,16 @@ class FireMapCommandsExtension(Extension):
         self.script = config.get("script", "game/fire/firemap_bot.py")
         self.daily_mode = config.get("daily_mode", "daily")
         self.weekly_mode = config.get("weekly_mode", "weekly")
+        self.in_process = str(config.get("in_process", "1")).strip().lower() not in (
+            "0",
+            "false",
+            "no",
+            "off",
+        )
+        self.snapshot_ttl = float(config.get("snapshot_ttl", 30))
         self._run_lock = asyncio.Lock()
+        self._service: FireMapService | None = None
+        self._warm_task: asyncio.Task | None = None
 
     async def setup(self) -> None:
         @self.dp.message(Command("fire"))
@@ -56,8 +69,16 @@ class FireMapCommandsExtension(Extension):
         async def fireweek_command(m: Message):
             await self._run_firemap(m, self.weekly_mode)
 
+        if self.in_process:
+            self._service = FireMapService(self._script_path().parent, self.snapshot_ttl)
+            self._warm_task = asyncio.create_task(self._service.warm())
+
         logger.info("FireMapCommandsExtension: Registered /fire and /fireweek")
 
+    async def teardown(self) -> None:
+        if self._warm_task and not self._warm_task.done():
+            self._warm_task.cancel()
+
     def _systemd_dir(self) -> Path:
         return Path(os.environ.get("XDG_CONFIG_HOME", str(Path.home() / ".config"))) / "systemd" / "user"
 
@@ -101,6 +122,20 @@ class FireMapCommandsExtension(Extension):
             return False, f"ERR: systemd start failed ({unit}). {exc}"
 
     async def _run_firemap(self, m: Message, mode: str) -> None:
+        if self._service is not None:
+            scope = "weekly" if mode == self.weekly_mode else "daily"
+            try:
+                await self._service.send(self.bot, m.chat.id, scope)
+                return
+            except FireMapSendError as exc:
+                if exc.sent:
+                    # Part of the map is already in the chat: resume, don't replay it.
+                    await self._resume_send(m, exc)
+                    return
+                logger.warning("Firemap in-process send failed, falling back: %s", exc)
+            except Exception as exc:
+                logger.warning("Firemap in-process render failed, falling back: %s", exc)
+
         if self.prefer_systemd:
             unit = self.daily_unit if mode == self.daily_mode else self.weekly_unit
             if self._unit_file_exists(unit):
@@ -113,7 +148,15 @@ class FireMapCommandsExtension(Extension):
         async with self._run_lock:
             await self._run_firemap_subprocess(m, mode)
 
-    async def _run_firemap_subprocess(self, m: Message, mode: str) -> None:
+    async def _resume_send(self, m: Message, exc: FireMapSendError) -> None:
+        logger.warning("Firemap send interrupted, resuming at chunk %d: %s", exc.sent + 1, exc)
+        try:
+            await self._service.send_chunks(self.bot, m.chat.id, exc.chunks, start=exc.sent)
+        except FireMapSendError as retry_exc:
+            logger.error("Firemap resume failed: %s", retry_exc)
+            await m.answer(f"ERR: firemap incomplete ({retry_exc.sent}/{len(exc.chunks)} parts sent).")
+
+    def _script_path(self) -> Path:
         script_path = Path(self.script)
         if not script_path.is_absolute():
             hub_dir = os.environ.get("AOS_HUB_DIR")
@@ -123,6 +166,10 @@ class FireMapCommandsExtension(Extension):
                 # Resolve relative to repo root (…/aos-hub), not the router CWD.
                 repo_root = Path(__file__).resolve().parents[2]
                 script_path = repo_root / script_path
+        return script_path
+
+    async def _run_firemap_subprocess(self, m: Message, mode: str) -> None:
+        script_path = self._script_path()
 
         if not script_path.exists():
             await m.answer(f"ERR: firemap bot not found: {script_path}")
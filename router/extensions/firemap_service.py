@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""In-process Fire Map service for the router.
+
+Imports the Fire Map engine (`game/fire/firemap.py` via `firemap_bot.py`, which
+also loads fire.env) once, keeps a warm Taskwarrior snapshot and renders
+messages inside the router process. Replies go out through the router's
+already-open aiogram Bot, so a /fire reply costs Telegram latency instead of
+interpreter startup + imports + a second bot send path.
+
+Not an extension on its own; used by `firemap_commands`.
+"""
+
+import asyncio
+import importlib
+import logging
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FireMapSendError(RuntimeError):
+    """Sending stopped part-way: `chunks[:sent]` already went out."""
+
+    def __init__(self, chunks: List[str], sent: int, cause: Exception):
+        super().__init__(f"sent {sent}/{len(chunks)} chunks: {cause}")
+        self.chunks = chunks
+        self.sent = sent
+
+
+class FireMapService:
+    """Warm Fire Map renderer bound to the engine in `fire_dir`."""
+
+    def __init__(self, fire_dir: Path, snapshot_ttl: float = 30.0):
+        self.fire_dir = fire_dir
+        self.snapshot_ttl = snapshot_ttl
+        self._bot_mod: Optional[ModuleType] = None
+        self._engine: Optional[ModuleType] = None
+        self._tasks: List[Dict[str, Any]] | None = None
+        self._tasks_ts = 0.0
+        self._tasks_mtime = 0.0
+        self._lock = asyncio.Lock()
+
+    async def warm(self) -> bool:
+        """Import the engine and load a first snapshot (safe to call repeatedly)."""
+        try:
+            await self._snapshot()
+            return True
+        except Exception as exc:
+            logger.warning("FireMapService warm-up failed: %s", exc)
+            return False
+
+    def _import(self) -> ModuleType:
+        if self._engine is not None:
+            return self._engine
+        fire_dir = str(self.fire_dir)
+        if fire_dir not in sys.path:
+            sys.path.insert(0, fire_dir)
+        # firemap_bot loads fire.env before importing the engine (env-driven config).
+        self._bot_mod = importlib.import_module("firemap_bot")
+        self._engine = importlib.import_module("firemap")
+        return self._engine
+
+    async def _snapshot(self) -> List[Dict[str, Any]]:
+        async with self._lock:
+            engine = self._engine or await asyncio.to_thread(self._import)
+            mtime = await asyncio.to_thread(engine.task_export_mtime)
+            age = time.monotonic() - self._tasks_ts
+            if self._tasks is None or age > self.snapshot_ttl or mtime != self._tasks_mtime:
+                self._tasks = await asyncio.to_thread(engine.load_tasks_snapshot)
+                self._tasks_ts = time.monotonic()
+                self._tasks_mtime = mtime
+            return self._tasks
+
+    def invalidate(self) -> None:
+        self._tasks = None
+
+    async def render(self, scope: str) -> List[str]:
+        """Build HTML chunks for a scope (daily|weekly)."""
+        tasks = await self._snapshot()
+        engine, bot_mod = self._engine, self._bot_mod
+        # Full render is CPU-bound: keep it off the event loop.
+        msgs = await asyncio.to_thread(engine.build_all_messages, scope, tasks)
+        chunks: List[str] = []
+        for msg in msgs or ["🟦 Firemap: (no tasks)"]:
+            chunks.extend(bot_mod.render_html_chunks(msg))
+        return chunks
+
+    async def send_chunks(self, bot, chat_id: int | str, chunks: List[str], start: int = 0) -> int:
+        """Send `chunks[start:]`; raises FireMapSendError with the resume index on failure."""
+        sent = start
+        for chunk in chunks[start:]:
+            try:
+                await bot.send_message(chat_id, chunk, parse_mode="HTML")
+            except Exception as exc:
+                raise FireMapSendError(chunks, sent, exc) from exc
+            sent += 1
+        return sent
+
+    async def send(self, bot, chat_id: int | str, scope: str) -> int:
+        """Render and send to one chat via the router Bot. Returns chunks sent."""
+        return await self.send_chunks(bot, chat_id, await self.render(scope))
@@ -18,16 +18,36 @@ import random
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
-import aiohttp
 from aiogram import F
 from aiogram.filters import Command
 from aiogram.types import Message
 
+from router_app.api_client import ApiClient
+
 from .base import Extension
 
 logger = logging.getLogger(__name__)
 
 
+def daily_schedule(config: dict) -> tuple[int, int, str]:
+    """(hour, minute, timezone) of the daily question: env, then config, then default."""
+    hour = int(os.getenv("FRUITS_DAILY_HOUR", config.get("daily_hour", 7)))
+    minute = int(os.getenv("FRUITS_DAILY_MINUTE", config.get("daily_minute", 0)))
+    timezone = str(os.getenv("FRUITS_TIMEZONE", config.get("timezone", "Europe/Vienna")))
+    return hour, minute, timezone
+
+
+def next_run(config: dict, now: datetime | None = None) -> datetime:
+    """Next time the daily question goes out (tz-aware)."""
+    hour, minute, timezone = daily_schedule(config)
+    tz = ZoneInfo(timezone)
+    now = now.astimezone(tz) if now is not None else datetime.now(tz)
+    run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if run <= now:
+        run += timedelta(days=1)
+    return run
+
+
 class FruitsDailyExtension(Extension):
     """Daily Fruits facts extension."""
 
@@ -37,9 +57,7 @@ class FruitsDailyExtension(Extension):
         self.api_base = str(api_base).rstrip("/")
         web_url = os.getenv("FRUITS_WEB_URL") or config.get("web_url", "") or f"{self.api_base}/facts"
         self.web_url = str(web_url).strip()
-        self.daily_hour = int(os.getenv("FRUITS_DAILY_HOUR", config.get("daily_hour", 7)))
-        self.daily_minute = int(os.getenv("FRUITS_DAILY_MINUTE", config.get("daily_minute", 0)))
-        self.timezone = str(os.getenv("FRUITS_TIMEZONE", config.get("timezone", "Europe/Vienna")))
+        self.daily_hour, self.daily_minute, self.timezone = daily_schedule(config)
         self.default_chat_id = str(
             config.get("default_chat_id", os.getenv("FRUITS_DEFAULT_CHAT_ID", ""))
         ).strip()
@@ -49,13 +67,15 @@ class FruitsDailyExtension(Extension):
         else:
             env_allowed = os.getenv("ALLOWED_USER_ID", "").strip()
             self.allowed_user_ids = {env_allowed} if env_allowed else set()
-        self._session: aiohttp.ClientSession | None = None
+        self._api: ApiClient | None = None
+        self._owns_api = False
         self._task: asyncio.Task | None = None
 
     async def setup(self) -> None:
-        self._session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=5)
-        )
+        self._api = getattr(self.state, "api", None)
+        if self._api is None:
+            self._api = ApiClient()
+            self._owns_api = True
         self._task = asyncio.create_task(self._daily_loop())
 
         @self.dp.message(Command("facts"))
@@ -112,8 +132,8 @@ class FruitsDailyExtension(Extension):
     async def teardown(self) -> None:
         if self._task:
             self._task.cancel()
-        if self._session:
-            await self._session.close()
+        if self._api and self._owns_api:
+            await self._api.close()
 
     def _allowed(self, m: Message) -> bool:
         if not self.allowed_user_ids:
@@ -199,15 +219,8 @@ class FruitsDailyExtension(Extension):
         while True:
             try:
                 now = datetime.now(tz)
-                next_run = now.replace(
-                    hour=self.daily_hour,
-                    minute=self.daily_minute,
-                    second=0,
-                    microsecond=0,
-                )
-                if next_run <= now:
-                    next_run += timedelta(days=1)
-                await asyncio.sleep((next_run - now).total_seconds())
+                run = next_run(self.config, now)
+                await asyncio.sleep((run - now).total_seconds())
                 await self._send_daily_questions()
             except asyncio.CancelledError:
                 break
@@ -286,28 +299,27 @@ class FruitsDailyExtension(Extension):
         await self.bot.send_message(chat_id, msg, parse_mode="Markdown", disable_web_page_preview=True)
 
     async def _api_get(self, path: str) -> dict:
-        if not self._session:
+        if not self._api:
             return {}
         url = self.api_base + path
         try:
-            async with self._session.get(url) as response:
-                if response.status != 200:
-                    return {}
-                return await response.json(content_type=None)
+            status, data = await self._api.get_json(url)
+            if status != 200:
+                return {}
+            return data if isinstance(data, dict) else {}
         except Exception as exc:
             logger.warning(f"Fruits API GET failed: {exc}")
             return {}
 
     async def _api_post(self, path: str, payload: dict) -> dict:
-        if not self._session:
+        if not self._api:
             return {}
         url = self.api_base + path
         try:
-            async with self._session.post(url, json=payload) as response:
-                if response.status != 200:
-                    data = await response.json(content_type=None)
-                    return data if isinstance(data, dict) else {"ok": False}
-                return await response.json(content_type=None)
+            status, data = await self._api.post_json(url, payload)
+            if status != 200:
+                return data if isinstance(data, dict) else {"ok": False}
+            return data if isinstance(data, dict) else {}
         except Exception as exc:
             logger.warning(f"Fruits API POST failed: {exc}")
             return {}
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Static manifest of router extensions (read without importing them).
+
+Lets the loader register command filters at boot and defer module import,
+`setup()` and session creation to the first matching message.
+
+Fields:
+  text:      free-text (non-command) handling of the extension
+             - None:       no free-text handler
+             - "activate": plain text activates the extension
+             - "active":   plain text is only forwarded once active
+  stateful:  keeps in-memory conversation state → never idle-torn-down
+  schedule:  name of a module-level `fn(config) -> datetime` returning the
+             next run of the extension's daily job; the loader calls it and
+             wakes the extension shortly before that time
+"""
+
+from typing import Any, Dict, Optional
+
+from router_app.commands import extension_command_set
+
+MANIFEST: Dict[str, Dict[str, Any]] = {
+    "core4_actions": {"text": None, "stateful": False},
+    "door_flow": {"text": "active", "stateful": True},
+    "firemap_commands": {"text": None, "stateful": False},
+    "fruits_daily": {
+        "text": "activate",
+        "stateful": False,
+        "schedule": "next_run",
+    },
+    "warstack_commands": {"text": None, "stateful": False},
+}
+
+
+def manifest_for(name: str, config: dict) -> Optional[Dict[str, Any]]:
+    """Manifest entry incl. resolved command names, or None if unknown."""
+    entry = MANIFEST.get(name)
+    if entry is None:
+        return None
+    return {**entry, "commands": sorted(extension_command_set(config, {name}))}
@@ -0,0 +1,130 @@
+"""Router-level HTTP client for the Index Node (and other local APIs).
+
+One `aiohttp.ClientSession` (single keepalive pool) shared by all extensions:
+
+- identical in-flight GETs are coalesced into one request
+- per-endpoint timeouts (`api.timeouts` in config.yaml, keyed by path)
+- per-endpoint latency counters, surfaced by the core /health command
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class ApiClient:
+    def __init__(
+        self,
+        default_timeout: float = 5.0,
+        timeouts: Optional[Dict[str, float]] = None,
+        pool_limit: int = 20,
+    ):
+        self.default_timeout = default_timeout
+        self.timeouts = {str(k): float(v) for k, v in (timeouts or {}).items()}
+        self.pool_limit = pool_limit
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_limit, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def _timeout_for(self, path: str, override: Optional[float]) -> aiohttp.ClientTimeout:
+        total = override if override is not None else self.timeouts.get(path, self.default_timeout)
+        return aiohttp.ClientTimeout(total=total)
+
+    def _record(self, key: str, started: float, ok: bool) -> None:
+        ms = (time.monotonic() - started) * 1000
+        entry = self._stats.setdefault(
+            key, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+        )
+        entry["count"] += 1
+        entry["errors"] += 0 if ok else 1
+        entry["total_ms"] += ms
+        entry["max_ms"] = max(entry["max_ms"], ms)
+        entry["last_ms"] = ms
+
+    async def request_json(
+        self,
+        method: str,
+        url: str,
+        *,
+        json: Any = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, Any]:
+        """Send a request and return (status, parsed JSON or None). Raises on network errors."""
+        path = urlsplit(url).path or "/"
+        key = f"{method.upper()} {path}"
+        started = time.monotonic()
+        ok = False
+        try:
+            async with self._get_session().request(
+                method,
+                url,
+                json=json,
+                timeout=self._timeout_for(path, timeout),
+            ) as response:
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:
+                    data = None
+                ok = response.status < 500
+                return response.status, data
+        finally:
+            self._record(key, started, ok)
+
+    async def get_json(self, url: str, *, timeout: Optional[float] = None) -> Tuple[int, Any]:
+        """GET with coalescing: concurrent callers for the same URL share one request."""
+        pending = self._inflight.get(url)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = fut
+        try:
+            result = await self.request_json("GET", url, timeout=timeout)
+            fut.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as exc:
+            fut.set_exception(exc)
+            # Waiters get the exception; mark it retrieved for the lone-caller case.
+            fut.exception()
+            raise
+        finally:
+            self._inflight.pop(url, None)
+
+    async def post_json(self, url: str, payload: Any, *, timeout: Optional[float] = None) -> Tuple[int, Any]:
+        return await self.request_json("POST", url, json=payload, timeout=timeout)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {k: dict(v) for k, v in self._stats.items()}
+
+    def stats_lines(self, limit: int = 12) -> list[str]:
+        lines = []
+        ranked = sorted(self._stats.items(), key=lambda kv: -kv[1]["count"])
+        for key, s in ranked[:limit]:
+            avg = s["total_ms"] / s["count"] if s["count"] else 0.0
+            lines.append(
+                f"{key}: n={int(s['count'])} err={int(s['errors'])} "
+                f"avg={avg:.0f}ms max={s['max_ms']:.0f}ms"
+            )
+        return lines
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,53 @@
+"""Compiled slash-command dispatch table for the dynamic router.
+
+Maps every known command to its handler kind in one dict lookup:
+
+- "core"      → handled by handlers/core.py
+- "extension" → handled by a loaded extension
+- "centre"    → routed to an Index centre URL
+
+The table is rebuilt only when the extension loader or the IndexCache
+generation changes, not per message.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from .commands import extension_command_set
+
+if TYPE_CHECKING:
+    from .index_cache import Centre
+
+CORE_COMMANDS = frozenset({"start", "menu", "reload", "help", "health", "commands"})
+
+KIND_CORE = "core"
+KIND_EXTENSION = "extension"
+KIND_CENTRE = "centre"
+
+Route = Tuple[str, Optional["Centre"]]
+
+
+class DispatchTable:
+    def __init__(self) -> None:
+        self._routes: Dict[str, Route] = {}
+        self._key: Optional[Tuple[int, int]] = None
+        self.rebuilds = 0
+
+    def compile(self, config: dict, ext_names: set[str], centres: Dict[str, "Centre"]) -> None:
+        # Precedence matches the old per-message checks: core > extension > centre.
+        routes: Dict[str, Route] = {cmd: (KIND_CENTRE, c) for cmd, c in centres.items()}
+        for cmd in extension_command_set(config, ext_names):
+            routes[cmd] = (KIND_EXTENSION, None)
+        for cmd in CORE_COMMANDS:
+            routes[cmd] = (KIND_CORE, None)
+        self._routes = routes
+        self.rebuilds += 1
+
+    def resolve(self, state, cmd: str) -> Route | None:
+        loader = state.extension_loader
+        key = (getattr(loader, "generation", 0), state.cache.generation)
+        if key != self._key:
+            self.compile(state.config, state.loaded_extension_names(), state.cache.centres)
+            self._key = key
+        return self._routes.get(cmd)
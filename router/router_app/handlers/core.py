@@ -15,6 +15,16 @@ from ..state import AppState
 logger = logging.getLogger(__name__)
 
 
+def _router_stats_block(state: AppState) -> str:
+    lines = state.api.stats_lines()
+    for label, s in sorted(state.taskwarrior.stats().items()):
+        avg = s["total_ms"] / s["count"] if s["count"] else 0
+        lines.append(f"tw {label}: n={int(s['count'])} avg={avg:.0f}ms last={int(s['last_ms'])}ms")
+    if not lines:
+        return ""
+    return "\n\nRouter API latency:\n" + "\n".join(lines)
+
+
 def build_core_router(state: AppState) -> Router:
     router = Router()
 
@@ -145,8 +155,10 @@ def build_core_router(state: AppState) -> Router:
                     msg = f"🟢 Bridge health OK\nHTTP {status} • {elapsed_ms}ms"
                     if text:
                         msg += f"\n\n{text[:800]}"
-                    await m.answer(msg)
+                    await m.answer(msg + _router_stats_block(state))
         except Exception as exc:
-            await m.answer(f"🔴 Bridge health failed\n{state.health_url}\n{exc}")
+            await m.answer(
+                f"🔴 Bridge health failed\n{state.health_url}\n{exc}" + _router_stats_block(state)
+            )
 
     return router
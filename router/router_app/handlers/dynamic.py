@@ -7,7 +7,7 @@ from aiogram.dispatcher.event.bases import SkipHandler
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.types import Message
 
-from ..commands import extension_command_set
+from ..dispatch import KIND_CENTRE
 from ..state import AppState
 
 logger = logging.getLogger(__name__)
@@ -23,16 +23,18 @@ def build_dynamic_router(state: AppState) -> Router:
 
         cmd = m.text.strip().lstrip("/").split()[0].lower()
 
-        if cmd in ("start", "menu", "reload", "help", "health", "commands"):
-            raise SkipHandler
-        if cmd in extension_command_set(state.config, state.loaded_extension_names()):
+        route = state.dispatch.resolve(state, cmd)
+        if route and route[0] != KIND_CENTRE:
             raise SkipHandler
 
-        logger.info("Routing /%s from user %s", cmd, m.from_user.id)
+        if not state.cache.fresh():
+            # Stale-while-revalidate: only blocks when nothing is cached yet.
+            await state.cache.fetch()
+            route = state.dispatch.resolve(state, cmd)
 
-        centres, _ = await state.cache.fetch()
-        centre = centres.get(cmd)
+        logger.info("Routing /%s from user %s", cmd, m.from_user.id)
 
+        centre = route[1] if route else None
         if not centre:
             await m.answer(
                 f"❌ Unknown command: /{cmd}\n\n" "Use /menu to see available centres."
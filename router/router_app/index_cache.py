@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import time
-from dataclasses import dataclass
-from typing import Dict, Tuple
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 import aiohttp
 
@@ -19,47 +21,159 @@ class Centre:
 
 
 class IndexCache:
-    def __init__(self, api_base: str, api_path: str, cache_ttl: int):
+    """Centre list from the Index API, served stale-while-revalidate.
+
+    - Cached centres are returned immediately; an expired TTL only schedules a
+      background refresh (one at a time).
+    - The first load (empty cache) and `force=True` wait for the network.
+    - One persistent `aiohttp.ClientSession`; conditional GETs via
+      ETag / Last-Modified so unchanged centre lists cost a 304.
+    - Optional on-disk warm cache so the router boots with centres loaded.
+
+    `generation` increments whenever the centre map changes, so derived
+    structures (the dispatch table) know when to rebuild.
+    """
+
+    def __init__(
+        self,
+        api_base: str,
+        api_path: str,
+        cache_ttl: int,
+        warm_cache_path: Optional[Path] = None,
+    ):
         self._lock = asyncio.Lock()
         self._centres: Dict[str, Centre] = {}
         self._updated_at: str = ""
         self._ts: float = 0.0
+        self._etag: str = ""
+        self._last_modified: str = ""
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.generation = 0
         self.api_base = api_base.rstrip("/")
         self.api_path = api_path
         self.cache_ttl = cache_ttl
+        self.warm_cache_path = warm_cache_path
+        self._load_warm_cache()
+
+    @property
+    def centres(self) -> Dict[str, Centre]:
+        return self._centres
 
     def fresh(self) -> bool:
-        return self._centres and (time.time() - self._ts) < self.cache_ttl
+        return bool(self._centres) and (time.time() - self._ts) < self.cache_ttl
 
     async def fetch(self, force: bool = False) -> Tuple[Dict[str, Centre], str]:
-        async with self._lock:
-            if self.fresh() and not force:
-                return self._centres, self._updated_at
+        if force or not self._centres:
+            await self._refresh()
+        elif not self.fresh():
+            self._schedule_refresh()
+        return self._centres, self._updated_at
+
+    async def close(self) -> None:
+        task = self._refresh_task
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh())
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            timeout = aiohttp.ClientTimeout(total=3)
+            self._session = aiohttp.ClientSession(timeout=timeout)
+        return self._session
 
+    async def _refresh(self) -> None:
+        async with self._lock:
             url = self.api_base + self.api_path
+            headers: Dict[str, str] = {}
+            if self._centres:
+                if self._etag:
+                    headers["If-None-Match"] = self._etag
+                if self._last_modified:
+                    headers["If-Modified-Since"] = self._last_modified
             try:
-                timeout = aiohttp.ClientTimeout(total=3)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(url) as response:
-                        if response.status != 200:
-                            raise RuntimeError(f"HTTP {response.status}")
-                        payload = await response.json(content_type=None)
-
-                centres: Dict[str, Centre] = {}
-                for item in payload.get("centres", []):
-                    cmd = str(item.get("cmd", "")).strip().lstrip("/").lower()
-                    label = str(item.get("label", "")).strip()
-                    link = str(item.get("url", "")).strip()
-                    if link.startswith("/"):
-                        link = f"{self.api_base}{link}"
-                    if cmd and label and link:
-                        centres[cmd] = Centre(cmd, label, link)
+                async with self._get_session().get(url, headers=headers) as response:
+                    if response.status == 304:
+                        self._ts = time.time()
+                        return
+                    if response.status != 200:
+                        raise RuntimeError(f"HTTP {response.status}")
+                    payload = await response.json(content_type=None)
+                    etag = response.headers.get("ETag", "")
+                    last_modified = response.headers.get("Last-Modified", "")
 
+                centres = self._parse_centres(payload)
+                if centres != self._centres:
+                    self.generation += 1
                 self._centres = centres
                 self._updated_at = str(payload.get("updated_at", ""))
+                self._etag = etag
+                self._last_modified = last_modified
                 self._ts = time.time()
-                logger.info("Fetched %s centres from Index API", len(centres))
+                logger.info("Fetched %s centres from Index API", len(self._centres))
+                await asyncio.to_thread(self._save_warm_cache)
             except Exception as exc:
                 logger.warning("Failed to fetch from Index API: %s", exc)
 
-            return self._centres, self._updated_at
+    def _parse_centres(self, payload: dict) -> Dict[str, Centre]:
+        centres: Dict[str, Centre] = {}
+        for item in payload.get("centres", []):
+            cmd = str(item.get("cmd", "")).strip().lstrip("/").lower()
+            label = str(item.get("label", "")).strip()
+            link = str(item.get("url", "")).strip()
+            if link.startswith("/"):
+                link = f"{self.api_base}{link}"
+            if cmd and label and link:
+                centres[cmd] = Centre(cmd, label, link)
+        return centres
+
+    def _load_warm_cache(self) -> None:
+        path = self.warm_cache_path
+        if not path or not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("source") != self.api_base + self.api_path:
+                return
+            self._centres = {
+                str(item["cmd"]): Centre(str(item["cmd"]), str(item["label"]), str(item["url"]))
+                for item in data.get("centres", [])
+            }
+            self.generation += 1
+            self._updated_at = str(data.get("updated_at", ""))
+            self._etag = str(data.get("etag", ""))
+            self._last_modified = str(data.get("last_modified", ""))
+            # _ts stays 0: warm centres are served at once but revalidated on first use.
+            logger.info("Loaded %s centres from warm cache %s", len(self._centres), path)
+        except Exception as exc:
+            logger.warning("Ignoring warm cache %s: %s", path, exc)
+
+    def _save_warm_cache(self) -> None:
+        path = self.warm_cache_path
+        if not path:
+            return
+        data = {
+            "source": self.api_base + self.api_path,
+            "updated_at": self._updated_at,
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+            "centres": [asdict(c) for c in self._centres.values()],
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            tmp.replace(path)
+        except Exception as exc:
+            logger.warning("Failed to write warm cache %s: %s", path, exc)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from .api_client import ApiClient
+from .dispatch import DispatchTable
 from .index_cache import IndexCache
+from .taskwarrior import TaskwarriorExecutor
 
 
 @dataclass
@@ -14,6 +17,9 @@ class AppState:
     health_timeout: float
     gas_webhook_url: str
     extension_loader: object | None = None
+    dispatch: DispatchTable = field(default_factory=DispatchTable)
+    taskwarrior: TaskwarriorExecutor = field(default_factory=TaskwarriorExecutor)
+    api: ApiClient = field(default_factory=ApiClient)
 
     def allowed(self, uid: int) -> bool:
         return (not self.allowed_user_id) or (str(uid) == str(self.allowed_user_id))
@@ -21,6 +27,9 @@ class AppState:
     def loaded_extension_names(self) -> set[str]:
         if not self.extension_loader:
             return set()
+        if hasattr(self.extension_loader, "extension_names"):
+            # Includes lazily registered (not yet imported) extensions.
+            return set(self.extension_loader.extension_names())
         names: set[str] = set()
         for ext in getattr(self.extension_loader, "extensions", []):
             module = ext.__class__.__module__
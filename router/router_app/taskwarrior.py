@@ -0,0 +1,165 @@
+"""Router-wide async Taskwarrior executor.
+
+- Writes go through one queue and one writer task, so two quick `/fit` taps
+  can never pick (and complete) the same task.
+- Completions arriving within `batch_window` are applied as a single
+  `task <uuid1> <uuid2> ... done`; if that exits nonzero, the uuids are
+  re-exported and each request is answered from its task's status.
+- Per-command latency is logged and kept in `stats()`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompleteResult:
+    ok: bool
+    task: Optional[dict] = None
+    error: str = ""
+    latency_ms: int = 0
+
+
+@dataclass
+class _CompleteRequest:
+    filters: Tuple[str, ...]
+    label: str
+    started: float
+    future: asyncio.Future = field(repr=False)
+
+
+class TaskwarriorExecutor:
+    def __init__(self, task_bin: str = "task", batch_window: float = 0.05):
+        self.task_bin = task_bin
+        self.batch_window = batch_window
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    # -- public API ---------------------------------------------------------
+
+    async def complete_first(self, filters: List[str], label: str = "done") -> CompleteResult:
+        """Complete the first task matching `filters` (serialized + batched)."""
+        self._ensure_writer()
+        loop = asyncio.get_running_loop()
+        req = _CompleteRequest(tuple(filters), label, time.monotonic(), loop.create_future())
+        await self._queue.put(req)
+        return await req.future
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {k: dict(v) for k, v in self._stats.items()}
+
+    async def close(self) -> None:
+        if self._writer and not self._writer.done():
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+        self._writer = None
+
+    # -- internals ----------------------------------------------------------
+
+    def _ensure_writer(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def _record(self, label: str, started: float) -> int:
+        ms = int((time.monotonic() - started) * 1000)
+        entry = self._stats.setdefault(label, {"count": 0, "total_ms": 0, "last_ms": 0})
+        entry["count"] += 1
+        entry["total_ms"] += ms
+        entry["last_ms"] = ms
+        return ms
+
+    async def _run(self, args: List[str], *, merge_stderr: bool = True) -> Tuple[int, str]:
+        # Exports must keep stderr out: hook output or override notices in
+        # front of the JSON would make it unparseable.
+        proc = await asyncio.create_subprocess_exec(
+            self.task_bin,
+            "rc.verbose=0",
+            "rc.confirmation=no",
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT if merge_stderr else asyncio.subprocess.DEVNULL,
+        )
+        out, _ = await proc.communicate()
+        return proc.returncode, (out or b"").decode("utf-8", errors="ignore").strip()
+
+    async def _export(self, filters: Tuple[str, ...]) -> List[dict]:
+        code, text = await self._run([*filters, "export"], merge_stderr=False)
+        if code != 0 or not text:
+            return []
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return []
+        return data if isinstance(data, list) else []
+
+    async def _write_loop(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            # Let near-simultaneous taps join this batch.
+            await asyncio.sleep(self.batch_window)
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._apply(batch)
+            except Exception as exc:
+                logger.error("Taskwarrior batch failed: %s", exc)
+                for req in batch:
+                    if not req.future.done():
+                        req.future.set_result(CompleteResult(False, error=str(exc)))
+
+    async def _apply(self, batch: List[_CompleteRequest]) -> None:
+        exports: Dict[Tuple[str, ...], List[dict]] = {}
+        claimed: set[str] = set()
+        picks: List[Tuple[_CompleteRequest, Optional[dict]]] = []
+
+        for req in batch:
+            if req.filters not in exports:
+                exports[req.filters] = await self._export(req.filters)
+            task = next(
+                (t for t in exports[req.filters] if t.get("uuid") and t["uuid"] not in claimed),
+                None,
+            )
+            if task:
+                claimed.add(task["uuid"])
+            picks.append((req, task))
+
+        out = ""
+        done: set[str] = set()
+        if claimed:
+            code, out = await self._run(["rc.bulk=0", *claimed, "done"])
+            if code == 0:
+                done = set(claimed)
+            else:
+                # One uuid that is no longer pending fails the whole command;
+                # ask Taskwarrior which tasks actually ended up completed.
+                done = {
+                    t["uuid"]
+                    for t in await self._export(tuple(claimed))
+                    if t.get("uuid") and t.get("status") == "completed"
+                }
+
+        for req, task in picks:
+            ms = self._record(req.label, req.started)
+            if task is None:
+                result = CompleteResult(False, error="no matching task", latency_ms=ms)
+            elif task["uuid"] not in done:
+                result = CompleteResult(False, task=task, error=out[:200], latency_ms=ms)
+            else:
+                result = CompleteResult(True, task=task, latency_ms=ms)
+            logger.info("tw %s: ok=%s in %sms (batch=%s)", req.label, result.ok, ms, len(batch))
+            if not req.future.done():
+                req.future.set_result(result)
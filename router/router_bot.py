@@ -7,10 +7,13 @@ Implementation lives in `router_app/`.
 
 import asyncio
 import logging
+from pathlib import Path
+
 from aiogram import Bot, Dispatcher
 
 from extensions import ExtensionLoader
 
+from router_app.api_client import ApiClient
 from router_app.index_cache import IndexCache
 from router_app.settings import load_config, read_settings
 from router_app.startup_ping import send_startup_ping
@@ -33,11 +36,14 @@ async def main():
     config = load_config(settings.config_path)
     index_config = config.get("index_api", {}) if isinstance(config, dict) else {}
     health_config = config.get("healthcheck", {}) if isinstance(config, dict) else {}
+    api_config = config.get("api", {}) if isinstance(config, dict) else {}
 
+    warm_cache = str(index_config.get("warm_cache", "~/.cache/alphaos/router_centres.json")).strip()
     cache = IndexCache(
         api_base=str(index_config.get("base", "http://100.76.197.55:8799")),
         api_path=str(index_config.get("path", "/api/centres")),
         cache_ttl=int(index_config.get("cache_ttl", 60)),
+        warm_cache_path=Path(warm_cache).expanduser() if warm_cache else None,
     )
 
     health_url = settings.health_url or str(health_config.get("url", "http://100.76.197.55:8080/health"))
@@ -55,6 +61,10 @@ async def main():
         health_url=str(health_url).strip(),
         health_timeout=float(health_timeout),
         gas_webhook_url=settings.gas_webhook_url,
+        api=ApiClient(
+            default_timeout=float(api_config.get("timeout", 5)),
+            timeouts=api_config.get("timeouts") or {},
+        ),
     )
 
     dp = Dispatcher()
@@ -63,7 +73,7 @@ async def main():
 
     bot = Bot(settings.bot_token)
 
-    extension_loader = ExtensionLoader(bot, dp, state.config)
+    extension_loader = ExtensionLoader(bot, dp, state.config, state)
     state.extension_loader = extension_loader
 
     extension_names = state.config.get("extensions", [])
@@ -86,6 +96,9 @@ async def main():
         # Cleanup extensions
         if extension_loader:
             await extension_loader.teardown_all()
+        await cache.close()
+        await state.taskwarrior.close()
+        await state.api.close()
 
 
 if __name__ == "__main__":